@@ -0,0 +1,426 @@
+"""
+Benchmark de las pantallas del taller contra una base local.
+
+Crea (o reutiliza) una base aparte, MySQL o un archivo SQLite que no
+necesita servidor, la carga con la cantidad de filas
+pedida en cada tabla y abre cada vista sin interfaz gráfica, midiendo:
+
+- consulta_ms: tiempo de las consultas que llenan la vista
+- construccion_ms: tiempo de pasar las filas a controles de Flet
+- updates / payload_bytes: cantidad de page.update() y bytes que Flet
+  tendría que mandar al cliente (controles nuevos o con cambios) al
+  navegar a la vista con el menú ya armado
+
+Los resultados se guardan en JSON para comparar corridas:
+
+    python benchmark.py --volumenes 1000 10000 100000 --salida bench.json
+    python benchmark.py --motor sqlite
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+
+import flet as ft
+import pymysql
+
+# API interna de Flet (probada con la versión fijada en requirements.txt):
+# la usa PaginaMedida para serializar los controles como se envían
+try:
+    from flet.core.protocol import CommandEncoder
+except ImportError:
+    CommandEncoder = None
+
+import db
+from render import Renderizador, renderizador_de
+
+FLET_PROBADO = "0.25.2"
+BASE_BENCHMARK = "taller_benchmark"
+TAM_LOTE_CARGA = 2000
+ESPERA_MAXIMA = 60  # segundos para que una vista termine de cargar
+
+
+# =========================
+# PÁGINA SIN INTERFAZ
+# =========================
+
+def falta_api_flet():
+    """Lo que falta de la API interna de Flet que usa PaginaMedida, o None."""
+    faltantes = []
+    if CommandEncoder is None:
+        faltantes.append("flet.core.protocol.CommandEncoder")
+    for metodo in ("_build_command", "_get_children"):
+        if not hasattr(ft.Control, metodo):
+            faltantes.append(f"Control.{metodo}")
+    return ", ".join(faltantes) or None
+
+
+class PaginaMedida:
+    """
+    Reemplazo de ft.Page que no dibuja nada y mide cada update().
+
+    Para estimar el payload se serializa cada control como lo haría Flet
+    y sólo se cuentan los controles nuevos o cuyas propiedades cambiaron
+    desde el update anterior (Flet manda diferencias, no el árbol entero).
+    """
+
+    def __init__(self):
+        self.controls = []
+        self.overlay = []
+        self.title = ""
+        self.window = None
+        self.updates = 0
+        self.payload_bytes = 0
+        self._previos = {}
+
+    def clean(self):
+        self.controls = []
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+
+    def update(self, *controles):
+        self.updates += 1
+        actuales = {}
+        for control in self._recorrer(self.controls):
+            # API interna de Flet: el mismo comando que se envía al cliente
+            comando = control._build_command()
+            texto = json.dumps(comando, cls=CommandEncoder)
+            actuales[id(control)] = texto
+            if self._previos.get(id(control)) != texto:
+                self.payload_bytes += len(texto)
+        self._previos = actuales
+
+    def _recorrer(self, controles):
+        for control in controles:
+            if control is None:
+                continue
+            yield control
+            yield from self._recorrer(control._get_children())
+
+
+# =========================
+# BASE DE PRUEBA
+# =========================
+
+def _sentencias_sql(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        texto = archivo.read()
+    for sentencia in texto.split(";"):
+        sentencia = sentencia.strip()
+        if not sentencia or sentencia.upper().startswith(("CREATE DATABASE", "USE ")):
+            continue
+        yield sentencia
+
+
+def preparar_base(nombre, motor):
+    """Crea la base de benchmark con el esquema del proyecto y sus migraciones."""
+    # Todo el proyecto toma el motor y la base de db al crear el pool
+    db.MOTOR = motor
+    if motor == "sqlite":
+        db.SQLITE_CONFIG["ruta"] = nombre + ".db"
+        from migraciones import aplicar_migraciones
+        aplicar_migraciones(informar=lambda texto: None)
+        return
+
+    config = {k: v for k, v in db.DB_CONFIG.items() if k != "database"}
+    conn = pymysql.connect(**config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {nombre}")
+    finally:
+        conn.close()
+
+    db.DB_CONFIG["database"] = nombre
+    ruta_sql = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taller_mecanico.sql")
+    with db.conexion("benchmark") as conn:
+        with conn.cursor() as cursor:
+            for sentencia in _sentencias_sql(ruta_sql):
+                cursor.execute(sentencia)
+
+    from migraciones import aplicar_migraciones
+    aplicar_migraciones(informar=lambda texto: None)
+
+
+def _filas(tabla, n):
+    inicio = datetime.datetime(2024, 1, 1)
+    for i in range(n):
+        if tabla == "clientes":
+            yield (f"{20000000 + i}", f"Nombre{i % 997}", f"Apellido{i % 1999}", f"Calle {i}", f"11{i:08d}")
+        elif tabla == "mecanicos":
+            yield (f"L{i:07d}", f"Nombre{i % 997}", f"Apellido{i % 1999}", "Mecánico", "Activo")
+        elif tabla == "productos":
+            yield (f"Repuesto {i}", 1000 + i % 50000, f"Fabricante{i % 300}")
+        elif tabla == "proveedores":
+            yield (f"Proveedor {i}", f"30{i:08d}9", f"11{i:08d}", f"Avenida {i}")
+        elif tabla == "usuarios":
+            yield (f"Nombre{i % 997}", f"Apellido{i % 1999}", f"usuario{i}", "clave", "operador")
+        elif tabla == "vehiculos":
+            yield (f"AA{i:06d}", f"Marca{i % 40}", f"Modelo{i % 400}", "Gris")
+        elif tabla == "presupuestos":
+            # Fechas desordenadas respecto del id, como en el uso real
+            fecha = inicio + datetime.timedelta(seconds=(i * 7919) % 31536000)
+            yield (f"{20000000 + i}", 1000 + i % 90000, "Pendiente", f"Trabajo {i}",
+                   fecha.strftime("%Y-%m-%d %H:%M:%S"))
+
+
+INSERTS = {
+    "clientes": "INSERT INTO clientes (dni, nombre, apellido, direccion, telefono) VALUES (%s, %s, %s, %s, %s)",
+    "mecanicos": "INSERT INTO mecanicos (legajo, nombre, apellido, rol, estado) VALUES (%s, %s, %s, %s, %s)",
+    "productos": "INSERT INTO productos (nombre, precio, fabricante) VALUES (%s, %s, %s)",
+    "proveedores": "INSERT INTO proveedores (nombre, cuit, telefono, direccion) VALUES (%s, %s, %s, %s)",
+    "usuarios": "INSERT INTO usuarios (nombre, apellido, usuario, contrasena, rol) VALUES (%s, %s, %s, %s, %s)",
+    "vehiculos": "INSERT INTO vehiculos (patente, marca, modelo, color) VALUES (%s, %s, %s, %s)",
+    "presupuestos": (
+        "INSERT INTO presupuestos (dni_cliente, monto, estado, detalle, fecha_creacion) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    ),
+}
+
+
+def cargar_volumen(n):
+    """Vacía las tablas y carga n filas en cada una, por lotes."""
+    with db.conexion("benchmark") as conn:
+        with conn.cursor() as cursor:
+            for tabla, sql in INSERTS.items():
+                cursor.execute(f"DELETE FROM {tabla}")
+                lote = []
+                for fila in _filas(tabla, n):
+                    lote.append(fila)
+                    if len(lote) >= TAM_LOTE_CARGA:
+                        cursor.executemany(sql, lote)
+                        lote = []
+                if lote:
+                    cursor.executemany(sql, lote)
+                if db.es_sqlite():
+                    cursor.execute(f"ANALYZE {tabla}")
+                else:
+                    cursor.execute(f"ANALYZE TABLE {tabla}")
+                    cursor.fetchall()
+
+
+# =========================
+# MEDICIÓN DE VISTAS
+# =========================
+
+class Medidor:
+    """Mide las lecturas y el armado de controles de las TablaPaginada."""
+
+    def __init__(self):
+        self.consulta = 0.0
+        self.construccion = 0.0
+        self.pendientes = 0
+        self.errores = []
+        self._cond = threading.Condition()
+
+    def instalar(self):
+        from paginacion import TablaPaginada
+
+        cargar, leer = TablaPaginada._cargar, TablaPaginada._leer
+        mostrar, mostrar_error = TablaPaginada._mostrar, TablaPaginada._mostrar_error
+        medidor = self
+
+        def _cargar(tabla, *args, **kwargs):
+            with medidor._cond:
+                medidor.pendientes += 1
+            cargar(tabla, *args, **kwargs)
+
+        def _leer(tabla, *args):
+            inicio = time.perf_counter()
+            try:
+                return leer(tabla, *args)
+            finally:
+                medidor.consulta += time.perf_counter() - inicio
+
+        def _mostrar(tabla, resultado):
+            inicio = time.perf_counter()
+            try:
+                mostrar(tabla, resultado)
+            finally:
+                medidor.construccion += time.perf_counter() - inicio
+                medidor._terminar()
+
+        def _mostrar_error(tabla, ex):
+            medidor.errores.append(str(ex))
+            try:
+                mostrar_error(tabla, ex)
+            finally:
+                medidor._terminar()
+
+        TablaPaginada._cargar = _cargar
+        TablaPaginada._leer = _leer
+        TablaPaginada._mostrar = _mostrar
+        TablaPaginada._mostrar_error = _mostrar_error
+
+    def _terminar(self):
+        with self._cond:
+            self.pendientes -= 1
+            self._cond.notify_all()
+
+    def reiniciar(self):
+        self.consulta = 0.0
+        self.construccion = 0.0
+        self.errores = []
+
+    def esperar(self):
+        fin = time.monotonic() + ESPERA_MAXIMA
+        with self._cond:
+            while self.pendientes > 0:
+                restante = fin - time.monotonic()
+                if restante <= 0:
+                    raise TimeoutError("La vista no terminó de cargar.")
+                self._cond.wait(restante)
+
+
+def vistas():
+    """(nombre, abrir(page)) de cada pantalla medida."""
+    import taller
+    from cliente import Herramienta_Cliente
+    from empleado import Herramienta_Empleado
+    from producto import Herramienta_Producto
+    from proveedor import Herramienta_Proveedor
+    from usuario import Herramienta_Usuario
+    from vehiculo import Herramienta_Vehiculo
+
+    def volver(page):
+        pass
+
+    return [
+        ("clientes", lambda p: Herramienta_Cliente(p, volver)),
+        ("proveedores", lambda p: Herramienta_Proveedor(p, volver)),
+        ("productos", lambda p: Herramienta_Producto(p, volver)),
+        ("empleados", lambda p: Herramienta_Empleado(p, volver)),
+        ("usuarios", lambda p: Herramienta_Usuario(p, volver)),
+        ("ficha_tecnica", lambda p: Herramienta_Vehiculo(p, volver)),
+        ("presupuesto", lambda p: taller.presupuesto(p, volver)),
+    ]
+
+
+def pagina_con_menu():
+    """PaginaMedida con el menú ya armado, como la deja la aplicación al navegar."""
+    import taller
+    from router import Router
+
+    page = PaginaMedida()
+    Renderizador(page)
+    router = Router(page, taller.rutas())
+    router.armar(taller.crear_sidebar(router))
+    renderizador_de(page).vaciar()
+    page.updates = 0
+    page.payload_bytes = 0
+    return page
+
+
+def medir_vista(medidor, abrir):
+    page = pagina_con_menu()
+    medidor.reiniciar()
+    inicio = time.perf_counter()
+    abrir(page)
+    armado = time.perf_counter() - inicio
+    medidor.esperar()
+    renderizador_de(page).vaciar()
+    return {
+        "consulta_ms": medidor.consulta * 1000,
+        "construccion_ms": (armado + medidor.construccion) * 1000,
+        "updates": page.updates,
+        "payload_bytes": page.payload_bytes,
+        "errores": list(medidor.errores),
+    }
+
+
+def medir_dashboard():
+    import taller
+    from resumen import servicio_resumen
+
+    page = pagina_con_menu()
+    inicio = time.perf_counter()
+    servicio_resumen.reconciliar()
+    consulta = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    taller.dashboard(page)
+    construccion = time.perf_counter() - inicio
+    renderizador_de(page).vaciar()
+    return {
+        "consulta_ms": consulta * 1000,
+        "construccion_ms": construccion * 1000,
+        "updates": page.updates,
+        "payload_bytes": page.payload_bytes,
+        "errores": [],
+    }
+
+
+def resumir(muestras):
+    """Mediana de los tiempos y el resto de la última muestra."""
+    resultado = dict(muestras[-1])
+    for clave in ("consulta_ms", "construccion_ms"):
+        valores = [m[clave] for m in muestras]
+        resultado[clave] = round(statistics.median(valores), 3)
+        resultado[clave.replace("_ms", "_min_ms")] = round(min(valores), 3)
+    resultado["errores"] = sorted({e for m in muestras for e in m["errores"]})
+    return resultado
+
+
+def correr(volumenes, repeticiones, base, motor):
+    preparar_base(base, motor)
+    medidor = Medidor()
+    medidor.instalar()
+    resultados = {}
+    for volumen in volumenes:
+        print(f"Cargando {volumen} filas por tabla...")
+        cargar_volumen(volumen)
+        por_vista = {}
+        for nombre, abrir in vistas():
+            muestras = [medir_vista(medidor, abrir) for _ in range(repeticiones)]
+            por_vista[nombre] = resumir(muestras)
+            print(f"  {nombre:<14} {por_vista[nombre]['consulta_ms']:9.2f} ms consulta "
+                  f"{por_vista[nombre]['construccion_ms']:9.2f} ms armado "
+                  f"{por_vista[nombre]['payload_bytes']:9d} bytes")
+        por_vista["dashboard"] = resumir([medir_dashboard() for _ in range(repeticiones)])
+        resultados[str(volumen)] = por_vista
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las pantallas contra una base local.")
+    parser.add_argument("--volumenes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--motor", choices=["mysql", "sqlite"], default=db.MOTOR)
+    parser.add_argument("--base", default=BASE_BENCHMARK,
+                        help="base de datos a crear y llenar (con SQLite, nombre del archivo)")
+    parser.add_argument("--salida", default="benchmark.json")
+    args = parser.parse_args(argv)
+
+    faltante = falta_api_flet()
+    if faltante:
+        print(
+            f"Esta versión de Flet ({ft.version.version}) no tiene {faltante}, que el benchmark usa "
+            f"para medir el payload. Instalá la versión probada: pip install flet=={FLET_PROBADO}",
+            file=sys.stderr,
+        )
+        return 1
+
+    inicio = time.time()
+    resultados = correr(args.volumenes, args.repeticiones, args.base, args.motor)
+    informe = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(inicio)),
+        "duracion_s": round(time.time() - inicio, 1),
+        "python": platform.python_version(),
+        "flet": ft.version.version,
+        "plataforma": platform.platform(),
+        "motor": args.motor,
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+from db import consultar_uno
+
+MAX_ENTRADAS = 2000
+
+
+class CacheEntidades:
+    """
+    Filas leídas de la base, indexadas por (tabla, clave primaria).
+
+    Las tablas guardan acá las filas que muestran, así abrir una fila
+    visible para editarla no consulta la base. Cuando se llena se descarta
+    la fila usada hace más tiempo (LRU). Cualquier escritura sobre una
+    tabla invalida todas sus filas con invalidar(tabla).
+    """
+
+    def __init__(self, max_entradas=MAX_ENTRADAS):
+        self.max_entradas = max_entradas
+        self._filas = OrderedDict()
+        self._lock = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._invalidaciones = 0
+        self._desalojadas = 0
+
+    def obtener(self, tabla, clave):
+        """Devuelve la fila guardada o None; cuenta aciertos y fallos."""
+        with self._lock:
+            fila = self._filas.get((tabla, clave))
+            if fila is None:
+                self._fallos += 1
+                return None
+            self._filas.move_to_end((tabla, clave))
+            self._aciertos += 1
+            return fila
+
+    def guardar(self, tabla, clave, fila):
+        with self._lock:
+            self._guardar(tabla, clave, fila)
+
+    def guardar_filas(self, tabla, filas, indice_clave=0):
+        with self._lock:
+            for fila in filas:
+                self._guardar(tabla, fila[indice_clave], fila)
+
+    def _guardar(self, tabla, clave, fila):
+        self._filas[(tabla, clave)] = tuple(fila)
+        self._filas.move_to_end((tabla, clave))
+        while len(self._filas) > self.max_entradas:
+            self._filas.popitem(last=False)
+            self._desalojadas += 1
+
+    def invalidar(self, tabla, clave=None):
+        """Descarta una fila, o todas las de la tabla si no se pasa clave."""
+        with self._lock:
+            self._invalidaciones += 1
+            if clave is not None:
+                self._filas.pop((tabla, clave), None)
+                return
+            for k in [k for k in self._filas if k[0] == tabla]:
+                del self._filas[k]
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self._aciertos + self._fallos
+            return {
+                "entradas": len(self._filas),
+                "max_entradas": self.max_entradas,
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "tasa_aciertos": self._aciertos / consultas if consultas else 0.0,
+                "invalidaciones": self._invalidaciones,
+                "desalojadas": self._desalojadas,
+            }
+
+
+cache_entidades = CacheEntidades()
+
+
+def leer_fila(paginador, valor, columna=None):
+    """
+    Lee una fila con las columnas del paginador, pasando por la caché.
+
+    Sin columna se busca por clave primaria (la primera columna) y se usa
+    la caché; con columna se consulta la base y la fila encontrada queda
+    guardada por su clave primaria.
+    """
+    tabla = paginador.tabla
+    if columna is None:
+        fila = cache_entidades.obtener(tabla, valor)
+        if fila is not None:
+            return fila
+        columna = paginador.columnas[0]
+    fila = consultar_uno(
+        paginador.modulo,
+        f"SELECT {', '.join(paginador.columnas)} FROM {tabla} WHERE {columna}=%s LIMIT 1",
+        (valor,),
+    )
+    if fila is not None:
+        cache_entidades.guardar(tabla, fila[0], fila)
+    return fila
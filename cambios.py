@@ -0,0 +1,236 @@
+import threading
+import time
+import weakref
+
+import db
+from cache import cache_entidades
+from db import conexion
+from resumen import TABLAS_RESUMEN, ajustar_resumen
+
+INTERVALO_CAMBIOS = 2  # segundos entre lecturas de la tabla cambios
+MAX_CAMBIOS_POR_LECTURA = 1000
+MAX_CLAVES_POR_TABLA = 200  # con más claves cambiadas conviene releer la vista entera
+RETENCION_HORAS = 24  # los cambios más viejos se borran
+INTERVALO_PURGA = 1800  # segundos entre purgas
+ESPERA_HUECOS = 120  # segundos que se sigue buscando un id salteado
+MAX_HUECOS = 5000  # con más ids salteados se releen las vistas enteras
+
+# Tabla -> tipo de su clave primaria (en cambios se guarda como texto)
+TABLAS_CAMBIOS = {
+    "clientes": str,
+    "mecanicos": str,
+    "productos": int,
+    "proveedores": int,
+    "usuarios": int,
+    "vehiculos": str,
+    "presupuestos": int,
+}
+
+
+def resumir(filas):
+    """
+    Agrupa filas (tabla, clave, operacion) de cambios, en orden, y devuelve
+    {tabla: {clave: (existia, existe)}}: si la fila existía antes del
+    primer cambio y si existe después del último.
+    """
+    por_tabla = {}
+    for tabla, clave, operacion in filas:
+        claves = por_tabla.setdefault(tabla, {})
+        existia = claves[clave][0] if clave in claves else operacion != "A"
+        claves[clave] = (existia, operacion != "B")
+    return por_tabla
+
+
+class FeedCambios:
+    """
+    Lee cada INTERVALO_CAMBIOS segundos los cambios que hicieron las otras
+    terminales (tabla cambios, llenada por triggers) y avisa a las tablas
+    suscriptas con las claves modificadas, para que relean sólo esas
+    filas. También invalida esas filas en la caché y ajusta los conteos
+    del panel.
+
+    Un suscriptor es cualquier objeto con cambios_remotos(claves), donde
+    claves es {clave: (existia, existe)}, o None si conviene releer todo.
+    Se guardan con referencias débiles: una vista descartada deja de
+    recibir avisos sola.
+
+    Los ids se asignan al insertar pero se ven al confirmar: una
+    transacción larga (un lote de importación, la cola sin conexión) deja
+    ids bajos que aparecen después de otros más altos. Los ids salteados
+    se guardan como huecos y se vuelven a buscar durante ESPERA_HUECOS
+    segundos; los que no aparecen eran de transacciones deshechas.
+
+    Con SQLite hay una sola terminal y el feed no arranca.
+    """
+
+    def __init__(self, intervalo=INTERVALO_CAMBIOS):
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._suscriptores = {}
+        self._hilo = None
+        self.ultimo_id = None
+        self._huecos = {}  # id salteado -> cuándo se vio el salto
+        self._ultima_lectura = 0.0
+        self._ultima_purga = 0.0
+        self._ultimo_error = None
+        self.lecturas = 0
+        self.recibidos = 0
+        self.recargas = 0
+        self.recuperados = 0
+
+    def suscribir(self, tabla, suscriptor):
+        with self._lock:
+            self._suscriptores.setdefault(tabla, weakref.WeakSet()).add(suscriptor)
+
+    def _avisar(self, tabla, claves):
+        with self._lock:
+            suscriptores = list(self._suscriptores.get(tabla, ()))
+        for suscriptor in suscriptores:
+            try:
+                suscriptor.cambios_remotos(claves)
+            except Exception as ex:
+                print(f"Error aplicando cambios de {tabla}: {ex}")
+
+    def _posicionar(self, cursor):
+        # Al arrancar sólo interesan los cambios de acá en adelante
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM cambios")
+        self.ultimo_id = cursor.fetchone()[0]
+
+    def leer(self):
+        """Lee una tanda de cambios nuevos y avisa; devuelve cuántos eran ajenos."""
+        with conexion("cambios") as conn:
+            with conn.cursor() as cursor:
+                if self.ultimo_id is None:
+                    self._posicionar(cursor)
+                cursor.execute(
+                    "SELECT id, tabla, clave, operacion, origen FROM cambios "
+                    "WHERE id > %s ORDER BY id LIMIT %s",
+                    (self.ultimo_id, MAX_CAMBIOS_POR_LECTURA),
+                )
+                filas = list(cursor.fetchall())
+                # Los huecos son anteriores a ultimo_id: van primero
+                filas = self._leer_huecos(cursor) + filas
+        ahora = time.monotonic()
+        perdidos = self._ultima_lectura and ahora - self._ultima_lectura > RETENCION_HORAS * 3600
+        self._ultima_lectura = ahora
+        self.lecturas += 1
+        nuevas = [f for f in filas if f[0] > self.ultimo_id]
+        if nuevas:
+            perdidos = self._registrar_huecos(nuevas, ahora) or perdidos
+            self.ultimo_id = nuevas[-1][0]
+        ajenas = [(t, c, o) for _, t, c, o, origen in filas if origen != db.TERMINAL]
+        self.recibidos += len(ajenas)
+        if perdidos:
+            # Estuvo tanto tiempo sin leer que pudo perder cambios ya purgados,
+            # o hay demasiados huecos para seguirlos
+            self._recargar_todo()
+            return len(ajenas)
+        for tabla, claves in resumir(ajenas).items():
+            tipo = TABLAS_CAMBIOS.get(tabla, str)
+            claves = {tipo(c): estado for c, estado in claves.items()}
+            for clave in claves:
+                cache_entidades.invalidar(tabla, clave)
+            self._ajustar_resumen(tabla, claves)
+            if len(claves) > MAX_CLAVES_POR_TABLA:
+                self.recargar(tabla)
+            else:
+                self._avisar(tabla, claves)
+        return len(ajenas)
+
+    def _registrar_huecos(self, filas, ahora):
+        """Anota los ids salteados entre ultimo_id y filas; True si hay demasiados."""
+        esperado = self.ultimo_id + 1
+        for fila in filas:
+            for falta in range(esperado, fila[0]):
+                self._huecos[falta] = ahora
+            esperado = fila[0] + 1
+        if len(self._huecos) > MAX_HUECOS:
+            self._huecos.clear()
+            return True
+        return False
+
+    def _leer_huecos(self, cursor):
+        """Cambios de ids salteados que ya se confirmaron (y olvida los vencidos)."""
+        limite = time.monotonic() - ESPERA_HUECOS
+        self._huecos = {i: visto for i, visto in self._huecos.items() if visto >= limite}
+        if not self._huecos:
+            return []
+        ids = sorted(self._huecos)
+        cursor.execute(
+            "SELECT id, tabla, clave, operacion, origen FROM cambios "
+            f"WHERE id IN ({', '.join(['%s'] * len(ids))}) ORDER BY id",
+            ids,
+        )
+        filas = list(cursor.fetchall())
+        for fila in filas:
+            del self._huecos[fila[0]]
+        self.recuperados += len(filas)
+        return filas
+
+    def recargar(self, tabla):
+        """Descarta la tabla de la caché y hace que sus suscriptores la relean entera."""
+        cache_entidades.invalidar(tabla)
+        self.recargas += 1
+        self._avisar(tabla, None)
+
+    def _recargar_todo(self):
+        with self._lock:
+            tablas = list(self._suscriptores)
+        for tabla in tablas:
+            self.recargar(tabla)
+
+    @staticmethod
+    def _ajustar_resumen(tabla, claves):
+        delta = sum(int(existe) - int(existia) for existia, existe in claves.values())
+        for clave_resumen, tabla_resumen in TABLAS_RESUMEN.items():
+            if tabla_resumen == tabla:
+                ajustar_resumen(clave_resumen, delta)
+
+    def purgar(self):
+        """Borra los cambios de más de RETENCION_HORAS (cualquier terminal puede hacerlo)."""
+        with conexion("cambios") as conn:
+            with conn.cursor() as cursor:
+                return cursor.execute(
+                    "DELETE FROM cambios WHERE creado_en < NOW() - INTERVAL %s HOUR LIMIT 10000",
+                    (RETENCION_HORAS,),
+                )
+
+    def iniciar(self):
+        """Arranca el hilo que lee los cambios (no hace nada con SQLite)."""
+        if self._hilo is not None or db.es_sqlite():
+            return
+        self._hilo = threading.Thread(target=self._bucle, name="cambios", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            try:
+                self.leer()
+                if time.monotonic() - self._ultima_purga > INTERVALO_PURGA:
+                    self._ultima_purga = time.monotonic()
+                    self.purgar()
+                self._ultimo_error = None
+            except Exception as ex:
+                # Sin base no hay cambios que leer; se avisa una sola vez
+                if str(ex) != self._ultimo_error:
+                    print(f"No se pudieron leer los cambios de otras terminales: {ex}")
+                self._ultimo_error = str(ex)
+            time.sleep(self.intervalo)
+
+    def estadisticas(self):
+        with self._lock:
+            suscriptores = {t: len(s) for t, s in self._suscriptores.items() if len(s)}
+        return {
+            "activo": self._hilo is not None,
+            "ultimo_id": self.ultimo_id,
+            "lecturas": self.lecturas,
+            "recibidos": self.recibidos,
+            "recargas": self.recargas,
+            "huecos": len(self._huecos),
+            "recuperados": self.recuperados,
+            "suscriptores": suscriptores,
+            "error": self._ultimo_error,
+        }
+
+
+feed_cambios = FeedCambios()
@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from cambios import feed_cambios
+from db import ejecutar, es_error_conexion, transaccion
+from versiones import tabla_escrita
+
+ARCHIVO_COLA = "escrituras_pendientes.jsonl"
+ARCHIVO_CONFLICTOS = "escrituras_conflictos.jsonl"
+INTERVALO_REINTENTO = 10  # segundos entre intentos de aplicar la cola
+TAM_LOTE = 100  # escrituras por transacción al aplicar la cola
+
+# Lo que devuelve alta_o_encolar cuando el alta quedó en la cola
+ENCOLADA = "encolada"
+
+
+class ColaEscrituras:
+    """
+    Escrituras hechas sin conexión a la base, guardadas en un diario local.
+
+    El diario (archivo_cola) sólo se agrega: una línea {"op": ...} por
+    escritura encolada y una {"hechas": [...]} por cada lote aplicado. Así
+    sobrevive a que se cierre la aplicación; al abrirla se leen las que
+    falten. Cuando vuelve la conexión se aplican en orden, TAM_LOTE por
+    transacción. Una escritura que la base rechaza (por ejemplo una clave
+    duplicada) es un conflicto: no frena al resto, se anota en
+    archivo_conflictos y queda en self.conflictos.
+
+    Mientras haya escrituras en cola las nuevas también se encolan, para
+    que se apliquen en el orden en que se hicieron.
+    """
+
+    def __init__(self, archivo_cola=ARCHIVO_COLA, archivo_conflictos=ARCHIVO_CONFLICTOS,
+                 intervalo=INTERVALO_REINTENTO):
+        self.archivo_cola = archivo_cola
+        self.archivo_conflictos = archivo_conflictos
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._lock_aplicar = threading.Lock()
+        self._pendientes = None
+        self._oyentes = []
+        self._hilo = None
+        self.conflictos = []
+        self.aplicadas = 0
+
+    def _cargar(self):
+        # Se llama con self._lock tomado
+        if self._pendientes is not None:
+            return
+        ops, hechas = [], set()
+        if os.path.exists(self.archivo_cola):
+            with open(self.archivo_cola, encoding="utf-8") as archivo:
+                for linea in archivo:
+                    try:
+                        registro = json.loads(linea)
+                    except ValueError:
+                        continue  # línea cortada por un cierre abrupto
+                    if "op" in registro:
+                        ops.append(registro["op"])
+                    else:
+                        hechas.update(registro.get("hechas", ()))
+        self._pendientes = [op for op in ops if op["id"] not in hechas]
+
+    def _anotar(self, registro):
+        with open(self.archivo_cola, "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+    def encolar(self, modulo, sql, params=()):
+        op = {
+            "id": uuid.uuid4().hex,
+            "modulo": modulo,
+            "sql": sql,
+            "params": list(params),
+            "creada": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            self._cargar()
+            self._anotar({"op": op})
+            self._pendientes.append(op)
+        self._avisar()
+        return op
+
+    def pendientes(self):
+        with self._lock:
+            self._cargar()
+            return len(self._pendientes)
+
+    def escribir(self, modulo, sql, params=()):
+        """
+        Como db.ejecutar. Sin conexión (o con escrituras ya en cola) la
+        escritura se encola y devuelve 1, como si hubiera afectado una fila.
+        """
+        if not self.pendientes():
+            try:
+                return ejecutar(modulo, sql, params)
+            except Exception as ex:
+                if not es_error_conexion(ex):
+                    raise
+        self.encolar(modulo, sql, params)
+        return 1
+
+    def alta(self, modulo, alta_directa, sql, params):
+        """
+        Corre alta_directa() (la alta con sus verificaciones). Sin conexión
+        encola el INSERT sql y devuelve ENCOLADA: la fila aparece en las
+        tablas cuando se aplica la cola.
+        """
+        if not self.pendientes():
+            try:
+                return alta_directa()
+            except Exception as ex:
+                if not es_error_conexion(ex):
+                    raise
+        self.encolar(modulo, sql, params)
+        return ENCOLADA
+
+    def aplicar(self):
+        """Aplica lo pendiente por lotes; devuelve cuántas escrituras se aplicaron."""
+        aplicadas = 0
+        tablas = set()
+        with self._lock_aplicar:
+            while True:
+                with self._lock:
+                    self._cargar()
+                    lote = list(self._pendientes[:TAM_LOTE])
+                if not lote:
+                    break
+                conflictos = self._aplicar_lote(lote)
+                with self._lock:
+                    self._anotar({"hechas": [op["id"] for op in lote]})
+                    hechas = {op["id"] for op in lote}
+                    self._pendientes = [op for op in self._pendientes if op["id"] not in hechas]
+                    if not self._pendientes:
+                        # Todo aplicado: el diario vuelve a empezar vacío
+                        open(self.archivo_cola, "w").close()
+                for op, ex in conflictos:
+                    self._anotar_conflicto(op, ex)
+                aplicadas += len(lote) - len(conflictos)
+                tablas.update(filter(None, (tabla_escrita(op["sql"]) for op in lote)))
+                self._avisar()
+        self.aplicadas += aplicadas
+        # Las vistas abiertas pueden mostrar altas optimistas o conflictos:
+        # se releen las tablas tocadas
+        for tabla in tablas:
+            feed_cambios.recargar(tabla)
+        return aplicadas
+
+    def _aplicar_lote(self, lote):
+        conflictos = []
+        with transaccion("cola") as cursor:
+            for op in lote:
+                try:
+                    cursor.execute(op["sql"], op["params"])
+                except Exception as ex:
+                    if es_error_conexion(ex):
+                        raise
+                    conflictos.append((op, ex))
+        return conflictos
+
+    def _anotar_conflicto(self, op, ex):
+        conflicto = dict(op, error=str(ex))
+        self.conflictos.append(conflicto)
+        print(f"Conflicto al aplicar una escritura en cola ({op['modulo']}): {ex}")
+        try:
+            with open(self.archivo_conflictos, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(conflicto, ensure_ascii=False, default=str) + "\n")
+        except OSError as ex_archivo:
+            print(f"No se pudo anotar el conflicto: {ex_archivo}")
+
+    def al_cambiar(self, funcion):
+        """Registra funcion(pendientes, conflictos), llamada al encolar o aplicar."""
+        self._oyentes.append(funcion)
+
+    def _avisar(self):
+        pendientes = self.pendientes()
+        for funcion in list(self._oyentes):
+            try:
+                funcion(pendientes, len(self.conflictos))
+            except Exception as ex:
+                print(f"Error avisando el estado de la cola: {ex}")
+
+    def iniciar(self):
+        """Arranca el hilo que reintenta aplicar la cola periódicamente."""
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._bucle, name="cola", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            if self.pendientes():
+                try:
+                    self.aplicar()
+                except Exception as ex:
+                    if not es_error_conexion(ex):
+                        print(f"No se pudo aplicar la cola de escrituras: {ex}")
+            time.sleep(self.intervalo)
+
+    def estadisticas(self):
+        return {
+            "pendientes": self.pendientes(),
+            "aplicadas": self.aplicadas,
+            "conflictos": len(self.conflictos),
+        }
+
+
+cola_escrituras = ColaEscrituras()
+
+
+def escribir(modulo, sql, params=()):
+    return cola_escrituras.escribir(modulo, sql, params)
+
+
+def alta_o_encolar(modulo, alta_directa, sql, params):
+    return cola_escrituras.alta(modulo, alta_directa, sql, params)
@@ -0,0 +1,324 @@
+import flet as ft
+
+from cache import cache_entidades
+from cola_escrituras import ENCOLADA, alta_o_encolar, escribir
+from db import es_error_referencia, insertar
+from ejecutor import Tareas
+from modelo_tabla import ALTA, BAJA, MODIFICACION, Cambio
+from paginacion import PaginadorKeyset, TablaPaginada
+from render import actualizar
+from resumen import ajustar_resumen
+from router import Vista, montar
+
+
+# =========================
+# DESCRIPTORES
+# =========================
+
+class Campo:
+    """
+    Columna de una entidad.
+
+    ancho: ancho en la tabla. tipo: conversión del texto del formulario
+    (str, int...). generado: la asigna la base (id autoincremental) y no se
+    carga en el formulario. secreto: se muestra como contraseña.
+    orden: columnas (las de un índice) por las que se ordena la tabla al
+    hacer click en su título; None si no se puede ordenar por ella.
+    """
+
+    def __init__(self, columna, etiqueta, ancho=140, tipo=str, generado=False, secreto=False,
+                 orden=None):
+        self.columna = columna
+        self.etiqueta = etiqueta
+        self.ancho = ancho
+        self.tipo = tipo
+        self.generado = generado
+        self.secreto = secreto
+        self.orden = orden
+
+
+class Entidad:
+    """
+    Describe una tabla para HerramientaCrud.
+
+    modulo: nombre de la vista en pool, instrumentación y cola de escrituras.
+    campos: lista de Campo; el primero es la clave primaria.
+    busqueda: columnas (indexadas) en las que busca la tabla por prefijo.
+    consulta: columna de los botones Baja y Consulta (por defecto la clave).
+    resumen: clave del panel de inicio cuyo conteo se ajusta, o None.
+    en_uso: por qué no se puede borrar una fila que otra tabla referencia
+    (por ejemplo "figura en presupuestos").
+    """
+
+    def __init__(self, modulo, tabla, titulo, singular, campos, busqueda=(), consulta=None,
+                 resumen=None, descripcion=None, en_uso="está en uso en otros registros"):
+        self.modulo = modulo
+        self.tabla = tabla
+        self.titulo = titulo
+        self.singular = singular
+        self.campos = list(campos)
+        self.busqueda = list(busqueda)
+        self.clave = self.campos[0]
+        self.consulta = consulta or self.clave.columna
+        self.resumen = resumen
+        self.descripcion = descripcion
+        self.en_uso = en_uso
+        self.columnas = [c.columna for c in self.campos]
+        self.editables = [c for c in self.campos if not c.generado]
+        # La clave primaria siempre se puede ordenar
+        self.ordenes = {0: [self.clave.columna]}
+        self.ordenes.update({i: list(c.orden) for i, c in enumerate(self.campos) if c.orden})
+
+        nombres = ", ".join(c.columna for c in self.editables)
+        marcas = ", ".join(["%s"] * len(self.editables))
+        asignaciones = ", ".join(f"{c.columna}=%s" for c in self.editables)
+        self.sql_alta = f"INSERT INTO {tabla} ({nombres}) VALUES ({marcas})"
+        self.sql_modificacion = f"UPDATE {tabla} SET {asignaciones} WHERE {self.clave.columna}=%s"
+        self.sql_baja = f"DELETE FROM {tabla} WHERE {self.clave.columna}=%s"
+        self.sql_baja_consulta = f"DELETE FROM {tabla} WHERE {self.consulta}=%s"
+
+    def fila(self, clave, valores):
+        """Fila completa, en el orden de campos, a partir de los valores editables."""
+        return (clave,) + tuple(valores) if self.clave.generado else tuple(valores)
+
+    def paginador(self):
+        return PaginadorKeyset(
+            self.modulo, self.tabla, self.columnas,
+            [(self.clave.columna, "ASC")],
+            busqueda=self.busqueda,
+        )
+
+
+# =========================
+# PANTALLA
+# =========================
+
+class HerramientaCrud:
+    """
+    Pantalla de alta, baja, modificación y consulta de una Entidad:
+    formulario, tabla paginada con búsqueda y escrituras en segundo plano.
+
+    Cada escritura se refleja en la tabla y en el panel como un Cambio, sin
+    volver a leer la tabla. Las escrituras se completan aunque se salga de
+    la pantalla; entonces sólo se ajustan el panel y la caché. Las
+    subclases sólo definen entidad.
+    """
+
+    entidad = None
+
+    def __init__(self, page, volver, entidad=None):
+        self.page = page
+        self.volver = volver
+        self.entidad = entidad or self.entidad
+        self.tareas = Tareas(page)
+        self.editando = None
+        self.armar_ui()
+        self.tabla.recargar()
+        # Para que el router pueda volver a mostrarla sin armarla de nuevo
+        self.vista = Vista(self.contenedor, self.tareas, [self.entidad.tabla], self.tabla.recargar)
+
+    def armar_ui(self):
+        entidad = self.entidad
+        self.txt = {
+            c.columna: ft.TextField(
+                label=c.etiqueta, width=260, password=c.secreto, can_reveal_password=c.secreto
+            )
+            for c in entidad.editables
+        }
+        btn_alta = ft.ElevatedButton("Alta", on_click=self.alta)
+        btn_baja = ft.ElevatedButton("Baja", on_click=self.baja)
+        btn_guardar = ft.ElevatedButton("Guardar", on_click=self.guardar)
+        btn_consulta = ft.ElevatedButton("Consulta", on_click=self.consulta)
+        btn_limpiar = ft.ElevatedButton("Limpiar", on_click=self.limpiar)
+        btn_volver = ft.ElevatedButton("Volver", on_click=self.volver_menu)
+        self.paginador = entidad.paginador()
+        self.lbl_error = ft.Text("", color="red", size=12)
+        self.lbl_ok = ft.Text("", color="#15803D", size=12)
+        self.tabla = TablaPaginada(
+            self.page, self.tareas, self.paginador,
+            [(c.etiqueta, c.ancho) for c in entidad.campos],
+            acciones=[
+                ("iconos/modificar.png", "Editar", self.cargar_editar),
+                ("iconos/borrar.png", "Borrar", self.borrar),
+            ],
+            al_seleccionar=self.mostrar_edicion,
+            texto_vacio=f"No hay {entidad.titulo.lower()} cargados",
+            ordenes=entidad.ordenes,
+        )
+        encabezado = [ft.Text(entidad.titulo, size=22, weight="bold")]
+        if entidad.descripcion:
+            encabezado.append(ft.Text(entidad.descripcion, size=12, color="#6B7280"))
+        self.formulario = ft.Column(
+            encabezado
+            + list(self.txt.values())
+            + [
+                ft.Row([btn_alta, btn_baja, btn_guardar, btn_consulta, btn_limpiar, btn_volver], spacing=10),
+                self.tareas.indicador,
+                self.lbl_error,
+                self.lbl_ok,
+                ft.Divider(),
+            ]
+        )
+        self.contenedor = ft.Column([
+            self.formulario,
+            self.tabla.control
+        ])
+        montar(self.page, self.contenedor)
+
+    def leer_formulario(self):
+        """Valores editables convertidos a su tipo, o None (con el error a la vista)."""
+        valores = []
+        for campo in self.entidad.editables:
+            texto = (self.txt[campo.columna].value or "").strip()
+            if not texto:
+                self.mostrar_error("Todos los campos son obligatorios.")
+                return None
+            try:
+                valores.append(campo.tipo(texto))
+            except ValueError:
+                self.mostrar_error(f"{campo.etiqueta} no es válido.")
+                return None
+        return tuple(valores)
+
+    def llenar_formulario(self, fila):
+        for campo, valor in zip(self.entidad.campos, fila):
+            if not campo.generado:
+                self.txt[campo.columna].value = "" if valor is None else str(valor)
+
+    def mostrar_error(self, ex):
+        self.lbl_error.value = f"Error: {ex}"
+        self.lbl_ok.value = ""
+        actualizar(self.page)
+
+    def mostrar_ok(self, texto):
+        self.lbl_ok.value = texto
+        actualizar(self.page)
+
+    def limpiar(self, e=None):
+        for txt in self.txt.values():
+            txt.value = ""
+        self.lbl_error.value = ""
+        self.lbl_ok.value = ""
+        self.editando = None
+        actualizar(self.page)
+
+    def confirmar(self, delta_total=0):
+        """Lo que una escritura cambia fuera de la pantalla: el resumen y la caché."""
+        if self.entidad.resumen:
+            ajustar_resumen(self.entidad.resumen, delta_total)
+        cache_entidades.invalidar(self.entidad.tabla)
+
+    def aplicar_cambios(self, cambios, delta_total=0, limpiar=True):
+        """Refleja una escritura en la tabla sin releerla."""
+        if limpiar:
+            self.limpiar()
+        self.tabla.aplicar(cambios, delta_total)
+
+    def alta_bd(self, valores):
+        # Un solo INSERT: la clave única descarta el repetido.
+        # Sin conexión el INSERT queda en la cola y se aplica al volver
+        sql = self.entidad.sql_alta
+        return alta_o_encolar(self.entidad.modulo, lambda: self._alta_directa(sql, valores), sql, valores)
+
+    def _alta_directa(self, sql, valores):
+        filas, id_nuevo = insertar(self.entidad.modulo, sql, valores, clave=self.entidad.clave.columna)
+        return self.entidad.fila(id_nuevo, valores) if filas else None
+
+    def despues_de_alta(self, fila):
+        entidad = self.entidad
+        if fila is ENCOLADA:
+            self.limpiar()
+            self.mostrar_ok(f"Sin conexión: el alta del {entidad.singular} quedó en cola.")
+        elif fila:
+            self.aplicar_cambios([Cambio(ALTA, fila[0], fila)], 1)
+            self.mostrar_ok(f"{entidad.singular.capitalize()} guardado.")
+        else:
+            self.mostrar_error(f"ya existe ese {entidad.singular}.")
+
+    def alta(self, e):
+        valores = self.leer_formulario()
+        if valores is not None:
+            self.tareas.ejecutar(self.alta_bd, valores,
+                                 al_terminar=self.despues_de_alta, al_fallar=self.mostrar_error,
+                                 escritura=True,
+                                 al_confirmar=lambda fila: self.confirmar(int(bool(fila) and fila is not ENCOLADA)))
+
+    def guardar(self, e):
+        """Modifica la fila que se está editando; si no hay ninguna, es un alta."""
+        if self.editando is None:
+            self.alta(e)
+            return
+        valores = self.leer_formulario()
+        if valores is None:
+            return
+        # Con clave natural el UPDATE puede cambiarla: se busca por la original
+        original = self.editando
+        self.editando = None
+        fila = self.entidad.fila(original, valores)
+
+        def al_terminar(n):
+            self.aplicar_cambios([Cambio(MODIFICACION, original, fila)])
+            self.mostrar_ok(f"{self.entidad.singular.capitalize()} guardado.")
+
+        self.tareas.ejecutar(escribir, self.entidad.modulo, self.entidad.sql_modificacion, valores + (original,),
+                             al_terminar=al_terminar, al_fallar=self.error_escritura,
+                             escritura=True, al_confirmar=lambda n: self.confirmar())
+
+    def baja(self, e):
+        entidad = self.entidad
+        valor = (self.txt[entidad.consulta].value or "").strip()
+        if not valor:
+            self.limpiar()
+            return
+        if entidad.consulta == entidad.clave.columna:
+            cambios = [Cambio(BAJA, valor)]
+        else:
+            indice = entidad.columnas.index(entidad.consulta)
+            cambios = [Cambio(BAJA, clave) for clave in self.tabla.modelo.claves_donde(indice, valor)]
+        self.tareas.ejecutar(escribir, entidad.modulo, entidad.sql_baja_consulta, (valor,),
+                             al_terminar=lambda n: self.aplicar_cambios(cambios, -n), al_fallar=self.error_escritura,
+                             escritura=True, al_confirmar=lambda n: self.confirmar(-n))
+
+    def borrar(self, clave):
+        self.tareas.ejecutar(escribir, self.entidad.modulo, self.entidad.sql_baja, (clave,),
+                             al_terminar=lambda n: self.aplicar_cambios([Cambio(BAJA, clave)], -n, limpiar=False),
+                             al_fallar=self.error_escritura,
+                             escritura=True, al_confirmar=lambda n: self.confirmar(-n))
+
+    def error_escritura(self, ex):
+        # Las claves foráneas no dejan borrar (ni cambiar la clave de) filas referenciadas
+        if es_error_referencia(ex):
+            ex = f"el {self.entidad.singular} {self.entidad.en_uso}."
+        self.mostrar_error(ex)
+
+    def consulta(self, e):
+        entidad = self.entidad
+        valor = (self.txt[entidad.consulta].value or "").strip()
+        if valor:
+            columna = None if entidad.consulta == entidad.clave.columna else entidad.consulta
+            self.tabla.buscar_fila(valor, self.mostrar_consulta, self.mostrar_error, columna=columna)
+
+    def mostrar_consulta(self, fila):
+        if fila:
+            self.llenar_formulario(fila)
+        else:
+            self.lbl_error.value = ""
+            self.lbl_ok.value = f"No se encontró el {self.entidad.singular}."
+        actualizar(self.page)
+
+    def cargar_editar(self, clave):
+        self.tabla.buscar_fila(clave, self.mostrar_edicion, self.mostrar_error)
+
+    def mostrar_edicion(self, fila):
+        if fila:
+            self.llenar_formulario(fila)
+            self.editando = fila[0]
+            self.lbl_error.value = ""
+            self.lbl_ok.value = ""
+        actualizar(self.page)
+
+    def volver_menu(self, e):
+        # Descarta las consultas pendientes antes de salir de la pantalla;
+        # las escrituras se completan igual
+        self.tareas.cancelar()
+        self.volver(self.page)
@@ -0,0 +1,453 @@
+import os
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+import motor_sqlite
+from instrumentacion import ConexionMedida, CursorMedido
+
+# =========================
+# CONFIGURACIÓN BASE DE DATOS
+# =========================
+
+# "mysql" usa el servidor de DB_CONFIG; "sqlite" guarda todo en un archivo
+# local (SQLITE_CONFIG) y no necesita instalar nada. Se puede cambiar con
+# la variable de entorno TALLER_MOTOR.
+MOTOR = os.environ.get("TALLER_MOTOR", "mysql")
+
+SQLITE_CONFIG = {
+    "ruta": os.environ.get("TALLER_SQLITE", "taller_mecanico.db"),
+    "espera_bloqueo": 5,  # segundos que se espera si otra conexión está escribiendo
+}
+
+DB_CONFIG = {
+    "host": "localhost",
+    "port": 3306,
+    "user": "root",       # <-- ajustá usuario si hace falta
+    "password": "1234",   # <-- ajustá contraseña si hace falta
+    "database": "taller_mecanico",
+    "charset": "utf8mb4",
+    "autocommit": True,
+}
+
+POOL_CONFIG = {
+    "max_conexiones": 8,     # conexiones abiertas como máximo contra MySQL
+    "max_inactividad": 300,  # segundos que una conexión libre puede quedar ociosa
+    "intervalo_ping": 30,    # segundos sin uso antes de verificarla con ping
+    "espera_maxima": 5,      # segundos que se espera por una conexión libre
+    "espera_reconexion": 0.5,       # primera pausa tras no poder conectar; se duplica en cada fallo
+    "espera_reconexion_max": 30,    # pausa máxima entre intentos de conexión
+}
+
+REINTENTOS_LECTURA = 2  # veces que se repite una lectura cortada por la conexión
+
+
+# Identifica a esta terminal en la tabla cambios: los triggers guardan
+# @terminal, que cada conexión fija al abrirse.
+TERMINAL = re.sub(r"[^\w.-]", "_", f"{socket.gethostname()}-{os.getpid()}")[:64]
+
+
+class PoolAgotado(Exception):
+    """No se liberó ninguna conexión dentro del tiempo de espera."""
+
+
+# =========================
+# POOL DE CONEXIONES
+# =========================
+
+class PoolConexiones:
+    """
+    Pool de conexiones pymysql compartido por todos los módulos.
+
+    Reutiliza las conexiones en lugar de abrir una por operación, limita
+    cuántas hay abiertas a la vez, cierra las que quedan ociosas demasiado
+    tiempo y verifica con ping las que llevan un rato sin usarse (la que
+    no responde se reemplaza por una nueva: una reconexión).
+
+    Si el servidor no responde, después de cada fallo se espera el doble
+    que la vez anterior (de espera_reconexion hasta espera_reconexion_max)
+    antes de volver a intentar; mientras tanto los pedidos fallan enseguida
+    en lugar de esperar el timeout de conexión cada uno.
+    """
+
+    def __init__(self, config, max_conexiones=8, max_inactividad=300,
+                 intervalo_ping=30, espera_maxima=5, espera_reconexion=0.5,
+                 espera_reconexion_max=30):
+        self.config = dict(config)
+        self.max_conexiones = max_conexiones
+        self.max_inactividad = max_inactividad
+        self.intervalo_ping = intervalo_ping
+        self.espera_maxima = espera_maxima
+        self.espera_reconexion = espera_reconexion
+        self.espera_reconexion_max = espera_reconexion_max
+        self._cond = threading.Condition()
+        self._fallos_seguidos = 0
+        self._reintentar_desde = 0.0
+        self._reconexiones = 0
+        self._fallos_conexion = 0
+        self._libres = []  # (conexion, momento en que se devolvió)
+        self._abiertas = 0
+        self._creadas = 0
+        self._desalojadas = 0
+        self._pings_fallidos = 0
+        self._por_modulo = {}
+
+    def _stats_modulo(self, modulo):
+        if modulo not in self._por_modulo:
+            self._por_modulo[modulo] = {
+                "prestamos": 0,
+                "en_uso": 0,
+                "espera_total": 0.0,
+                "errores": 0,
+            }
+        return self._por_modulo[modulo]
+
+    def _desalojar_inactivas(self):
+        """Cierra las conexiones libres que superaron max_inactividad."""
+        limite = time.monotonic() - self.max_inactividad
+        vigentes = []
+        for conn, devuelta in self._libres:
+            if devuelta < limite:
+                self._cerrar_silencioso(conn)
+                self._abiertas -= 1
+                self._desalojadas += 1
+            else:
+                vigentes.append((conn, devuelta))
+        self._libres = vigentes
+
+    @staticmethod
+    def _cerrar_silencioso(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _conectar(self):
+        """Abre una conexión nueva respetando la espera entre fallos."""
+        with self._cond:
+            restante = self._reintentar_desde - time.monotonic()
+        if restante > 0:
+            raise pymysql.err.OperationalError(
+                2003, f"Servidor no disponible; se reintenta en {restante:.1f} s."
+            )
+        try:
+            conn = pymysql.connect(**self.config)
+        except Exception as ex:
+            if es_error_conexion(ex):
+                with self._cond:
+                    self._fallos_seguidos += 1
+                    self._fallos_conexion += 1
+                    espera = min(
+                        self.espera_reconexion * 2 ** (self._fallos_seguidos - 1),
+                        self.espera_reconexion_max,
+                    )
+                    self._reintentar_desde = time.monotonic() + espera
+            raise
+        with self._cond:
+            self._creadas += 1
+            if self._fallos_seguidos:
+                # Volvió el servidor después de una caída
+                self._reconexiones += 1
+            self._fallos_seguidos = 0
+            self._reintentar_desde = 0.0
+        return conn
+
+    def obtener(self, modulo="general"):
+        """Presta una conexión viva; espera si se alcanzó max_conexiones."""
+        inicio = time.monotonic()
+        fin = inicio + self.espera_maxima
+        conn = None
+        devuelta = None
+        with self._cond:
+            while True:
+                self._desalojar_inactivas()
+                if self._libres:
+                    conn, devuelta = self._libres.pop()
+                    break
+                if self._abiertas < self.max_conexiones:
+                    self._abiertas += 1
+                    break
+                restante = fin - time.monotonic()
+                if restante <= 0:
+                    self._stats_modulo(modulo)["errores"] += 1
+                    raise PoolAgotado(
+                        f"No hay conexiones libres ({self.max_conexiones} en uso)."
+                    )
+                self._cond.wait(restante)
+
+        try:
+            if conn is None:
+                conn = self._conectar()
+            elif time.monotonic() - devuelta > self.intervalo_ping:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    # Por ejemplo, MySQL la cerró por wait_timeout
+                    with self._cond:
+                        self._pings_fallidos += 1
+                    self._cerrar_silencioso(conn)
+                    conn = self._conectar()
+                    with self._cond:
+                        self._reconexiones += 1
+        except Exception:
+            with self._cond:
+                self._abiertas -= 1
+                self._stats_modulo(modulo)["errores"] += 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            stats = self._stats_modulo(modulo)
+            stats["prestamos"] += 1
+            stats["en_uso"] += 1
+            stats["espera_total"] += time.monotonic() - inicio
+        return conn
+
+    def devolver(self, conn, modulo="general"):
+        """Devuelve una conexión prestada; si quedó cerrada se descarta."""
+        with self._cond:
+            self._stats_modulo(modulo)["en_uso"] -= 1
+            if conn.open:
+                self._libres.append((conn, time.monotonic()))
+            else:
+                self._abiertas -= 1
+            self._cond.notify()
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres (al salir de la aplicación)."""
+        with self._cond:
+            for conn, _ in self._libres:
+                self._cerrar_silencioso(conn)
+            self._abiertas -= len(self._libres)
+            self._libres = []
+
+    def estadisticas(self):
+        """Devuelve un dict con el estado del pool y los contadores por módulo."""
+        with self._cond:
+            return {
+                "abiertas": self._abiertas,
+                "libres": len(self._libres),
+                "max_conexiones": self.max_conexiones,
+                "creadas": self._creadas,
+                "desalojadas": self._desalojadas,
+                "pings_fallidos": self._pings_fallidos,
+                "reconexiones": self._reconexiones,
+                "fallos_conexion": self._fallos_conexion,
+                "modulos": {m: dict(s) for m, s in self._por_modulo.items()},
+            }
+
+
+class ConexionPrestada:
+    """
+    Envoltorio de una conexión del pool.
+
+    Se usa igual que una conexión pymysql, pero close() la devuelve al
+    pool en vez de cerrar el socket y sus cursores registran tiempos en
+    instrumentacion.
+    """
+
+    def __init__(self, pool, conn, modulo):
+        self._pool = pool
+        self._conn = conn
+        self.modulo = modulo
+
+    def __getattr__(self, nombre):
+        if self._conn is None:
+            raise pymysql.err.InterfaceError("La conexión ya fue devuelta al pool.")
+        return getattr(self._conn, nombre)
+
+    def cursor(self, *args):
+        return CursorMedido(self.__getattr__("cursor")(*args), self.modulo)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.devolver(self._conn, self.modulo)
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool():
+    """
+    Devuelve el pool global, creándolo la primera vez según MOTOR: un
+    PoolConexiones con DB_CONFIG o una conexión SQLite por hilo.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if MOTOR == "sqlite":
+                _pool = motor_sqlite.ConexionesSqlite(**SQLITE_CONFIG)
+            else:
+                config = dict(DB_CONFIG, init_command=f"SET @terminal = '{TERMINAL}'")
+                _pool = PoolConexiones(config, **POOL_CONFIG)
+        return _pool
+
+
+def conectar(modulo="general"):
+    """Presta una conexión del pool o devuelve None si falla."""
+    pool = obtener_pool()
+    try:
+        return ConexionPrestada(pool, pool.obtener(modulo), modulo)
+    except Exception as ex:
+        print(f"Error al conectar a la base de datos: {ex}")
+        return None
+
+
+@contextmanager
+def conexion(modulo="general"):
+    """
+    Presta una conexión del pool durante el bloque with; modulo identifica
+    a la vista en las estadísticas del pool y de instrumentacion.
+    """
+    pool = obtener_pool()
+    conn = pool.obtener(modulo)
+    try:
+        yield ConexionMedida(conn, modulo)
+    finally:
+        pool.devolver(conn, modulo)
+
+
+lecturas_reintentadas = 0
+
+
+def reintentar_lectura(funcion, *args):
+    """
+    Llama funcion(*args), una lectura que se puede repetir sin efectos:
+    si falla por la conexión (por ejemplo "MySQL server has gone away")
+    se repite hasta REINTENTOS_LECTURA veces. La conexión cortada ya no
+    vuelve al pool, así que cada intento usa otra.
+    """
+    global lecturas_reintentadas
+    for intento in range(REINTENTOS_LECTURA + 1):
+        try:
+            return funcion(*args)
+        except Exception as ex:
+            if intento == REINTENTOS_LECTURA or not es_error_conexion(ex):
+                raise
+            lecturas_reintentadas += 1
+
+
+def _consultar_uno(modulo, sql, params):
+    with conexion(modulo) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+
+
+def consultar_uno(modulo, sql, params=()):
+    """Ejecuta una consulta y devuelve la primera fila (o None)."""
+    return reintentar_lectura(_consultar_uno, modulo, sql, params)
+
+
+# =========================
+# ESCRITURAS
+# =========================
+# Las conexiones tienen autocommit: cada sentencia suelta se confirma en
+# el mismo viaje al servidor. Sólo hace falta commit dentro de transaccion().
+
+
+def ejecutar(modulo, sql, params=()):
+    """Ejecuta una escritura y devuelve la cantidad de filas afectadas."""
+    with conexion(modulo) as conn:
+        with conn.cursor() as cursor:
+            return cursor.execute(sql, params)
+
+
+def insertar(modulo, sql, params=(), clave=None):
+    """
+    Ejecuta un INSERT y devuelve (filas, id): filas afectadas y el id
+    autoincremental asignado. Con clave (la columna de la clave primaria)
+    se agrega ON DUPLICATE KEY UPDATE clave = clave: si choca con una
+    clave única no inserta y filas es 0, sin consultar antes si la fila
+    existe. A diferencia de INSERT IGNORE, los demás errores (un valor
+    demasiado largo, un nulo) no se vuelven advertencias.
+    """
+    if clave:
+        sql = f"{sql} ON DUPLICATE KEY UPDATE {clave} = {clave}"
+    with conexion(modulo) as conn:
+        with conn.cursor() as cursor:
+            filas = cursor.execute(sql, params)
+            return filas, cursor.lastrowid if filas else None
+
+
+@contextmanager
+def transaccion(modulo="general"):
+    """
+    Cursor para varias sentencias que se confirman juntas al salir del
+    bloque with, o se deshacen todas si hay una excepción.
+    """
+    with conexion(modulo) as conn:
+        conn.begin()
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def estadisticas():
+    return dict(obtener_pool().estadisticas(), lecturas_reintentadas=lecturas_reintentadas)
+
+
+# =========================
+# DIFERENCIAS ENTRE MOTORES
+# =========================
+
+def es_sqlite():
+    return MOTOR == "sqlite"
+
+
+def escape_like():
+    """Cláusula ESCAPE para los patrones de patron_prefijo (MySQL ya usa la barra)."""
+    return " ESCAPE '\\'" if es_sqlite() else ""
+
+
+def es_error_existente(ex):
+    """Indica si el error es por una tabla, columna o índice que ya existe."""
+    if es_sqlite():
+        return motor_sqlite.es_error_existente(ex)
+    # 1050 tabla, 1060 columna, 1061 índice existente; 1091 índice a borrar que no existe
+    return isinstance(ex, pymysql.err.MySQLError) and bool(ex.args) and ex.args[0] in (1050, 1060, 1061, 1091)
+
+
+def es_error_referencia(ex):
+    """Indica si el error es por borrar (o cambiar la clave de) una fila que otra tabla referencia."""
+    if es_sqlite():
+        return motor_sqlite.es_error_referencia(ex)
+    # 1451: la fila es padre de una clave foránea
+    return isinstance(ex, pymysql.err.IntegrityError) and bool(ex.args) and ex.args[0] == 1451
+
+
+# Errores de pymysql que indican que el servidor no está disponible (no
+# conecta, se cayó la conexión o se perdió a mitad de una consulta)
+ERRORES_CONEXION = (2003, 2006, 2013, 2055)
+
+
+def es_error_conexion(ex):
+    """Indica si el error es por no poder hablar con la base (y no por los datos)."""
+    if es_sqlite():
+        return False
+    if isinstance(ex, pymysql.err.InterfaceError):
+        return True
+    if isinstance(ex, pymysql.err.OperationalError):
+        return bool(ex.args) and ex.args[0] in ERRORES_CONEXION
+    return isinstance(ex, OSError)
+
+
+def cerrar_pool():
+    if _pool is not None:
+        _pool.cerrar()
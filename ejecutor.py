@@ -0,0 +1,146 @@
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import flet as ft
+
+from render import accion, actualizar, lock_ui
+
+MAX_HILOS = 4
+
+# Hilos compartidos para todo el acceso a la base; así un click nunca
+# bloquea el hilo que atiende los eventos de Flet.
+_hilos = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix="bd")
+
+# Tareas de la vista que está mostrando cada página.
+_vista_actual = {}
+_vista_lock = threading.Lock()
+
+
+class Tarea:
+    def __init__(self, escritura=False):
+        self.cancelada = False
+        self.escritura = escritura
+        self.futuro = None
+
+    def cancelar(self):
+        self.cancelada = True
+        # Una escritura se hace igual; sólo se descarta su respuesta
+        if self.futuro is not None and not self.escritura:
+            self.futuro.cancel()
+
+
+class Tareas:
+    """
+    Ejecuta funciones de base de datos en segundo plano para una vista.
+
+    ejecutar(funcion, *args, al_terminar=..., al_fallar=...) corre la función
+    en el pool de hilos y después llama al callback con el resultado (o con
+    la excepción). Si se pasa clave, un pedido nuevo con la misma clave
+    cancela al anterior: sólo se aplica la respuesta más reciente.
+
+    Crear las Tareas de una vista nueva cancela las de la vista anterior de
+    la misma página, así las respuestas que llegan tarde no pisan la
+    pantalla a la que se navegó. Con escritura=True la función corre
+    aunque se cancele y al_confirmar(resultado) se llama siempre que
+    termine bien, desde el hilo de la base: es la parte de la respuesta
+    que no toca controles (resumen, caché). Cancelar sólo descarta
+    al_terminar y al_fallar.
+
+    lecturas_descartadas queda en True si al salir de la vista se descartó
+    alguna lectura: lo que muestra puede estar incompleto. self.indicador
+    es una barra de progreso visible mientras haya pedidos en curso.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.indicador = ft.ProgressBar(width=400, height=3, visible=False)
+        self._activas = set()
+        self._por_clave = {}
+        self._lock = threading.Lock()
+        self.lecturas_descartadas = False
+        self.activar()
+
+    def activar(self):
+        """
+        Marca estas Tareas como las de la vista visible de la página y
+        cancela las de la vista anterior (al crearlas, o al volver a una
+        vista guardada).
+        """
+        with _vista_lock:
+            anterior = _vista_actual.get(id(self.page))
+            _vista_actual[id(self.page)] = self
+        if anterior is not None and anterior is not self:
+            anterior.cancelar()
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None, clave=None,
+                 escritura=False, al_confirmar=None):
+        tarea = Tarea(escritura)
+        with self._lock:
+            if clave is not None:
+                previa = self._por_clave.get(clave)
+                if previa is not None:
+                    previa.cancelar()
+                self._por_clave[clave] = tarea
+            self._activas.add(tarea)
+        self._actualizar_indicador()
+        tarea.futuro = _hilos.submit(
+            self._correr, tarea, funcion, args, al_terminar, al_fallar, clave, al_confirmar
+        )
+        return tarea
+
+    def _correr(self, tarea, funcion, args, al_terminar, al_fallar, clave, al_confirmar):
+        resultado = None
+        error = None
+        if tarea.escritura or not tarea.cancelada:
+            try:
+                resultado = funcion(*args)
+            except Exception as ex:
+                error = ex
+            if error is None and al_confirmar:
+                try:
+                    al_confirmar(resultado)
+                except Exception:
+                    traceback.print_exc()
+        with self._lock:
+            self._activas.discard(tarea)
+            if clave is not None and self._por_clave.get(clave) is tarea:
+                del self._por_clave[clave]
+        if tarea.cancelada:
+            return
+        callback = al_terminar if error is None else al_fallar
+        # Lo que cambie el callback (y el indicador) sale en un solo envío
+        with lock_ui, accion(self.page, getattr(callback, "__qualname__", "respuesta")):
+            try:
+                if error is None:
+                    if al_terminar:
+                        al_terminar(resultado)
+                elif al_fallar:
+                    al_fallar(error)
+                else:
+                    print(f"Error en segundo plano: {error}")
+            except Exception:
+                traceback.print_exc()
+            self._actualizar_indicador()
+
+    def _actualizar_indicador(self):
+        with self._lock:
+            ocupado = bool(self._activas)
+        if self.indicador.visible != ocupado:
+            self.indicador.visible = ocupado
+            actualizar(self.page)
+
+    def cancelar(self):
+        """
+        Descarta los pedidos en curso (al salir de la vista); las
+        escrituras se completan igual, sin su respuesta en pantalla.
+        """
+        with self._lock:
+            activas = list(self._activas)
+            self._activas.clear()
+            self._por_clave.clear()
+        if any(not tarea.escritura for tarea in activas):
+            self.lecturas_descartadas = True
+        for tarea in activas:
+            tarea.cancelar()
+        self.indicador.visible = False
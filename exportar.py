@@ -0,0 +1,123 @@
+import argparse
+import csv
+import gzip
+import json
+import sys
+
+import pymysql
+
+from db import conexion
+
+TAM_BLOQUE = 1000  # filas pedidas al servidor por vez
+
+# Tabla -> columnas exportadas (la contraseña de los usuarios no se exporta)
+TABLAS_EXPORTABLES = {
+    "clientes": ["dni", "nombre", "apellido", "direccion", "telefono"],
+    "proveedores": ["id", "nombre", "cuit", "telefono", "direccion"],
+    "productos": ["id", "nombre", "precio", "fabricante"],
+    "mecanicos": ["legajo", "nombre", "apellido", "rol", "estado"],
+    "usuarios": ["id_usuario", "nombre", "apellido", "usuario", "rol"],
+    "vehiculos": ["patente", "marca", "modelo", "color"],
+    "presupuestos": ["id_presupuesto", "dni_cliente", "monto", "estado", "detalle", "fecha_creacion", "cantidad_items"],
+    "presupuesto_items": ["id_item", "id_presupuesto", "id_producto", "cantidad", "precio_unitario"],
+}
+
+FORMATOS = ("csv", "jsonl")
+
+
+def leer_filas(conn, tabla, tam_bloque=TAM_BLOQUE):
+    """
+    Recorre la tabla con un cursor sin buffer (SSCursor): el servidor
+    envía las filas a medida que se piden, así la memoria no depende del
+    tamaño de la tabla.
+    """
+    columnas = TABLAS_EXPORTABLES[tabla]
+    with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(f"SELECT {', '.join(columnas)} FROM {tabla}")
+        while True:
+            bloque = cursor.fetchmany(tam_bloque)
+            if not bloque:
+                break
+            yield from bloque
+
+
+def lineas_csv(columnas, filas):
+    """Convierte las filas en líneas CSV, empezando por el encabezado."""
+
+    class _Linea:
+        def write(self, texto):
+            self.texto = texto
+
+    linea = _Linea()
+    escritor = csv.writer(linea, lineterminator="\n")
+    escritor.writerow(columnas)
+    yield linea.texto
+    for fila in filas:
+        escritor.writerow(fila)
+        yield linea.texto
+
+
+def lineas_jsonl(columnas, filas):
+    """Una línea JSON por fila; fechas y decimales se escriben como texto."""
+    for fila in filas:
+        yield json.dumps(dict(zip(columnas, fila)), ensure_ascii=False, default=str) + "\n"
+
+
+def abrir_salida(ruta, comprimir):
+    if comprimir:
+        return gzip.open(ruta, "wt", encoding="utf-8", newline="")
+    return open(ruta, "w", encoding="utf-8", newline="")
+
+
+def exportar_tabla(tabla, ruta, formato="csv", comprimir=None, al_progresar=None):
+    """
+    Escribe la tabla completa en ruta y devuelve la cantidad de filas.
+
+    comprimir=None usa gzip si la ruta termina en .gz. al_progresar(filas)
+    se llama cada TAM_BLOQUE filas escritas.
+    """
+    if tabla not in TABLAS_EXPORTABLES:
+        raise ValueError(f"Tabla no exportable: {tabla}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}")
+    if comprimir is None:
+        comprimir = ruta.endswith(".gz")
+
+    columnas = TABLAS_EXPORTABLES[tabla]
+    convertir = lineas_csv if formato == "csv" else lineas_jsonl
+    contador = [0]
+    with conexion("exportacion") as conn, abrir_salida(ruta, comprimir) as salida:
+        filas = _contar(leer_filas(conn, tabla), contador, al_progresar)
+        for linea in convertir(columnas, filas):
+            salida.write(linea)
+    if al_progresar:
+        al_progresar(contador[0])
+    return contador[0]
+
+
+def _contar(filas, contador, al_progresar):
+    for fila in filas:
+        contador[0] += 1
+        if al_progresar and contador[0] % TAM_BLOQUE == 0:
+            al_progresar(contador[0])
+        yield fila
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta una tabla a CSV o JSON Lines.")
+    parser.add_argument("tabla", choices=sorted(TABLAS_EXPORTABLES))
+    parser.add_argument("archivo", help="ruta de salida; si termina en .gz se comprime")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv")
+    parser.add_argument("--gzip", action="store_true", default=None, help="comprimir con gzip")
+    args = parser.parse_args(argv)
+
+    cantidad = exportar_tabla(
+        args.tabla, args.archivo, args.formato, args.gzip,
+        lambda n: print(f"\r{n} filas", end="", flush=True),
+    )
+    print(f"\r{cantidad} filas exportadas a {args.archivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import flet as ft
+
+from render import actualizar
+
+FILAS_VISIBLES = 15
+ALTO_FILA = 40
+
+
+class FuenteFilas:
+    """Filas de una consulta que la grilla lee por posición."""
+
+    def __init__(self, filas=None):
+        self.filas = list(filas or [])
+
+    def total(self):
+        return len(self.filas)
+
+    def fila(self, indice):
+        return self.filas[indice]
+
+    def reemplazar(self, filas):
+        self.filas = list(filas)
+
+
+class GrillaVirtual:
+    """
+    Grilla que sólo construye los controles de las filas visibles.
+
+    Se crean filas_visibles renglones una única vez (con sus botones de
+    acción) y al desplazarse se reasignan los valores de la fuente a esos
+    mismos renglones, así la cantidad de controles no depende del tamaño
+    de la tabla.
+
+    columnas: lista de (título, ancho).
+    valores(fila): devuelve los valores a mostrar, por defecto la fila misma.
+    acciones: lista de (icono, tooltip, funcion(clave)); la clave es fila[0].
+    al_seleccionar(fila): se llama al hacer click en un renglón.
+    al_ordenar(indice): se llama al hacer click en el título de una de las
+    columnas ordenables (índices en columnas).
+    """
+
+    def __init__(self, page, columnas, fuente=None, valores=None, acciones=None,
+                 al_seleccionar=None, filas_visibles=FILAS_VISIBLES, alto_fila=ALTO_FILA,
+                 ordenables=(), al_ordenar=None):
+        self.page = page
+        self.columnas = columnas
+        self.fuente = fuente or FuenteFilas()
+        self.valores = valores or (lambda fila: fila)
+        self.acciones = acciones or []
+        self.al_seleccionar = al_seleccionar
+        self.filas_visibles = filas_visibles
+        self.alto_fila = alto_fila
+        self.inicio = 0
+
+        self.titulos = [ft.Text(titulo, weight="bold", size=13) for titulo, _ in columnas]
+        celdas = []
+        for i, (titulo, ancho) in enumerate(columnas):
+            if i in ordenables and al_ordenar:
+                self.titulos[i].color = "#0369A1"
+                celdas.append(ft.Container(
+                    width=ancho, content=self.titulos[i], tooltip=f"Ordenar por {titulo}",
+                    on_click=lambda e, i=i: al_ordenar(i),
+                ))
+            else:
+                self.titulos[i].width = ancho
+                celdas.append(self.titulos[i])
+        encabezado = ft.Row(
+            celdas + ([ft.Text("Acciones", weight="bold", size=13)] if self.acciones else []),
+            spacing=10,
+        )
+        self.renglones = [self._crear_renglon() for _ in range(filas_visibles)]
+        self.lbl_mensaje = ft.Text("", visible=False)
+        self.lbl_posicion = ft.Text("", size=11, color="#6B7280")
+        self.btn_arriba = ft.IconButton(
+            content=ft.Text("▲", size=12), tooltip="Subir", on_click=lambda e: self.desplazar(-self.filas_visibles)
+        )
+        self.btn_abajo = ft.IconButton(
+            content=ft.Text("▼", size=12), tooltip="Bajar", on_click=lambda e: self.desplazar(self.filas_visibles)
+        )
+        self.control = ft.Column([
+            encabezado,
+            ft.Divider(height=1),
+            self.lbl_mensaje,
+            ft.GestureDetector(
+                content=ft.Column(self.renglones, spacing=0),
+                on_scroll=self._on_scroll,
+            ),
+            ft.Row([self.btn_arriba, self.btn_abajo, self.lbl_posicion], spacing=5),
+        ], spacing=4)
+
+    def _crear_renglon(self):
+        celdas = [ft.Text("", width=ancho, size=13, no_wrap=True) for _, ancho in self.columnas]
+        botones = [
+            ft.IconButton(
+                content=ft.Image(src=icono, width=24, height=24),
+                tooltip=tooltip,
+                on_click=lambda e, fn=funcion: fn(e.control.data),
+            )
+            for icono, tooltip, funcion in self.acciones
+        ]
+        return ft.Container(
+            height=self.alto_fila,
+            visible=False,
+            content=ft.Row(celdas + botones, spacing=10),
+            on_click=self._on_click_renglon,
+        )
+
+    def _on_click_renglon(self, e):
+        if self.al_seleccionar and e.control.data is not None:
+            self.al_seleccionar(e.control.data)
+
+    def _on_scroll(self, e):
+        delta = getattr(e, "scroll_delta_y", 0) or 0
+        if delta:
+            self.desplazar(3 if delta > 0 else -3)
+
+    def _pintar(self):
+        total = self.fuente.total()
+        for i, renglon in enumerate(self.renglones):
+            pos = self.inicio + i
+            if pos >= total:
+                renglon.visible = False
+                renglon.data = None
+                continue
+            fila = self.fuente.fila(pos)
+            controles = renglon.content.controls
+            for celda, valor in zip(controles, self.valores(fila)):
+                celda.value = "" if valor is None else str(valor)
+            for boton in controles[len(self.columnas):]:
+                boton.data = fila[0]
+            renglon.data = fila
+            renglon.visible = True
+        if total:
+            fin = min(self.inicio + self.filas_visibles, total)
+            self.lbl_posicion.value = f"Filas {self.inicio + 1}-{fin} de {total}"
+        else:
+            self.lbl_posicion.value = ""
+        self.btn_arriba.disabled = self.inicio == 0
+        self.btn_abajo.disabled = self.inicio + self.filas_visibles >= total
+
+    def desplazar(self, cantidad):
+        maximo = max(self.fuente.total() - self.filas_visibles, 0)
+        inicio = min(max(self.inicio + cantidad, 0), maximo)
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._pintar()
+            actualizar(self.page)
+
+    def mostrar(self, filas):
+        """Carga filas nuevas en la fuente y vuelve al primer renglón."""
+        self.fuente.reemplazar(filas)
+        self.inicio = 0
+        self.lbl_mensaje.visible = False
+        self._pintar()
+
+    def refrescar(self):
+        """Vuelve a pintar los renglones sin mover la posición (tras un cambio)."""
+        maximo = max(self.fuente.total() - self.filas_visibles, 0)
+        self.inicio = min(self.inicio, maximo)
+        self.lbl_mensaje.visible = False
+        self._pintar()
+
+    def marcar_orden(self, indice, descendente):
+        """Pone ▲ o ▼ junto al título de la columna por la que se ordena."""
+        for i, (titulo, _) in enumerate(self.columnas):
+            if i == indice:
+                titulo += " ▼" if descendente else " ▲"
+            self.titulos[i].value = titulo
+
+    def mensaje(self, texto, color="#888"):
+        """Muestra un aviso (tabla vacía, error) en lugar de las filas."""
+        self.fuente.reemplazar([])
+        self.inicio = 0
+        self.lbl_mensaje.value = texto
+        self.lbl_mensaje.color = color
+        self.lbl_mensaje.visible = True
+        self._pintar()
@@ -0,0 +1,310 @@
+import argparse
+import csv
+import os
+import re
+import sys
+
+from cache import cache_entidades
+from db import conexion
+from resumen import ajustar_resumen
+
+TAM_LOTE = 1000
+MAX_ERRORES_INFORMADOS = 500
+
+
+def _texto(valor, requerido=False):
+    valor = (valor or "").strip()
+    if requerido and not valor:
+        raise ValueError("campo obligatorio vacío")
+    if len(valor) > 255:
+        raise ValueError("supera los 255 caracteres")
+    return valor
+
+
+def _dni(valor):
+    valor = re.sub(r"[.\s]", "", valor or "")
+    if not valor.isdigit():
+        raise ValueError(f"DNI inválido: {valor!r}")
+    return valor
+
+
+def _cuit(valor):
+    valor = (valor or "").strip()
+    if valor and len(re.sub(r"\D", "", valor)) != 11:
+        raise ValueError(f"CUIT inválido: {valor!r}")
+    return valor
+
+
+def _precio(valor):
+    valor = (valor or "").strip().replace("$", "").replace(" ", "")
+    if "," in valor:
+        # Formato local: 1.234,50
+        valor = valor.replace(".", "").replace(",", ".")
+    try:
+        return int(round(float(valor)))
+    except ValueError:
+        raise ValueError(f"precio inválido: {valor!r}")
+
+
+def _id(valor):
+    valor = (valor or "").strip()
+    if not valor:
+        return None
+    if not valor.isdigit():
+        raise ValueError(f"id inválido: {valor!r}")
+    return int(valor)
+
+
+# Columnas del CSV -> (columna de la tabla, validador). Si la clave no es
+# parte del archivo (id vacío) la base la genera; si viene y ya existe,
+# la fila se actualiza. unicas: columnas con clave única, por las que el
+# upsert puede encontrar la fila existente.
+ENTIDADES = {
+    "clientes": {
+        "tabla": "clientes",
+        "resumen": "clientes",
+        "unicas": ["dni"],
+        "columnas": [
+            ("dni", _dni),
+            ("nombre", lambda v: _texto(v, True)),
+            ("apellido", lambda v: _texto(v, True)),
+            ("direccion", _texto),
+            ("telefono", _texto),
+        ],
+    },
+    "productos": {
+        "tabla": "productos",
+        "resumen": "productos",
+        "unicas": ["id", "nombre"],
+        "columnas": [
+            ("id", _id),
+            ("nombre", lambda v: _texto(v, True)),
+            ("precio", _precio),
+            ("fabricante", _texto),
+        ],
+    },
+    "proveedores": {
+        "tabla": "proveedores",
+        "resumen": "proveedores",
+        "unicas": ["id", "nombre"],
+        "columnas": [
+            ("id", _id),
+            ("nombre", lambda v: _texto(v, True)),
+            ("cuit", _cuit),
+            ("telefono", _texto),
+            ("direccion", _texto),
+        ],
+    },
+}
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.procesadas = 0
+        self.insertadas = 0
+        self.actualizadas = 0
+        self.errores = []  # (número de línea, mensaje)
+        self.cantidad_errores = 0
+
+    def agregar_error(self, linea, mensaje):
+        self.cantidad_errores += 1
+        if len(self.errores) < MAX_ERRORES_INFORMADOS:
+            self.errores.append((linea, mensaje))
+
+    def __str__(self):
+        return (
+            f"{self.procesadas} filas leídas: {self.insertadas} nuevas, "
+            f"{self.actualizadas} actualizadas, {self.cantidad_errores} con errores"
+        )
+
+
+def sql_upsert(tabla, columnas):
+    """INSERT que actualiza la fila si la clave (primera columna) ya existe."""
+    nombres = ", ".join(columnas)
+    marcas = ", ".join(["%s"] * len(columnas))
+    actualizar = ", ".join(f"{c} = VALUES({c})" for c in columnas[1:])
+    return f"INSERT INTO {tabla} ({nombres}) VALUES ({marcas}) ON DUPLICATE KEY UPDATE {actualizar}"
+
+
+def _contar_bytes(archivo, leidos):
+    for linea in archivo:
+        leidos[0] += len(linea.encode("utf-8"))
+        yield linea
+
+
+def leer_lotes(archivo, columnas, tam_lote=TAM_LOTE, leidos=None):
+    """
+    Lee el CSV de a tam_lote filas; devuelve tuplas (número de línea, dict).
+    Detecta el separador (coma, punto y coma o tabulación). Si se pasa
+    leidos (lista de un elemento) se acumulan ahí los bytes consumidos.
+    """
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    if leidos is not None:
+        archivo = _contar_bytes(archivo, leidos)
+    lector = csv.DictReader(archivo, dialect=dialecto)
+    encabezado = [c.strip().lower() for c in (lector.fieldnames or [])]
+    faltantes = [c for c in columnas if c not in encabezado and c != "id"]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+    lector.fieldnames = encabezado
+    lote = []
+    for fila in lector:
+        lote.append((lector.line_num, fila))
+        if len(lote) >= tam_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _normalizar(valor):
+    # Las columnas de texto comparan sin distinguir mayúsculas
+    return valor.lower() if isinstance(valor, str) else valor
+
+
+def _existentes(cursor, definicion, columnas, validas):
+    """
+    Valores de las columnas únicas del lote que ya están en la tabla, un
+    conjunto por columna.
+    """
+    unicas = definicion["unicas"]
+    condiciones = []
+    params = []
+    for columna in unicas:
+        i = columnas.index(columna)
+        valores = {v[i] for _, v in validas if v[i] is not None}
+        if valores:
+            condiciones.append(f"{columna} IN ({', '.join(['%s'] * len(valores))})")
+            params.extend(valores)
+    existentes = [set() for _ in unicas]
+    if condiciones:
+        cursor.execute(
+            f"SELECT {', '.join(unicas)} FROM {definicion['tabla']} WHERE {' OR '.join(condiciones)}",
+            params,
+        )
+        for fila in cursor.fetchall():
+            for conjunto, valor in zip(existentes, fila):
+                conjunto.add(_normalizar(valor))
+    return existentes
+
+
+def _es_nueva(valores, definicion, columnas, existentes):
+    """
+    True si la fila escrita fue un alta: ninguna columna única coincidía
+    con una fila existente (ni con una anterior del lote).
+    """
+    claves = [_normalizar(valores[columnas.index(c)]) for c in definicion["unicas"]]
+    nueva = not any(c is not None and c in conjunto for c, conjunto in zip(claves, existentes))
+    for c, conjunto in zip(claves, existentes):
+        if c is not None:
+            conjunto.add(c)
+    return nueva
+
+
+def _escribir_lote(conn, sql, definicion, columnas, validas, resultado):
+    """
+    Escribe un lote en una transacción; si falla, fila por fila.
+
+    Las altas se distinguen de las actualizaciones buscando antes las
+    claves del lote: sin CLIENT.FOUND_ROWS, MySQL informa 0 filas
+    afectadas para una fila que ya tenía esos valores.
+    """
+    try:
+        conn.begin()
+        with conn.cursor() as cursor:
+            existentes = _existentes(cursor, definicion, columnas, validas)
+            cursor.executemany(sql, [v for _, v in validas])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+    else:
+        for _, valores in validas:
+            if _es_nueva(valores, definicion, columnas, existentes):
+                resultado.insertadas += 1
+            else:
+                resultado.actualizadas += 1
+        return
+
+    # Un error de la base anula el lote entero; se reintenta fila por
+    # fila para informar sólo las que fallan.
+    conn.begin()
+    with conn.cursor() as cursor:
+        existentes = _existentes(cursor, definicion, columnas, validas)
+        for linea, valores in validas:
+            try:
+                cursor.execute(sql, valores)
+            except Exception as ex:
+                resultado.agregar_error(linea, str(ex))
+                continue
+            if _es_nueva(valores, definicion, columnas, existentes):
+                resultado.insertadas += 1
+            else:
+                resultado.actualizadas += 1
+    conn.commit()
+
+
+def importar_csv(entidad, ruta, tam_lote=TAM_LOTE, al_progresar=None):
+    """
+    Importa un CSV de clientes, productos o proveedores.
+
+    Las filas se validan y se escriben por lotes con INSERT ... ON
+    DUPLICATE KEY UPDATE; las filas inválidas se informan en el resultado
+    sin cortar la importación. al_progresar(resultado, fraccion) se llama
+    después de cada lote.
+    """
+    definicion = ENTIDADES[entidad]
+    columnas = [c for c, _ in definicion["columnas"]]
+    tam_total = max(os.path.getsize(ruta), 1)
+    sql = sql_upsert(definicion["tabla"], columnas)
+    resultado = ResultadoImportacion()
+    leidos = [0]
+
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        lotes = leer_lotes(archivo, columnas, tam_lote, leidos)
+        with conexion("importacion") as conn:
+            for lote in lotes:
+                validas = []
+                for linea, fila in lote:
+                    resultado.procesadas += 1
+                    try:
+                        valores = tuple(
+                            validar(fila.get(col)) for col, validar in definicion["columnas"]
+                        )
+                    except ValueError as ex:
+                        resultado.agregar_error(linea, str(ex))
+                        continue
+                    validas.append((linea, valores))
+                if validas:
+                    _escribir_lote(conn, sql, definicion, columnas, validas, resultado)
+                    cache_entidades.invalidar(definicion["tabla"])
+                if al_progresar:
+                    al_progresar(resultado, min(leidos[0] / tam_total, 1.0))
+
+    ajustar_resumen(definicion["resumen"], resultado.insertadas)
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa clientes, productos o proveedores desde un CSV.")
+    parser.add_argument("entidad", choices=sorted(ENTIDADES))
+    parser.add_argument("archivo")
+    parser.add_argument("--lote", type=int, default=TAM_LOTE, help="filas por transacción")
+    args = parser.parse_args(argv)
+
+    def progreso(resultado, fraccion):
+        print(f"\r{fraccion:6.1%}  {resultado}", end="", flush=True)
+
+    resultado = importar_csv(args.entidad, args.archivo, args.lote, progreso)
+    print()
+    for linea, mensaje in resultado.errores:
+        print(f"línea {linea}: {mensaje}")
+    return 1 if resultado.cantidad_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import re
+import threading
+import time
+from collections import deque
+
+from versiones import versiones_tablas
+
+UMBRAL_LENTA = 0.1  # segundos a partir de los cuales una sentencia va al log
+ARCHIVO_LENTAS = "consultas_lentas.log"
+VENTANA = 500  # duraciones recientes guardadas por sentencia para los percentiles
+
+_LITERAL_TEXTO = re.compile(r"'(?:[^'\\]|\\.)*'")
+_LITERAL_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def huella(sql):
+    """
+    Normaliza una sentencia para agrupar las que sólo cambian en sus
+    valores: literales y marcadores pasan a ?, las listas (?, ?, ...) a
+    (...) y los espacios se colapsan.
+    """
+    sql = sql.replace("%s", "?")
+    sql = _LITERAL_TEXTO.sub("?", sql)
+    sql = _LITERAL_NUMERO.sub("?", sql)
+    sql = _LISTA.sub("(...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def percentil(ordenadas, p):
+    if not ordenadas:
+        return 0.0
+    indice = min(int(round(p / 100 * (len(ordenadas) - 1))), len(ordenadas) - 1)
+    return ordenadas[indice]
+
+
+class EstadisticaSentencia:
+    def __init__(self, huella):
+        self.huella = huella
+        self.cantidad = 0
+        self.errores = 0
+        self.lentas = 0
+        self.filas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.modulos = set()
+        self.recientes = deque(maxlen=VENTANA)
+
+    def resumen(self):
+        ordenadas = sorted(self.recientes)
+        return {
+            "huella": self.huella,
+            "modulos": sorted(self.modulos),
+            "cantidad": self.cantidad,
+            "errores": self.errores,
+            "lentas": self.lentas,
+            "filas": self.filas,
+            "total_ms": self.total * 1000,
+            "p50_ms": percentil(ordenadas, 50) * 1000,
+            "p95_ms": percentil(ordenadas, 95) * 1000,
+            "p99_ms": percentil(ordenadas, 99) * 1000,
+            "max_ms": self.maximo * 1000,
+        }
+
+
+class Instrumentacion:
+    """
+    Tiempos de todas las sentencias que pasan por db.conexion / conectar.
+
+    Agrupa por huella de la sentencia; guarda cantidad, filas, errores y
+    las últimas VENTANA duraciones para calcular p50/p95/p99. Las que
+    tardan más de umbral_lenta se escriben en archivo_lentas.
+    """
+
+    def __init__(self, umbral_lenta=UMBRAL_LENTA, archivo_lentas=ARCHIVO_LENTAS):
+        self.umbral_lenta = umbral_lenta
+        self.archivo_lentas = archivo_lentas
+        self._lock = threading.Lock()
+        self._lock_log = threading.Lock()
+        self._sentencias = {}
+
+    def registrar(self, sql, duracion, filas, modulo, error=None):
+        clave = huella(sql)
+        with self._lock:
+            stats = self._sentencias.get(clave)
+            if stats is None:
+                stats = self._sentencias[clave] = EstadisticaSentencia(clave)
+            stats.cantidad += 1
+            stats.filas += filas
+            stats.total += duracion
+            stats.maximo = max(stats.maximo, duracion)
+            stats.modulos.add(modulo)
+            stats.recientes.append(duracion)
+            if error is not None:
+                stats.errores += 1
+            lenta = duracion >= self.umbral_lenta
+            if lenta:
+                stats.lentas += 1
+        if lenta:
+            self._escribir_lenta(clave, duracion, modulo, error)
+        return stats
+
+    def sumar_filas(self, stats, filas):
+        with self._lock:
+            stats.filas += filas
+
+    def _escribir_lenta(self, clave, duracion, modulo, error):
+        linea = (
+            f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{duracion * 1000:.1f} ms\t{modulo}\t{clave}"
+            + (f"\tERROR: {error}" if error is not None else "")
+            + "\n"
+        )
+        try:
+            with self._lock_log, open(self.archivo_lentas, "a", encoding="utf-8") as archivo:
+                archivo.write(linea)
+        except OSError as ex:
+            print(f"No se pudo escribir el log de consultas lentas: {ex}")
+
+    def resumen(self):
+        """Estadísticas por sentencia, de mayor a menor tiempo total."""
+        with self._lock:
+            filas = [s.resumen() for s in self._sentencias.values()]
+        return sorted(filas, key=lambda r: r["total_ms"], reverse=True)
+
+    def reiniciar(self):
+        with self._lock:
+            self._sentencias = {}
+
+
+instrumentacion = Instrumentacion()
+
+
+class CursorMedido:
+    """Cursor que registra cada execute en instrumentacion."""
+
+    def __init__(self, cursor, modulo):
+        self._cursor = cursor
+        self._modulo = modulo
+        self._stats = None
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _medir(self, metodo, sql, params):
+        inicio = time.perf_counter()
+        try:
+            resultado = metodo(sql, params)
+        except Exception as ex:
+            instrumentacion.registrar(sql, time.perf_counter() - inicio, 0, self._modulo, ex)
+            raise
+        # Las filas de un SELECT se cuentan al leerlas; las de una escritura
+        # son las afectadas
+        es_consulta = self._cursor.description is not None
+        self._stats = instrumentacion.registrar(
+            sql, time.perf_counter() - inicio, 0 if es_consulta else (resultado or 0), self._modulo
+        )
+        if not es_consulta:
+            self._stats = None
+            if resultado:
+                versiones_tablas.registrar_escritura(sql)
+        return resultado
+
+    def execute(self, sql, params=None):
+        return self._medir(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, filas):
+        return self._medir(self._cursor.executemany, sql, filas)
+
+    def _contar(self, filas):
+        if self._stats is not None and filas:
+            instrumentacion.sumar_filas(self._stats, filas)
+
+    def fetchone(self):
+        fila = self._cursor.fetchone()
+        self._contar(1 if fila is not None else 0)
+        return fila
+
+    def fetchmany(self, cantidad=1):
+        filas = self._cursor.fetchmany(cantidad)
+        self._contar(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._cursor.fetchall()
+        self._contar(len(filas))
+        return filas
+
+
+class ConexionMedida:
+    """Envuelve una conexión para que sus cursores registren tiempos."""
+
+    def __init__(self, conn, modulo):
+        self._conn = conn
+        self.modulo = modulo
+
+    def __getattr__(self, nombre):
+        return getattr(self._conn, nombre)
+
+    def cursor(self, *args):
+        return CursorMedido(self._conn.cursor(*args), self.modulo)
@@ -0,0 +1,131 @@
+import argparse
+import os
+import re
+import sys
+
+import db
+from db import conexion, es_error_existente
+
+CARPETA_MIGRACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migraciones")
+
+NOMBRE_BLOQUEO = "taller_migraciones"
+
+
+def listar_migraciones(carpeta=CARPETA_MIGRACIONES, motor=None):
+    """
+    Devuelve [(version, nombre, ruta)] ordenadas por versión.
+
+    Los archivos se llaman NNN_nombre.sql; si existe NNN_nombre.<motor>.sql
+    (por ejemplo 000_base.sqlite.sql) se usa ése para ese motor, y las
+    variantes de otros motores se ignoran.
+    """
+    motor = motor or db.MOTOR
+    por_version = {}
+    for archivo in os.listdir(carpeta):
+        coincidencia = re.match(r"(\d+)_([^.]+)(?:\.(\w+))?\.sql$", archivo)
+        if not coincidencia:
+            continue
+        version, nombre, variante = int(coincidencia.group(1)), coincidencia.group(2), coincidencia.group(3)
+        if variante not in (None, motor):
+            continue
+        if variante is None and version in por_version:
+            continue
+        por_version[version] = (version, nombre, os.path.join(carpeta, archivo))
+    return [por_version[v] for v in sorted(por_version)]
+
+
+def sentencias(ruta):
+    """Separa un archivo .sql en sentencias (terminadas en ';'), sin comentarios."""
+    with open(ruta, encoding="utf-8") as archivo:
+        lineas = [l for l in archivo if not l.lstrip().startswith("--")]
+    return [s.strip() for s in "".join(lineas).split(";") if s.strip()]
+
+
+def _crear_tabla_version(cursor):
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            nombre VARCHAR(255) NOT NULL,
+            aplicada_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def versiones_aplicadas(cursor):
+    _crear_tabla_version(cursor)
+    cursor.execute("SELECT version FROM schema_version")
+    return {fila[0] for fila in cursor.fetchall()}
+
+
+def _ejecutar_tolerante(cursor, sql):
+    # Se ignoran los errores que indican que el cambio ya estaba hecho
+    try:
+        cursor.execute(sql)
+    except Exception as ex:
+        if not es_error_existente(ex):
+            raise
+
+
+def aplicar_migraciones(carpeta=CARPETA_MIGRACIONES, informar=print):
+    """
+    Aplica en orden las migraciones que falten y las registra en
+    schema_version. Cada sentencia tolera que su cambio ya exista, así una
+    migración que se cortó a la mitad puede volver a correrse. Devuelve la
+    lista de versiones aplicadas.
+    """
+    aplicadas = []
+    with conexion("migraciones") as conn:
+        with conn.cursor() as cursor:
+            # Evita que dos terminales que arrancan juntas migren a la vez
+            # (SQLite es de una sola terminal)
+            if not db.es_sqlite():
+                cursor.execute("SELECT GET_LOCK(%s, 30)", (NOMBRE_BLOQUEO,))
+                if not cursor.fetchone()[0]:
+                    raise RuntimeError("Otra terminal está aplicando migraciones.")
+            try:
+                hechas = versiones_aplicadas(cursor)
+                for version, nombre, ruta in listar_migraciones(carpeta):
+                    if version in hechas:
+                        continue
+                    informar(f"Aplicando migración {version:03d} {nombre}")
+                    for sql in sentencias(ruta):
+                        _ejecutar_tolerante(cursor, sql)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, nombre) VALUES (%s, %s)",
+                        (version, nombre),
+                    )
+                    aplicadas.append(version)
+            finally:
+                if not db.es_sqlite():
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (NOMBRE_BLOQUEO,))
+                    cursor.fetchone()
+    return aplicadas
+
+
+def estado(carpeta=CARPETA_MIGRACIONES):
+    """Devuelve [(version, nombre, aplicada)] de todas las migraciones."""
+    with conexion("migraciones") as conn:
+        with conn.cursor() as cursor:
+            hechas = versiones_aplicadas(cursor)
+    return [(v, n, v in hechas) for v, n, _ in listar_migraciones(carpeta)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica las migraciones pendientes de la base.")
+    parser.add_argument("--estado", action="store_true", help="sólo mostrar qué migraciones faltan")
+    args = parser.parse_args(argv)
+
+    if args.estado:
+        for version, nombre, aplicada in estado():
+            print(f"{version:03d} {nombre:<40} {'aplicada' if aplicada else 'pendiente'}")
+        return 0
+
+    aplicadas = aplicar_migraciones()
+    print(f"{len(aplicadas)} migraciones aplicadas." if aplicadas else "La base está al día.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+-- Tablas de taller_mecanico.sql para una instalación nueva con SQLite.
+-- Las columnas de búsqueda usan COLLATE NOCASE para que LIKE 'texto%'
+-- pueda recorrer su índice sin distinguir mayúsculas.
+
+CREATE TABLE IF NOT EXISTS clientes (
+    dni VARCHAR(255) COLLATE NOCASE PRIMARY KEY,
+    nombre VARCHAR(255) COLLATE NOCASE,
+    apellido VARCHAR(255) COLLATE NOCASE,
+    direccion VARCHAR(255),
+    telefono VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS mecanicos (
+    legajo VARCHAR(255) COLLATE NOCASE PRIMARY KEY,
+    nombre VARCHAR(255) COLLATE NOCASE,
+    apellido VARCHAR(255) COLLATE NOCASE,
+    rol VARCHAR(255),
+    estado VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(255) COLLATE NOCASE,
+    precio INT,
+    fabricante VARCHAR(255) COLLATE NOCASE
+);
+
+CREATE TABLE IF NOT EXISTS proveedores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(255) COLLATE NOCASE,
+    cuit VARCHAR(255) COLLATE NOCASE,
+    telefono VARCHAR(255),
+    direccion VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(255) COLLATE NOCASE,
+    apellido VARCHAR(255) COLLATE NOCASE,
+    usuario VARCHAR(255) COLLATE NOCASE UNIQUE,
+    contrasena VARCHAR(255),
+    rol VARCHAR(255)
+);
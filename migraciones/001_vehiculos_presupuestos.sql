@@ -0,0 +1,17 @@
+-- Tablas que usan la ficha técnica y los presupuestos de taller.py
+
+CREATE TABLE IF NOT EXISTS vehiculos (
+    patente VARCHAR(20) PRIMARY KEY,
+    marca VARCHAR(255),
+    modelo VARCHAR(255),
+    color VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS presupuestos (
+    id_presupuesto INT PRIMARY KEY AUTO_INCREMENT,
+    dni_cliente VARCHAR(255) NOT NULL,
+    monto DECIMAL(12, 2) NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'Pendiente',
+    detalle TEXT,
+    fecha_creacion DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
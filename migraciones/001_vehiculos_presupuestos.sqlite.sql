@@ -0,0 +1,18 @@
+-- Igual que 001_vehiculos_presupuestos.sql, con las columnas de búsqueda
+-- en COLLATE NOCASE.
+
+CREATE TABLE IF NOT EXISTS vehiculos (
+    patente VARCHAR(20) COLLATE NOCASE PRIMARY KEY,
+    marca VARCHAR(255) COLLATE NOCASE,
+    modelo VARCHAR(255),
+    color VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS presupuestos (
+    id_presupuesto INTEGER PRIMARY KEY AUTOINCREMENT,
+    dni_cliente VARCHAR(255) COLLATE NOCASE NOT NULL,
+    monto DECIMAL(12, 2) NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'Pendiente',
+    detalle TEXT,
+    fecha_creacion DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,17 @@
+-- Índices de los filtros de alta/baja/consulta, de las búsquedas por
+-- prefijo y del listado de presupuestos (ORDER BY fecha_creacion DESC,
+-- id_presupuesto DESC: InnoDB agrega la clave primaria al índice).
+
+CREATE INDEX idx_productos_nombre ON productos (nombre);
+CREATE INDEX idx_productos_fabricante ON productos (fabricante);
+CREATE INDEX idx_proveedores_nombre ON proveedores (nombre);
+CREATE INDEX idx_proveedores_cuit ON proveedores (cuit);
+CREATE INDEX idx_clientes_apellido ON clientes (apellido);
+CREATE INDEX idx_clientes_nombre ON clientes (nombre);
+CREATE INDEX idx_mecanicos_apellido ON mecanicos (apellido);
+CREATE INDEX idx_mecanicos_nombre ON mecanicos (nombre);
+CREATE INDEX idx_usuarios_apellido ON usuarios (apellido);
+CREATE INDEX idx_usuarios_nombre ON usuarios (nombre);
+CREATE INDEX idx_vehiculos_marca ON vehiculos (marca);
+CREATE INDEX idx_presupuestos_fecha ON presupuestos (fecha_creacion);
+CREATE INDEX idx_presupuestos_dni ON presupuestos (dni_cliente);
@@ -0,0 +1,114 @@
+-- Registro de cambios para que cada terminal actualice sólo las filas que
+-- modificaron las demás (ver cambios.py). Lo llenan los triggers de cada
+-- tabla: operacion es A (alta), M (modificación) o B (baja) y origen la
+-- terminal que hizo el cambio (@terminal, que db fija al conectar).
+-- Con el binlog activo, crear triggers requiere SUPER o
+-- log_bin_trust_function_creators=1.
+
+CREATE TABLE IF NOT EXISTS cambios (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    tabla VARCHAR(64) NOT NULL,
+    clave VARCHAR(255) NOT NULL,
+    operacion CHAR(1) NOT NULL,
+    origen VARCHAR(64),
+    creado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_cambios_creado_en (creado_en)
+);
+
+-- clientes
+DROP TRIGGER IF EXISTS clientes_alta;
+CREATE TRIGGER clientes_alta AFTER INSERT ON clientes FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('clientes', NEW.dni, 'A', @terminal);
+DROP TRIGGER IF EXISTS clientes_modificacion;
+CREATE TRIGGER clientes_modificacion AFTER UPDATE ON clientes FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'clientes', OLD.dni, 'B', @terminal FROM DUAL WHERE OLD.dni <> NEW.dni
+    UNION ALL
+    SELECT 'clientes', NEW.dni, IF(OLD.dni <> NEW.dni, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS clientes_baja;
+CREATE TRIGGER clientes_baja AFTER DELETE ON clientes FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('clientes', OLD.dni, 'B', @terminal);
+
+-- mecanicos
+DROP TRIGGER IF EXISTS mecanicos_alta;
+CREATE TRIGGER mecanicos_alta AFTER INSERT ON mecanicos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('mecanicos', NEW.legajo, 'A', @terminal);
+DROP TRIGGER IF EXISTS mecanicos_modificacion;
+CREATE TRIGGER mecanicos_modificacion AFTER UPDATE ON mecanicos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'mecanicos', OLD.legajo, 'B', @terminal FROM DUAL WHERE OLD.legajo <> NEW.legajo
+    UNION ALL
+    SELECT 'mecanicos', NEW.legajo, IF(OLD.legajo <> NEW.legajo, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS mecanicos_baja;
+CREATE TRIGGER mecanicos_baja AFTER DELETE ON mecanicos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('mecanicos', OLD.legajo, 'B', @terminal);
+
+-- productos
+DROP TRIGGER IF EXISTS productos_alta;
+CREATE TRIGGER productos_alta AFTER INSERT ON productos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('productos', NEW.id, 'A', @terminal);
+DROP TRIGGER IF EXISTS productos_modificacion;
+CREATE TRIGGER productos_modificacion AFTER UPDATE ON productos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'productos', OLD.id, 'B', @terminal FROM DUAL WHERE OLD.id <> NEW.id
+    UNION ALL
+    SELECT 'productos', NEW.id, IF(OLD.id <> NEW.id, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS productos_baja;
+CREATE TRIGGER productos_baja AFTER DELETE ON productos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('productos', OLD.id, 'B', @terminal);
+
+-- proveedores
+DROP TRIGGER IF EXISTS proveedores_alta;
+CREATE TRIGGER proveedores_alta AFTER INSERT ON proveedores FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('proveedores', NEW.id, 'A', @terminal);
+DROP TRIGGER IF EXISTS proveedores_modificacion;
+CREATE TRIGGER proveedores_modificacion AFTER UPDATE ON proveedores FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'proveedores', OLD.id, 'B', @terminal FROM DUAL WHERE OLD.id <> NEW.id
+    UNION ALL
+    SELECT 'proveedores', NEW.id, IF(OLD.id <> NEW.id, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS proveedores_baja;
+CREATE TRIGGER proveedores_baja AFTER DELETE ON proveedores FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('proveedores', OLD.id, 'B', @terminal);
+
+-- usuarios
+DROP TRIGGER IF EXISTS usuarios_alta;
+CREATE TRIGGER usuarios_alta AFTER INSERT ON usuarios FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('usuarios', NEW.id_usuario, 'A', @terminal);
+DROP TRIGGER IF EXISTS usuarios_modificacion;
+CREATE TRIGGER usuarios_modificacion AFTER UPDATE ON usuarios FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'usuarios', OLD.id_usuario, 'B', @terminal FROM DUAL WHERE OLD.id_usuario <> NEW.id_usuario
+    UNION ALL
+    SELECT 'usuarios', NEW.id_usuario, IF(OLD.id_usuario <> NEW.id_usuario, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS usuarios_baja;
+CREATE TRIGGER usuarios_baja AFTER DELETE ON usuarios FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('usuarios', OLD.id_usuario, 'B', @terminal);
+
+-- vehiculos
+DROP TRIGGER IF EXISTS vehiculos_alta;
+CREATE TRIGGER vehiculos_alta AFTER INSERT ON vehiculos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('vehiculos', NEW.patente, 'A', @terminal);
+DROP TRIGGER IF EXISTS vehiculos_modificacion;
+CREATE TRIGGER vehiculos_modificacion AFTER UPDATE ON vehiculos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'vehiculos', OLD.patente, 'B', @terminal FROM DUAL WHERE OLD.patente <> NEW.patente
+    UNION ALL
+    SELECT 'vehiculos', NEW.patente, IF(OLD.patente <> NEW.patente, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS vehiculos_baja;
+CREATE TRIGGER vehiculos_baja AFTER DELETE ON vehiculos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('vehiculos', OLD.patente, 'B', @terminal);
+
+-- presupuestos
+DROP TRIGGER IF EXISTS presupuestos_alta;
+CREATE TRIGGER presupuestos_alta AFTER INSERT ON presupuestos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('presupuestos', NEW.id_presupuesto, 'A', @terminal);
+DROP TRIGGER IF EXISTS presupuestos_modificacion;
+CREATE TRIGGER presupuestos_modificacion AFTER UPDATE ON presupuestos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen)
+    SELECT 'presupuestos', OLD.id_presupuesto, 'B', @terminal FROM DUAL WHERE OLD.id_presupuesto <> NEW.id_presupuesto
+    UNION ALL
+    SELECT 'presupuestos', NEW.id_presupuesto, IF(OLD.id_presupuesto <> NEW.id_presupuesto, 'A', 'M'), @terminal FROM DUAL;
+DROP TRIGGER IF EXISTS presupuestos_baja;
+CREATE TRIGGER presupuestos_baja AFTER DELETE ON presupuestos FOR EACH ROW
+    INSERT INTO cambios (tabla, clave, operacion, origen) VALUES ('presupuestos', OLD.id_presupuesto, 'B', @terminal);
@@ -0,0 +1,13 @@
+-- Con SQLite hay una sola terminal, así que no hacen falta triggers: la
+-- tabla existe para que el esquema sea el mismo que en MySQL.
+
+CREATE TABLE IF NOT EXISTS cambios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tabla VARCHAR(64) NOT NULL,
+    clave VARCHAR(255) NOT NULL,
+    operacion CHAR(1) NOT NULL,
+    origen VARCHAR(64),
+    creado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_cambios_creado_en ON cambios (creado_en);
@@ -0,0 +1,19 @@
+-- Claves únicas en las columnas que las altas verificaban con un SELECT
+-- previo: así el alta es un solo INSERT y el duplicado lo descarta la
+-- base, también entre terminales. Reemplazan a los índices comunes de
+-- 002_indices. Antes se renombran los nombres ya repetidos agregándoles el
+-- id ("Tuerca (12)"); el de menor id queda como estaba.
+
+UPDATE productos p
+  JOIN (SELECT nombre, MIN(id) AS primero FROM productos GROUP BY nombre HAVING COUNT(*) > 1) d
+    ON p.nombre = d.nombre AND p.id <> d.primero
+   SET p.nombre = CONCAT(LEFT(p.nombre, 240), ' (', p.id, ')');
+CREATE UNIQUE INDEX uq_productos_nombre ON productos (nombre);
+DROP INDEX idx_productos_nombre ON productos;
+
+UPDATE proveedores p
+  JOIN (SELECT nombre, MIN(id) AS primero FROM proveedores GROUP BY nombre HAVING COUNT(*) > 1) d
+    ON p.nombre = d.nombre AND p.id <> d.primero
+   SET p.nombre = CONCAT(LEFT(p.nombre, 240), ' (', p.id, ')');
+CREATE UNIQUE INDEX uq_proveedores_nombre ON proveedores (nombre);
+DROP INDEX idx_proveedores_nombre ON proveedores;
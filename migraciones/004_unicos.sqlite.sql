@@ -0,0 +1,13 @@
+-- Claves únicas de 004_unicos.sql para SQLite.
+
+UPDATE productos SET nombre = substr(nombre, 1, 240) || ' (' || id || ')'
+ WHERE nombre IS NOT NULL
+   AND id NOT IN (SELECT MIN(id) FROM productos WHERE nombre IS NOT NULL GROUP BY nombre);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_productos_nombre ON productos (nombre);
+DROP INDEX IF EXISTS idx_productos_nombre;
+
+UPDATE proveedores SET nombre = substr(nombre, 1, 240) || ' (' || id || ')'
+ WHERE nombre IS NOT NULL
+   AND id NOT IN (SELECT MIN(id) FROM proveedores WHERE nombre IS NOT NULL GROUP BY nombre);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_proveedores_nombre ON proveedores (nombre);
+DROP INDEX IF EXISTS idx_proveedores_nombre;
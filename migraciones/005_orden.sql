@@ -0,0 +1,14 @@
+-- Índices compuestos para ordenar las tablas desde el título de una
+-- columna: apellido + nombre, fabricante + nombre y estado + fecha. Cubren
+-- también la búsqueda por prefijo de su primera columna, así que
+-- reemplazan a los índices simples de 002_indices.
+
+CREATE INDEX idx_clientes_apellido_nombre ON clientes (apellido, nombre);
+DROP INDEX idx_clientes_apellido ON clientes;
+CREATE INDEX idx_mecanicos_apellido_nombre ON mecanicos (apellido, nombre);
+DROP INDEX idx_mecanicos_apellido ON mecanicos;
+CREATE INDEX idx_usuarios_apellido_nombre ON usuarios (apellido, nombre);
+DROP INDEX idx_usuarios_apellido ON usuarios;
+CREATE INDEX idx_productos_fabricante_nombre ON productos (fabricante, nombre);
+DROP INDEX idx_productos_fabricante ON productos;
+CREATE INDEX idx_presupuestos_estado_fecha ON presupuestos (estado, fecha_creacion);
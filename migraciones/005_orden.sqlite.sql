@@ -0,0 +1,11 @@
+-- Índices compuestos de 005_orden.sql para SQLite.
+
+CREATE INDEX IF NOT EXISTS idx_clientes_apellido_nombre ON clientes (apellido, nombre);
+DROP INDEX IF EXISTS idx_clientes_apellido;
+CREATE INDEX IF NOT EXISTS idx_mecanicos_apellido_nombre ON mecanicos (apellido, nombre);
+DROP INDEX IF EXISTS idx_mecanicos_apellido;
+CREATE INDEX IF NOT EXISTS idx_usuarios_apellido_nombre ON usuarios (apellido, nombre);
+DROP INDEX IF EXISTS idx_usuarios_apellido;
+CREATE INDEX IF NOT EXISTS idx_productos_fabricante_nombre ON productos (fabricante, nombre);
+DROP INDEX IF EXISTS idx_productos_fabricante;
+CREATE INDEX IF NOT EXISTS idx_presupuestos_estado_fecha ON presupuestos (estado, fecha_creacion);
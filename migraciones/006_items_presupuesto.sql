@@ -0,0 +1,21 @@
+-- Renglones de los presupuestos: producto, cantidad y precio unitario
+-- copiado del producto al agregarlo (si después cambia el precio, el
+-- presupuesto no cambia). presupuestos.monto pasa a ser el total de sus
+-- renglones y se mantiene al agregar o quitar uno; cantidad_items cuenta
+-- los renglones (con 0 el monto sigue siendo el que se escribe a mano).
+-- Un producto que figura en algún presupuesto no se puede borrar
+-- (RESTRICT): sus renglones lo siguen nombrando.
+
+CREATE TABLE IF NOT EXISTS presupuesto_items (
+    id_item INT PRIMARY KEY AUTO_INCREMENT,
+    id_presupuesto INT NOT NULL,
+    id_producto INT NOT NULL,
+    cantidad INT NOT NULL,
+    precio_unitario DECIMAL(12, 2) NOT NULL,
+    INDEX idx_items_presupuesto (id_presupuesto),
+    INDEX idx_items_producto (id_producto),
+    FOREIGN KEY (id_presupuesto) REFERENCES presupuestos (id_presupuesto) ON DELETE CASCADE,
+    FOREIGN KEY (id_producto) REFERENCES productos (id) ON DELETE RESTRICT
+);
+
+ALTER TABLE presupuestos ADD COLUMN cantidad_items INT NOT NULL DEFAULT 0;
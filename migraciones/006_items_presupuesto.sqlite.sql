@@ -0,0 +1,14 @@
+-- Igual que 006_items_presupuesto.sql, para SQLite.
+
+CREATE TABLE IF NOT EXISTS presupuesto_items (
+    id_item INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_presupuesto INTEGER NOT NULL REFERENCES presupuestos (id_presupuesto) ON DELETE CASCADE,
+    id_producto INTEGER NOT NULL REFERENCES productos (id) ON DELETE RESTRICT,
+    cantidad INT NOT NULL,
+    precio_unitario DECIMAL(12, 2) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_items_presupuesto ON presupuesto_items (id_presupuesto);
+CREATE INDEX IF NOT EXISTS idx_items_producto ON presupuesto_items (id_producto);
+
+ALTER TABLE presupuestos ADD COLUMN cantidad_items INT NOT NULL DEFAULT 0;
@@ -0,0 +1,78 @@
+from collections import namedtuple
+
+from grilla import FuenteFilas
+
+ALTA = "alta"
+MODIFICACION = "modificacion"
+BAJA = "baja"
+
+# clave: clave primaria de la fila afectada (la original, en una modificación)
+# fila: fila completa tal como la devolvería la consulta de la tabla
+Cambio = namedtuple("Cambio", ["tipo", "clave", "fila"], defaults=[None])
+
+
+class ModeloTabla(FuenteFilas):
+    """
+    Filas de la página visible, indexadas por su clave primaria.
+
+    Cada escritura se traduce en un Cambio (alta, modificación o baja) que
+    se aplica sobre estas filas sin volver a leer la tabla. Las altas sólo
+    se insertan si caen dentro del rango de la página actual y pasan la
+    búsqueda activa, respetando el orden del paginador.
+    """
+
+    def __init__(self, paginador, indice_clave=0):
+        super().__init__()
+        self.paginador = paginador
+        self.indice_clave = indice_clave
+
+    def posicion(self, clave):
+        for i, fila in enumerate(self.filas):
+            if fila[self.indice_clave] == clave:
+                return i
+        return None
+
+    def claves_donde(self, indice, valor):
+        """Claves de las filas visibles cuya columna indice vale valor."""
+        return [f[self.indice_clave] for f in self.filas if f[indice] == valor]
+
+    def _en_rango(self, fila):
+        pag = self.paginador
+        if not pag.coincide(fila):
+            return False
+        if not self.filas:
+            return not pag.hay_anterior
+        orden = pag.clave_orden(fila)
+        if pag.hay_anterior and pag.comparar(orden, pag.clave_orden(self.filas[0])) < 0:
+            return False
+        if pag.hay_siguiente and pag.comparar(orden, pag.clave_orden(self.filas[-1])) > 0:
+            return False
+        return True
+
+    def _insertar_ordenado(self, fila):
+        pag = self.paginador
+        orden = pag.clave_orden(fila)
+        pos = len(self.filas)
+        for i, otra in enumerate(self.filas):
+            if pag.comparar(orden, pag.clave_orden(otra)) < 0:
+                pos = i
+                break
+        self.filas.insert(pos, fila)
+        if len(self.filas) > pag.tam_pagina:
+            self.filas.pop()
+            pag.hay_siguiente = True
+
+    def aplicar(self, cambio):
+        """Aplica un Cambio; devuelve True si modificó las filas visibles."""
+        pos = self.posicion(cambio.clave)
+        if cambio.tipo == BAJA:
+            if pos is None:
+                return False
+            del self.filas[pos]
+            return True
+        if pos is not None:
+            del self.filas[pos]
+        if self._en_rango(cambio.fila):
+            self._insertar_ordenado(cambio.fila)
+            return True
+        return pos is not None
@@ -0,0 +1,256 @@
+import re
+import sqlite3
+import threading
+import time
+
+# =========================
+# TRADUCCIÓN DE SQL
+# =========================
+
+_DUPLICADO = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_VALUES = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+_AUTOINCREMENTAL = re.compile(r"\bINT\s+PRIMARY\s+KEY\s+AUTO_INCREMENT\b", re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+_SIN_CAMBIO = re.compile(r"^\s*(\w+)\s*=\s*\1\s*$")
+
+
+def _upsert_sin_cambios(sql, coincidencia):
+    # ON DUPLICATE KEY UPDATE c = c: el duplicado no se toca (0 filas en MySQL)
+    return all(_SIN_CAMBIO.match(a) for a in sql[coincidencia.end():].split(","))
+
+
+def traducir(sql):
+    """
+    Adapta el SQL escrito para MySQL al dialecto de SQLite: marcadores
+    %s, ON DUPLICATE KEY UPDATE, INSERT IGNORE y AUTO_INCREMENT.
+    """
+    sql = sql.replace("%s", "?").replace("%%", "%")
+    coincidencia = _DUPLICADO.search(sql)
+    if coincidencia and _upsert_sin_cambios(sql, coincidencia):
+        sql = sql[:coincidencia.start()] + "ON CONFLICT DO NOTHING"
+    elif coincidencia:
+        actualizar = _VALUES.sub(r"excluded.\1", sql[coincidencia.end():])
+        sql = sql[:coincidencia.start()] + "ON CONFLICT DO UPDATE SET" + actualizar
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    return _AUTOINCREMENTAL.sub("INTEGER PRIMARY KEY AUTOINCREMENT", sql)
+
+
+def insert_sin_upsert(sql):
+    """
+    Para un INSERT ... ON DUPLICATE KEY UPDATE devuelve el mismo INSERT
+    como INSERT OR IGNORE (sin la actualización); None para otro SQL o
+    si la actualización no cambia nada (se traduce a ON CONFLICT DO NOTHING).
+    """
+    coincidencia = _DUPLICADO.search(sql)
+    if not coincidencia or _upsert_sin_cambios(sql, coincidencia):
+        return None
+    return traducir(re.sub(r"^\s*INSERT\b", "INSERT OR IGNORE", sql[:coincidencia.start()], flags=re.IGNORECASE))
+
+
+# =========================
+# CONEXIÓN Y CURSOR
+# =========================
+
+class CursorSqlite:
+    """Cursor con la interfaz de pymysql (context manager, execute devuelve filas afectadas)."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=()):
+        params = tuple(params or ())
+        sin_upsert = insert_sin_upsert(sql)
+        if sin_upsert is not None:
+            return self._upsert(sin_upsert, traducir(sql), params)
+        self._cursor.execute(traducir(sql), params)
+        return max(self._cursor.rowcount, 0)
+
+    def executemany(self, sql, filas):
+        sin_upsert = insert_sin_upsert(sql)
+        if sin_upsert is not None:
+            upsert = traducir(sql)
+            return sum(self._upsert(sin_upsert, upsert, tuple(f)) for f in filas)
+        self._cursor.executemany(traducir(sql), [tuple(f) for f in filas])
+        return max(self._cursor.rowcount, 0)
+
+    def _upsert(self, sin_upsert, upsert, params):
+        # Como MySQL: 1 fila afectada si se insertó, 2 si se actualizó una existente
+        self._cursor.execute(sin_upsert, params)
+        if self._cursor.rowcount == 1:
+            return 1
+        self._cursor.execute(upsert, params)
+        return 2 if self._cursor.rowcount > 0 else 0
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, cantidad=1):
+        return self._cursor.fetchmany(cantidad)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSqlite:
+    """
+    Conexión SQLite con la interfaz que usan los módulos (cursor(),
+    begin(), commit(), rollback()). Como MySQL con autocommit, cada
+    sentencia se confirma sola salvo dentro de begin() ... commit().
+    """
+
+    def __init__(self, ruta, espera_bloqueo=5):
+        self._conn = sqlite3.connect(
+            ruta, timeout=espera_bloqueo, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self.open = True
+
+    def cursor(self, tipo=None):
+        # tipo (por ejemplo SSCursor) no aplica: SQLite ya entrega las filas de a una
+        return CursorSqlite(self._conn.cursor())
+
+    def begin(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def close(self):
+        if self.open:
+            self._conn.close()
+            self.open = False
+
+
+# =========================
+# CONEXIONES POR HILO
+# =========================
+
+class ConexionesSqlite:
+    """
+    Reemplazo del pool para SQLite: cada hilo usa siempre su propia
+    conexión, abierta la primera vez que la pide. En modo WAL las
+    lecturas de un hilo no esperan a las escrituras de otro.
+
+    Tiene la misma interfaz que PoolConexiones (obtener, devolver,
+    cerrar, estadisticas).
+    """
+
+    def __init__(self, ruta, espera_bloqueo=5):
+        self.ruta = ruta
+        self.espera_bloqueo = espera_bloqueo
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._todas = []
+        self._creadas = 0
+        self._por_modulo = {}
+
+    def _stats_modulo(self, modulo):
+        if modulo not in self._por_modulo:
+            self._por_modulo[modulo] = {
+                "prestamos": 0,
+                "en_uso": 0,
+                "espera_total": 0.0,
+                "errores": 0,
+            }
+        return self._por_modulo[modulo]
+
+    def obtener(self, modulo="general"):
+        inicio = time.monotonic()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or not conn.open:
+            try:
+                conn = ConexionSqlite(self.ruta, self.espera_bloqueo)
+            except Exception:
+                with self._lock:
+                    self._stats_modulo(modulo)["errores"] += 1
+                raise
+            self._local.conn = conn
+            self._local.prestamos = 0
+            with self._lock:
+                self._todas.append(conn)
+                self._creadas += 1
+        self._local.prestamos += 1
+        with self._lock:
+            stats = self._stats_modulo(modulo)
+            stats["prestamos"] += 1
+            stats["en_uso"] += 1
+            stats["espera_total"] += time.monotonic() - inicio
+        return conn
+
+    def devolver(self, conn, modulo="general"):
+        # La conexión queda asignada al hilo; al soltar el último préstamo
+        # se descarta una transacción que haya quedado a medio hacer.
+        self._local.prestamos -= 1
+        if self._local.prestamos == 0 and conn.open:
+            conn.rollback()
+        with self._lock:
+            self._stats_modulo(modulo)["en_uso"] -= 1
+
+    def cerrar(self):
+        with self._lock:
+            for conn in self._todas:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._todas = []
+
+    def estadisticas(self):
+        with self._lock:
+            abiertas = sum(1 for c in self._todas if c.open)
+            return {
+                "abiertas": abiertas,
+                "libres": abiertas - sum(s["en_uso"] for s in self._por_modulo.values()),
+                "max_conexiones": None,
+                "creadas": self._creadas,
+                "desalojadas": 0,
+                "pings_fallidos": 0,
+                "reconexiones": 0,
+                "fallos_conexion": 0,
+                "modulos": {m: dict(s) for m, s in self._por_modulo.items()},
+            }
+
+
+def es_error_referencia(ex):
+    """Indica si el error de SQLite es por borrar una fila que otra tabla referencia."""
+    return isinstance(ex, sqlite3.IntegrityError) and "foreign key" in str(ex).lower()
+
+
+def es_error_existente(ex):
+    """Indica si el error de SQLite es por una tabla, columna o índice que ya existe."""
+    mensaje = str(ex).lower()
+    return isinstance(ex, sqlite3.OperationalError) and (
+        "already exists" in mensaje or "duplicate column" in mensaje or "no such index" in mensaje
+    )
@@ -0,0 +1,484 @@
+import threading
+
+import flet as ft
+
+from cache import cache_entidades, leer_fila
+from cambios import feed_cambios
+from db import conexion, escape_like, reintentar_lectura
+from grilla import GrillaVirtual
+from modelo_tabla import BAJA, MODIFICACION, Cambio, ModeloTabla
+from render import actualizar
+
+TAM_PAGINA = 50
+ESPERA_BUSQUEDA = 0.3  # segundos sin teclear antes de consultar
+
+
+def patron_prefijo(texto):
+    """Patrón LIKE 'texto%' con los comodines del texto escapados."""
+    texto = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return texto + "%"
+
+
+# =========================
+# PAGINACIÓN POR CLAVE (KEYSET)
+# =========================
+
+class PaginadorKeyset:
+    """
+    Recorre una tabla en páginas de tamaño fijo usando la última clave vista
+    (WHERE clave > %s ORDER BY clave LIMIT n) en lugar de OFFSET, así cada
+    página cuesta lo mismo sin importar cuán adentro de la tabla esté.
+
+    orden: lista de (columna, "ASC"/"DESC") que identifica una fila de forma
+    única; si la primera columna puede repetirse se agrega la clave primaria
+    al final (por ejemplo fecha_creacion DESC, id_presupuesto DESC).
+
+    busqueda: columnas (indexadas) en las que filtrar() busca por prefijo.
+    """
+
+    def __init__(self, modulo, tabla, columnas, orden, tam_pagina=TAM_PAGINA, busqueda=()):
+        self.modulo = modulo
+        self.tabla = tabla
+        self.columnas = list(columnas)
+        self.orden = [(col, sentido.upper()) for col, sentido in orden]
+        self.tam_pagina = tam_pagina
+        self.busqueda = list(busqueda)
+        self.texto_busqueda = ""
+        self._indices_orden = [self.columnas.index(col) for col, _ in self.orden]
+        self._indices_busqueda = [self.columnas.index(col) for col in self.busqueda]
+        self.numero_pagina = 1
+        self.hay_siguiente = False
+        self.filas = []
+
+    def ordenar(self, orden):
+        """
+        Cambia el orden (misma forma que en el constructor, terminando en
+        columnas únicas). Para que la página salga de un índice, las
+        columnas deben ser las de un índice de la tabla.
+        """
+        self.orden = [(col, sentido.upper()) for col, sentido in orden]
+        self._indices_orden = [self.columnas.index(col) for col, _ in self.orden]
+
+    def filtrar(self, texto):
+        """Limita las páginas a las filas cuyas columnas de búsqueda empiezan con texto."""
+        self.texto_busqueda = (texto or "").strip()
+
+    def _filtro(self):
+        # col LIKE 'texto%' usa el índice de cada columna (rango sobre el prefijo)
+        if not self.texto_busqueda or not self.busqueda:
+            return None, []
+        patron = patron_prefijo(self.texto_busqueda)
+        donde = " OR ".join(f"{col} LIKE %s{escape_like()}" for col in self.busqueda)
+        return f"({donde})", [patron] * len(self.busqueda)
+
+    def coincide(self, fila):
+        """Indica si la fila pasa el filtro de búsqueda actual."""
+        if not self.texto_busqueda or not self.busqueda:
+            return True
+        texto = self.texto_busqueda.lower()
+        return any(
+            str(fila[i] or "").lower().startswith(texto) for i in self._indices_busqueda
+        )
+
+    @property
+    def hay_anterior(self):
+        return self.numero_pagina > 1
+
+    def clave_orden(self, fila):
+        """Valores de las columnas de orden de una fila."""
+        return tuple(fila[i] for i in self._indices_orden)
+
+    def comparar(self, a, b):
+        """-1, 0 o 1 según a vaya antes, igual o después de b en el orden."""
+        for (_, sentido), x, y in zip(self.orden, a, b):
+            if x == y:
+                continue
+            # Como en MySQL y SQLite, NULL va antes que cualquier valor en ASC
+            if x is None or y is None:
+                menor = (x is None) == (sentido == "ASC")
+            else:
+                menor = x < y if sentido == "ASC" else x > y
+            return -1 if menor else 1
+        return 0
+
+    @staticmethod
+    def _posterior(col, valor, ascendente, inclusivo):
+        """
+        Condición "col va después de valor" (o igual, si inclusivo), o None
+        si ninguna fila puede ir después. NULL va primero en ASC: no se usa
+        COALESCE para que la condición siga saliendo del índice.
+        """
+        if valor is None:
+            if ascendente:
+                return ("1 = 1" if inclusivo else f"{col} IS NOT NULL"), []
+            return (f"{col} IS NULL" if inclusivo else None), []
+        op = (">" if ascendente else "<") + ("=" if inclusivo else "")
+        if ascendente:
+            return f"{col} {op} %s", [valor]
+        return f"({col} {op} %s OR {col} IS NULL)", [valor]
+
+    def _predicado(self, clave, hacia_atras=False, inclusivo=False):
+        """
+        Arma la condición "fila posterior a clave" según el orden.
+        Se expande como (a > x) OR (a = x AND b > y) para que MySQL
+        pueda usar el índice en cada rama; las columnas pueden ser NULL.
+        """
+        ramas = []
+        params = []
+        for i, (col, sentido) in enumerate(self.orden):
+            ascendente = (sentido == "ASC") != hacia_atras
+            ultima = inclusivo and i == len(self.orden) - 1
+            condicion, params_condicion = self._posterior(col, clave[i], ascendente, ultima)
+            if condicion is None:
+                continue
+            partes = []
+            for (c, _), valor in zip(self.orden[:i], clave):
+                if valor is None:
+                    partes.append(f"{c} IS NULL")
+                else:
+                    partes.append(f"{c} = %s")
+                    params.append(valor)
+            ramas.append("(" + " AND ".join(partes + [condicion]) + ")")
+            params.extend(params_condicion)
+        if not ramas:
+            return "(1 = 0)", []
+        return "(" + " OR ".join(ramas) + ")", params
+
+    def _order_by(self, hacia_atras=False):
+        partes = []
+        for col, sentido in self.orden:
+            if hacia_atras:
+                sentido = "DESC" if sentido == "ASC" else "ASC"
+            partes.append(f"{col} {sentido}")
+        return ", ".join(partes)
+
+    def _consultar(self, cursor, clave=None, hacia_atras=False, inclusivo=False):
+        sql = f"SELECT {', '.join(self.columnas)} FROM {self.tabla}"
+        condiciones = []
+        params = []
+        filtro, params_filtro = self._filtro()
+        if filtro:
+            condiciones.append(filtro)
+            params.extend(params_filtro)
+        if clave is not None:
+            donde, params_clave = self._predicado(clave, hacia_atras, inclusivo)
+            condiciones.append(donde)
+            params.extend(params_clave)
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += f" ORDER BY {self._order_by(hacia_atras)} LIMIT %s"
+        cursor.execute(sql, params + [self.tam_pagina + 1])
+        return list(cursor.fetchall())
+
+    def por_claves(self, cursor, claves):
+        """Filas de la tabla cuyas claves primarias están en claves."""
+        marcas = ", ".join(["%s"] * len(claves))
+        cursor.execute(
+            f"SELECT {', '.join(self.columnas)} FROM {self.tabla} WHERE {self.columnas[0]} IN ({marcas})",
+            list(claves),
+        )
+        return list(cursor.fetchall())
+
+    def contar(self, cursor):
+        sql = f"SELECT COUNT(*) FROM {self.tabla}"
+        filtro, params = self._filtro()
+        if filtro:
+            sql += f" WHERE {filtro}"
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+    def primera(self, cursor):
+        filas = self._consultar(cursor)
+        self.numero_pagina = 1
+        self.hay_siguiente = len(filas) > self.tam_pagina
+        self.filas = filas[:self.tam_pagina]
+        return self.filas
+
+    def siguiente(self, cursor):
+        if not self.filas or not self.hay_siguiente:
+            return self.filas
+        filas = self._consultar(cursor, self.clave_orden(self.filas[-1]))
+        self.numero_pagina += 1
+        self.hay_siguiente = len(filas) > self.tam_pagina
+        self.filas = filas[:self.tam_pagina]
+        return self.filas
+
+    def anterior(self, cursor):
+        if not self.filas or not self.hay_anterior:
+            return self.primera(cursor)
+        filas = self._consultar(cursor, self.clave_orden(self.filas[0]), hacia_atras=True)
+        if len(filas) <= self.tam_pagina:
+            # Se llegó al principio de la tabla
+            return self.primera(cursor)
+        self.numero_pagina -= 1
+        self.hay_siguiente = True
+        self.filas = list(reversed(filas[:self.tam_pagina]))
+        return self.filas
+
+    def actual(self, cursor):
+        """Vuelve a leer la página actual desde su primera fila."""
+        if not self.filas or self.numero_pagina == 1:
+            return self.primera(cursor)
+        filas = self._consultar(cursor, self.clave_orden(self.filas[0]), inclusivo=True)
+        if not filas:
+            return self.anterior(cursor)
+        self.hay_siguiente = len(filas) > self.tam_pagina
+        self.filas = filas[:self.tam_pagina]
+        return self.filas
+
+
+# =========================
+# COMPONENTE DE UI
+# =========================
+
+class TablaPaginada:
+    """
+    Tabla con botones anterior/siguiente y un contador de registros.
+
+    Las filas de cada página se muestran en una GrillaVirtual; columnas,
+    valores, acciones y al_seleccionar se le pasan tal cual. Las lecturas
+    corren en segundo plano con las Tareas de la vista. El control para
+    agregar a la página está en self.control.
+
+    Si el paginador tiene columnas de búsqueda se agrega un campo que
+    filtra mientras se escribe: espera ESPERA_BUSQUEDA segundos sin
+    teclear y descarta la consulta anterior si todavía no terminó.
+
+    La tabla queda suscripta a feed_cambios: lo que otras terminales
+    modifican se relee por clave y se aplica como un Cambio más.
+
+    ordenes: {índice de columna: [columnas de la base]}. Click en el título
+    de esa columna vuelve a consultar la primera página con ORDER BY esas
+    columnas (y la clave primaria, para desempatar); otro click invierte el
+    sentido. Conviene que haya un índice con esas columnas, así la página
+    sale del índice sin ordenar la tabla entera.
+    """
+
+    def __init__(self, page, tareas, paginador, columnas, valores=None, acciones=None,
+                 al_seleccionar=None, texto_vacio="No hay registros cargados", ordenes=None):
+        self.page = page
+        self.tareas = tareas
+        self.paginador = paginador
+        self._lock = threading.Lock()
+        self.texto_vacio = texto_vacio
+        self.total = 0
+        self.ordenes = ordenes or {}
+        self.modelo = ModeloTabla(paginador)
+        self.grilla = GrillaVirtual(
+            page, columnas, fuente=self.modelo, valores=valores, acciones=acciones,
+            al_seleccionar=al_seleccionar, ordenables=self.ordenes, al_ordenar=self.ordenar,
+        )
+        # Columna por la que se ordena al abrir (la del orden del paginador)
+        self.orden_actual = None
+        self.descendente = False
+        for indice, columnas_orden in self.ordenes.items():
+            if columnas_orden[0] == paginador.orden[0][0]:
+                self.orden_actual = indice
+                self.descendente = paginador.orden[0][1] == "DESC"
+                self.grilla.marcar_orden(indice, self.descendente)
+                break
+        self.lbl_total = ft.Container(
+            bgcolor="#E0F2FE",
+            padding=ft.padding.symmetric(horizontal=10, vertical=4),
+            border_radius=12,
+            content=ft.Text("0 registros", size=12, color="#0369A1"),
+        )
+        self.lbl_pagina = ft.Text("Página 1", size=12, color="#6B7280")
+        self.btn_anterior = ft.TextButton("< Anterior", on_click=self.ir_anterior, disabled=True)
+        self.btn_siguiente = ft.TextButton("Siguiente >", on_click=self.ir_siguiente, disabled=True)
+        btn_actualizar = ft.TextButton("Actualizar", on_click=lambda e: self.recargar())
+        encabezado = [self.lbl_total, self.btn_anterior, self.lbl_pagina, self.btn_siguiente, btn_actualizar]
+        self._temporizador = None
+        self.txt_buscar = None
+        if paginador.busqueda:
+            self.txt_buscar = ft.TextField(
+                label="Buscar",
+                hint_text=", ".join(paginador.busqueda),
+                width=240,
+                height=40,
+                text_size=12,
+                on_change=self._al_escribir,
+            )
+            encabezado.insert(0, self.txt_buscar)
+        self.control = ft.Column([
+            ft.Row(encabezado, spacing=10),
+            self.grilla.control,
+        ])
+        feed_cambios.suscribir(paginador.tabla, self)
+
+    def _leer(self, mover, contar):
+        # Corre en un hilo de Tareas; el lock evita que dos lecturas muevan
+        # el paginador a la vez.
+        # El paginador cambia de página recién al tener las filas, así que
+        # una lectura cortada por la conexión se puede repetir.
+        with self._lock:
+            return reintentar_lectura(self._consultar_pagina, mover, contar)
+
+    def _consultar_pagina(self, mover, contar):
+        with conexion(self.paginador.modulo) as conn:
+            with conn.cursor() as cursor:
+                filas = list(mover(cursor))
+                # Después de mover: mover puede cambiar el filtro (buscar).
+                # Sólo se cuenta al ir a la primera página o releer la
+                # actual, que se pueden repetir si la conexión se corta.
+                total = self.paginador.contar(cursor) if contar else None
+        return total, filas
+
+    def _mostrar(self, resultado):
+        total, filas = resultado
+        cache_entidades.guardar_filas(self.paginador.tabla, filas, self.modelo.indice_clave)
+        if total is not None:
+            self.total = total
+        if filas:
+            self.grilla.mostrar(filas)
+        else:
+            self.grilla.mensaje(self.texto_vacio)
+        # El paginador y el modelo comparten la lista de la página visible
+        self.paginador.filas = self.modelo.filas
+        self._actualizar_controles()
+
+    def _mostrar_error(self, ex):
+        self.grilla.mensaje(f"Error: {ex}", "red")
+        self.paginador.filas = self.modelo.filas
+        self._actualizar_controles()
+
+    def aplicar(self, cambios, delta_total=0):
+        """
+        Aplica los cambios de una escritura a la página visible sin
+        releerla; delta_total ajusta el contador de registros.
+        """
+        self.total = max(self.total + delta_total, 0)
+        cache_entidades.invalidar(self.paginador.tabla)
+        for cambio in cambios:
+            self.modelo.aplicar(cambio)
+        cache_entidades.guardar_filas(self.paginador.tabla, self.modelo.filas, self.modelo.indice_clave)
+        if self.modelo.filas:
+            self.grilla.refrescar()
+        else:
+            self.grilla.mensaje(self.texto_vacio)
+        self._actualizar_controles()
+
+    def cambios_remotos(self, claves):
+        """
+        Aviso de feed_cambios (desde su hilo): claves es {clave: (existia,
+        existe)}, o None para releer la página entera.
+        """
+        altas_o_bajas = any(existia != existe for existia, existe in (claves or {}).values())
+        if claves is None or (altas_o_bajas and self.paginador.texto_busqueda):
+            # Con una búsqueda activa no se sabe si la fila contaba en el total
+            self.recargar()
+            return
+        self.tareas.ejecutar(
+            self._leer_claves, claves,
+            al_terminar=self._aplicar_remotos,
+            al_fallar=self._mostrar_error,
+        )
+
+    def _leer_claves(self, claves):
+        existentes = [c for c, (_, existe) in claves.items() if existe]
+        filas = []
+        if existentes:
+            filas = reintentar_lectura(self._consultar_claves, existentes)
+        return claves, filas
+
+    def _consultar_claves(self, claves):
+        with conexion(self.paginador.modulo) as conn:
+            with conn.cursor() as cursor:
+                return self.paginador.por_claves(cursor, claves)
+
+    def _aplicar_remotos(self, resultado):
+        claves, filas = resultado
+        por_clave = {fila[self.modelo.indice_clave]: fila for fila in filas}
+        cambios = []
+        for clave in claves:
+            fila = por_clave.get(clave)
+            cambios.append(Cambio(MODIFICACION, clave, fila) if fila else Cambio(BAJA, clave))
+        delta = sum(int(existe) - int(existia) for existia, existe in claves.values())
+        self.aplicar(cambios, delta)
+
+    def buscar_fila(self, valor, al_terminar, al_fallar=None, columna=None):
+        """
+        Lee una fila completa por clave primaria, o por otra columna si se
+        indica. Las filas visibles salen de la caché sin consultar la base;
+        si no está, se lee en segundo plano y al_terminar recibe la fila
+        (o None).
+        """
+        if columna is not None:
+            claves = self.modelo.claves_donde(self.paginador.columnas.index(columna), valor)
+            if claves:
+                valor, columna = claves[0], None
+        if columna is None:
+            fila = cache_entidades.obtener(self.paginador.tabla, valor)
+            if fila is not None:
+                al_terminar(fila)
+                return
+            columna = self.paginador.columnas[self.modelo.indice_clave]
+        self.tareas.ejecutar(
+            leer_fila, self.paginador, valor, columna,
+            al_terminar=al_terminar, al_fallar=al_fallar,
+        )
+
+    def _actualizar_controles(self):
+        self.lbl_total.content.value = f"{self.total} registros"
+        self.lbl_pagina.value = f"Página {self.paginador.numero_pagina}"
+        self.btn_anterior.disabled = not self.paginador.hay_anterior
+        self.btn_siguiente.disabled = not self.paginador.hay_siguiente
+        actualizar(self.page)
+
+    def _cargar(self, mover, contar=False):
+        self.tareas.ejecutar(
+            self._leer, mover, contar,
+            al_terminar=self._mostrar,
+            al_fallar=self._mostrar_error,
+            clave=("tabla", id(self)),
+        )
+
+    def cargar(self):
+        """Va a la primera página y actualiza el total."""
+        self._cargar(self.paginador.primera, contar=True)
+
+    def recargar(self):
+        """Relee la página actual y el total (refresco completo a pedido)."""
+        self._cargar(self.paginador.actual, contar=True)
+
+    def buscar(self, texto):
+        """Filtra por prefijo y muestra la primera página de coincidencias."""
+
+        def filtrar_y_leer(cursor):
+            self.paginador.filtrar(texto)
+            return self.paginador.primera(cursor)
+
+        self._cargar(filtrar_y_leer, contar=True)
+
+    def ordenar(self, indice):
+        """Ordena por la columna indice de la grilla; si ya lo estaba, invierte el sentido."""
+        descendente = indice == self.orden_actual and not self.descendente
+        sentido = "DESC" if descendente else "ASC"
+        orden = [(col, sentido) for col in self.ordenes[indice]]
+        clave = self.paginador.columnas[self.modelo.indice_clave]
+        if clave not in self.ordenes[indice]:
+            orden.append((clave, sentido))
+        self.orden_actual = indice
+        self.descendente = descendente
+        self.grilla.marcar_orden(indice, descendente)
+
+        def ordenar_y_leer(cursor):
+            self.paginador.ordenar(orden)
+            return self.paginador.primera(cursor)
+
+        # El total no cambia al reordenar
+        self._cargar(ordenar_y_leer)
+
+    def _al_escribir(self, e):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+        texto = self.txt_buscar.value or ""
+        self._temporizador = threading.Timer(ESPERA_BUSQUEDA, self.buscar, args=(texto,))
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def ir_siguiente(self, e=None):
+        self._cargar(self.paginador.siguiente)
+
+    def ir_anterior(self, e=None):
+        self._cargar(self.paginador.anterior)
@@ -0,0 +1,122 @@
+import threading
+import weakref
+from contextlib import contextmanager
+
+VENTANA = 0.016  # segundos que se espera para juntar los cambios sueltos (un cuadro)
+
+# Serializa los cambios a controles y los envíos al cliente.
+lock_ui = threading.RLock()
+
+_renderizadores = weakref.WeakKeyDictionary()
+
+
+class Renderizador:
+    """
+    Junta los page.update() de una página en un solo envío.
+
+    Dentro de una acción (accion(page, nombre): un click, una respuesta de
+    la base, una navegación) los pedidos sólo marcan la página como
+    pendiente y se envía una vez al terminar la acción más externa. Los
+    pedidos fuera de una acción se juntan durante VENTANA segundos.
+
+    Cuenta, por nombre de acción, cuántas veces se ejecutó, cuántos
+    pedidos de update hubo y cuántos envíos se hicieron realmente.
+    """
+
+    def __init__(self, page, ventana=VENTANA):
+        self._page = weakref.ref(page)
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pendiente = False
+        self._temporizador = None
+        self._contadores = {}
+        _renderizadores[page] = self
+
+    def _contador(self, nombre):
+        if nombre not in self._contadores:
+            self._contadores[nombre] = {"acciones": 0, "pedidos": 0, "envios": 0}
+        return self._contadores[nombre]
+
+    def _pila(self):
+        if not hasattr(self._local, "pila"):
+            self._local.pila = []
+        return self._local.pila
+
+    def pedir(self):
+        pila = self._pila()
+        with self._lock:
+            self._pendiente = True
+            self._contador(pila[0] if pila else "sin acción")["pedidos"] += 1
+            if pila or self._temporizador is not None:
+                return
+            self._temporizador = threading.Timer(self.ventana, self._enviar, args=("sin acción",))
+            self._temporizador.daemon = True
+            self._temporizador.start()
+
+    @contextmanager
+    def accion(self, nombre):
+        pila = self._pila()
+        pila.append(nombre)
+        if len(pila) == 1:
+            with self._lock:
+                self._contador(nombre)["acciones"] += 1
+        try:
+            yield
+        finally:
+            pila.pop()
+            if not pila:
+                self._enviar(nombre)
+
+    def _enviar(self, nombre):
+        with lock_ui:
+            with self._lock:
+                if self._temporizador is not None:
+                    self._temporizador.cancel()
+                    self._temporizador = None
+                if not self._pendiente:
+                    return
+                self._pendiente = False
+                self._contador(nombre)["envios"] += 1
+            page = self._page()
+            if page is not None:
+                page.update()
+
+    def vaciar(self):
+        """Envía ya lo que esté pendiente."""
+        self._enviar("sin acción")
+
+    def estadisticas(self):
+        with self._lock:
+            return {nombre: dict(c) for nombre, c in self._contadores.items()}
+
+    def reiniciar(self):
+        with self._lock:
+            self._contadores = {}
+
+
+def renderizador_de(page):
+    return _renderizadores.get(page)
+
+
+def actualizar(page):
+    """
+    Pide enviar los cambios de la página. Sin Renderizador (scripts,
+    benchmark) es un page.update() inmediato.
+    """
+    renderizador = renderizador_de(page)
+    if renderizador is None:
+        page.update()
+    else:
+        renderizador.pedir()
+
+
+@contextmanager
+def accion(page, nombre):
+    """Agrupa en un solo envío los updates pedidos dentro del bloque."""
+    renderizador = renderizador_de(page)
+    if renderizador is None:
+        yield
+        return
+    with renderizador.accion(nombre):
+        yield
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from db import conexion, reintentar_lectura
+
+# Clave del resumen -> tabla de la base
+TABLAS_RESUMEN = {
+    "clientes": "clientes",
+    "proveedores": "proveedores",
+    "productos": "productos",
+    "empleados": "mecanicos",
+    "usuarios": "usuarios",
+}
+
+INTERVALO_RECONCILIACION = 300  # segundos entre recuentos contra la base
+
+
+class ServicioResumen:
+    """
+    Conteos del panel principal guardados en memoria.
+
+    La primera vez se leen todos en una sola consulta; después los módulos
+    de gestión los ajustan con cada alta o baja y un hilo en segundo plano
+    los vuelve a contar cada INTERVALO_RECONCILIACION segundos para
+    corregir lo que hayan cambiado otras terminales. Volver al panel no
+    consulta la base.
+    """
+
+    def __init__(self, intervalo=INTERVALO_RECONCILIACION):
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._conteos = None
+        self._actualizado = 0.0
+        self._hilo = None
+
+    def _contar(self):
+        subconsultas = ", ".join(
+            f"(SELECT COUNT(*) FROM {tabla})" for tabla in TABLAS_RESUMEN.values()
+        )
+        with conexion("dashboard") as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT {subconsultas}")
+                fila = cursor.fetchone()
+        return dict(zip(TABLAS_RESUMEN, fila))
+
+    def reconciliar(self):
+        """Vuelve a contar todo en la base y reemplaza los valores en memoria."""
+        conteos = reintentar_lectura(self._contar)
+        with self._lock:
+            self._conteos = conteos
+            self._actualizado = time.monotonic()
+        return dict(conteos)
+
+    def obtener(self):
+        """
+        Devuelve (resumen, error_db)
+        resumen: dict con conteos de tablas
+        error_db: texto de error o None
+        """
+        with self._lock:
+            if self._conteos is not None:
+                return dict(self._conteos), None
+        try:
+            return self.reconciliar(), None
+        except Exception as ex:
+            return dict.fromkeys(TABLAS_RESUMEN, 0), f"Error consultando la base de datos: {ex}"
+
+    def ajustar(self, clave, delta):
+        """Suma delta al conteo de clave (altas positivas, bajas negativas)."""
+        if not delta:
+            return
+        with self._lock:
+            if self._conteos is not None:
+                self._conteos[clave] = max(self._conteos[clave] + delta, 0)
+
+    def iniciar(self):
+        """Arranca el hilo que reconcilia los conteos periódicamente."""
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._bucle, name="resumen", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.reconciliar()
+            except Exception as ex:
+                print(f"No se pudo reconciliar el resumen: {ex}")
+
+
+servicio_resumen = ServicioResumen()
+
+
+def obtener_resumen():
+    return servicio_resumen.obtener()
+
+
+def ajustar_resumen(clave, delta):
+    servicio_resumen.ajustar(clave, delta)
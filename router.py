@@ -0,0 +1,169 @@
+import weakref
+from collections import OrderedDict
+
+import flet as ft
+
+from render import accion, actualizar
+from versiones import versiones_tablas
+
+COLOR_MENU = "white"
+COLOR_MENU_ACTIVO = "#38BDF8"
+MAX_VISTAS = 4  # vistas armadas que se conservan para volver a ellas
+
+# Router de cada página, para que las vistas monten su contenido sin
+# conocerlo. Se descarta solo cuando la página deja de existir.
+_routers = weakref.WeakValueDictionary()
+
+
+class Vista:
+    """
+    Lo que el router guarda de una vista armada para volver a mostrarla:
+    su control, sus Tareas, las tablas que muestra y cómo releerlas.
+    """
+
+    def __init__(self, control, tareas, tablas, refrescar):
+        self.control = control
+        self.tareas = tareas
+        self.tablas = tuple(tablas)
+        self.refrescar = refrescar
+        self.version = versiones_tablas.version(*self.tablas)
+
+    def cambio(self):
+        return versiones_tablas.version(*self.tablas) != self.version
+
+    def recordar_version(self):
+        self.version = versiones_tablas.version(*self.tablas)
+
+
+class Router:
+    """
+    Shell persistente de la aplicación.
+
+    El menú lateral y el panel de contenido se agregan a la página una sola
+    vez (armar); navegar (ir) sólo reemplaza el contenido del panel y
+    cambia el color de la opción activa, así cada navegación manda al
+    cliente la vista nueva y no toda la página.
+
+    rutas: sección -> función(page, navegar_dashboard) que arma la vista y
+    la muestra con montar(page, control). Si la función devuelve una
+    Vista, ésta queda guardada (hasta MAX_VISTAS, descartando la usada hace
+    más tiempo) y volver a la sección la muestra tal como quedó, sin
+    armarla ni consultar la base; sólo se relee en segundo plano si alguna
+    de sus tablas se modificó mientras no estaba visible o si al salir se
+    descartaron lecturas que no habían llegado (por ejemplo, su primera
+    página).
+    """
+
+    def __init__(self, page, rutas, inicio="Inicio"):
+        self.page = page
+        self.rutas = rutas
+        self.inicio = inicio
+        self.actual = None
+        self.panel = ft.Container(bgcolor="#F3F4F6", padding=20, expand=True)
+        self._textos_menu = {}
+        self._vistas = OrderedDict()
+        self.restauradas = 0
+        self.refrescadas = 0
+        _routers[id(page)] = self
+
+    def boton(self, seccion, texto, icon_src):
+        """Opción del menú que navega a seccion y se resalta cuando está activa."""
+        texto_boton = ft.Text(texto, color=COLOR_MENU, size=13)
+        self._textos_menu[seccion] = texto_boton
+        return ft.Container(
+            padding=10,
+            content=ft.TextButton(
+                content=ft.Row(
+                    [
+                        ft.Image(src=icon_src, width=20, height=20),
+                        texto_boton,
+                    ],
+                    spacing=8,
+                    alignment=ft.MainAxisAlignment.START,
+                ),
+                on_click=lambda e: self.ir(seccion),
+            ),
+        )
+
+    def armar(self, menu):
+        """Agrega a la página el menú y el panel de contenido (una sola vez)."""
+        self.page.clean()
+        self.page.add(ft.Row([menu, self.panel], expand=True))
+
+    def ir(self, seccion):
+        # El menú resaltado y la vista nueva salen en un solo envío
+        with accion(self.page, f"navegar: {seccion}"):
+            self._ir(seccion)
+
+    def _ir(self, seccion):
+        saliente = self._vistas.get(self.actual)
+        if saliente is not None:
+            # Hasta acá la vista reflejaba sus propias escrituras
+            saliente.recordar_version()
+        self._marcar_activo(seccion)
+        self.actual = seccion
+        guardada = self._vistas.get(seccion)
+        if guardada is not None:
+            self._vistas.move_to_end(seccion)
+            self._restaurar(guardada)
+            return
+        vista = self.rutas[seccion](self.page, self.ir_inicio)
+        if isinstance(vista, Vista):
+            self._vistas[seccion] = vista
+            while len(self._vistas) > MAX_VISTAS:
+                self._vistas.popitem(last=False)
+
+    def _restaurar(self, vista):
+        vista.tareas.activar()
+        self.restauradas += 1
+        self.montar(vista.control)
+        if vista.cambio() or vista.tareas.lecturas_descartadas:
+            vista.tareas.lecturas_descartadas = False
+            self.refrescadas += 1
+            vista.refrescar()
+            vista.recordar_version()
+
+    def olvidar(self, seccion=None):
+        """Descarta la vista guardada de una sección (o todas)."""
+        if seccion is None:
+            self._vistas.clear()
+        else:
+            self._vistas.pop(seccion, None)
+
+    def estadisticas(self):
+        return {
+            "guardadas": list(self._vistas),
+            "max_vistas": MAX_VISTAS,
+            "restauradas": self.restauradas,
+            "refrescadas": self.refrescadas,
+        }
+
+    def ir_inicio(self, page=None):
+        self.ir(self.inicio)
+
+    def _marcar_activo(self, seccion):
+        for clave, texto in self._textos_menu.items():
+            texto.color = COLOR_MENU_ACTIVO if clave == seccion else COLOR_MENU
+
+    def montar(self, control):
+        self.panel.content = control
+        actualizar(self.page)
+
+
+def router_de(page):
+    """Router de la página, o None si no tiene."""
+    return _routers.get(id(page))
+
+
+def montar(page, control):
+    """
+    Muestra control como contenido de la página. Con un Router, reemplaza
+    sólo el panel; sin él (benchmark, pruebas) limpia la página como antes.
+    """
+    router = router_de(page)
+    if router is None:
+        page.clean()
+        page.add(control)
+        actualizar(page)
+        return
+    router.montar(control)
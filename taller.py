@@ -1,157 +1,187 @@
-import flet as ft
-import pymysql
+import time
 
-from cliente import Herramienta_Cliente
-from proveedor import Herramienta_Proveedor
-from producto import Herramienta_Producto
-from empleado import Herramienta_Empleado
-from usuario import Herramienta_Usuario
+_INICIO = time.perf_counter()
 
-# =========================
-# CONFIGURACIÓN BASE DE DATOS
-# =========================
+import importlib
+import os
+import sys
+import threading
+
+import flet as ft
 
-DB_CONFIG = {
-    "host": "localhost",
-    "port": 3306,
-    "user": "root",       # <-- ajustá usuario si hace falta
-    "password": "1234",   # <-- ajustá contraseña si hace falta
-    "database": "taller_mecanico",
-    "charset": "utf8mb4",
-    "autocommit": True,
+from cache import cache_entidades
+from cambios import feed_cambios
+from cola_escrituras import cola_escrituras, escribir
+from db import cerrar_pool, conectar, conexion, estadisticas, transaccion
+from ejecutor import Tareas
+from grilla import FuenteFilas, GrillaVirtual
+from instrumentacion import instrumentacion
+from modelo_tabla import ALTA, MODIFICACION, Cambio
+from paginacion import PaginadorKeyset, TablaPaginada
+from render import Renderizador, actualizar, lock_ui, renderizador_de
+from resumen import obtener_resumen, servicio_resumen
+from router import Router, Vista, montar, router_de
+
+# Los módulos de gestión, importar/exportar y las migraciones se importan
+# recién al usarlos, para que la ventana aparezca lo antes posible.
+HERRAMIENTAS = {
+    "Clientes": ("cliente", "Herramienta_Cliente"),
+    "Proveedores": ("proveedor", "Herramienta_Proveedor"),
+    "Productos": ("producto", "Herramienta_Producto"),
+    "Empleados": ("empleado", "Herramienta_Empleado"),
+    "Usuarios": ("usuario", "Herramienta_Usuario"),
+    "Ficha": ("vehiculo", "Herramienta_Vehiculo"),
 }
 
+MAX_ACCIONES_DIAGNOSTICO = 8  # acciones con más updates que lista el diagnóstico
 
-def conectar():
-    """Devuelve una conexión a MySQL o None si falla."""
-    try:
-        conn = pymysql.connect(**DB_CONFIG)
-        print("Conexión exitosa a MySQL")
-        return conn
-    except Exception as ex:
-        print(f"Error al conectar a MySQL: {ex}")
-        return None
+
+# =========================
+# MEDICIÓN DEL ARRANQUE
+# =========================
+
+PRESUPUESTO_INICIO = 1.0  # segundos hasta la primera pantalla
 
 
-def obtener_resumen():
+class MedicionInicio:
     """
-    Devuelve (resumen, error_db)
-    resumen: dict con conteos de tablas
-    error_db: texto de error o None
+    Tiempos del arranque desde que se empieza a importar taller.py:
+    módulos cargados, ventana abierta, primera pantalla pintada y datos
+    del panel completos. Con --medir-inicio (o TALLER_MEDIR_INICIO=1) se
+    imprimen al llegar los datos, comparados con PRESUPUESTO_INICIO.
     """
-    resumen = {
-        "clientes": 0,
-        "proveedores": 0,
-        "productos": 0,
-        "empleados": 0,
-        "usuarios": 0,
-    }
-    conn = conectar()
-    if not conn:
-        return resumen, "No se pudo conectar a la base de datos."
 
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM clientes")
-            resumen["clientes"] = cursor.fetchone()[0]
+    def __init__(self, activa):
+        self.activa = activa
+        self.hitos = {}
 
-            cursor.execute("SELECT COUNT(*) FROM proveedores")
-            resumen["proveedores"] = cursor.fetchone()[0]
+    def marcar(self, hito):
+        if hito in self.hitos:
+            return
+        self.hitos[hito] = time.perf_counter() - _INICIO
+        if hito == "datos" and self.activa:
+            print(self.informe())
+
+    def informe(self):
+        partes = ", ".join(f"{h} {t * 1000:.0f} ms" for h, t in self.hitos.items())
+        pintada = self.hitos.get("pantalla")
+        if pintada is None:
+            return f"Arranque: {partes}"
+        veredicto = "dentro" if pintada <= PRESUPUESTO_INICIO else "FUERA"
+        return (
+            f"Arranque: {partes} "
+            f"(primera pantalla {veredicto} del presupuesto de {PRESUPUESTO_INICIO * 1000:.0f} ms)"
+        )
 
-            cursor.execute("SELECT COUNT(*) FROM productos")
-            resumen["productos"] = cursor.fetchone()[0]
 
-            cursor.execute("SELECT COUNT(*) FROM mecanicos")
-            resumen["empleados"] = cursor.fetchone()[0]
+medicion_inicio = MedicionInicio(
+    "--medir-inicio" in sys.argv or os.environ.get("TALLER_MEDIR_INICIO") == "1"
+)
+medicion_inicio.marcar("modulos")
 
-            cursor.execute("SELECT COUNT(*) FROM usuarios")
-            resumen["usuarios"] = cursor.fetchone()[0]
 
-        return resumen, None
-    except Exception as ex:
-        return resumen, f"Error consultando la base de datos: {ex}"
-    finally:
-        conn.close()
+def abrir_herramienta(page: ft.Page, navegar_dashboard, seccion: str):
+    """Importa el módulo de gestión la primera vez que se lo abre y devuelve su Vista."""
+    modulo, clase = HERRAMIENTAS[seccion]
+    return getattr(importlib.import_module(modulo), clase)(page, navegar_dashboard).vista
 
 
-# =========================
-# FUNCIONES BD: VEHÍCULOS
-# =========================
+_migraciones_lock = threading.Lock()
+# Se marca cuando las migraciones terminaron bien: recién ahí existen todas
+# las tablas y columnas que usan las pantallas de gestión
+base_lista = threading.Event()
+INTERVALO_REINTENTO_BASE = 10  # segundos entre intentos si la base no responde
+ESPERA_BASE = 30  # segundos que el panel espera las migraciones antes de contar
 
-def obtener_vehiculos():
-    """Devuelve (lista_vehiculos, error)"""
-    conn = conectar()
-    if not conn:
-        return [], "No se pudo conectar a la base de datos."
 
-    vehiculos = []
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT patente, marca, modelo, color FROM vehiculos ORDER BY patente")
-            vehiculos = cursor.fetchall()
-        return vehiculos, None
-    except Exception as ex:
-        return [], f"Error consultando vehiculos: {ex}"
-    finally:
-        conn.close()
+def preparar_base():
+    """
+    Aplica las migraciones pendientes, una sola vez por proceso, y arranca
+    el feed de cambios. Si falla, la excepción sale y la base no queda
+    marcada como lista: se puede volver a llamar.
+    """
+    with _migraciones_lock:
+        if base_lista.is_set():
+            return True
+        from migraciones import aplicar_migraciones
+
+        aplicar_migraciones()
+        # Con la tabla cambios ya creada, empieza a seguir a las otras terminales
+        feed_cambios.iniciar()
+        base_lista.set()
+        return True
+
+
+def _preparar_base_hasta_lograrlo():
+    # Si el servidor todavía no responde (o arranca después) se reintenta;
+    # cada error distinto se avisa una sola vez
+    ultimo_error = None
+    while True:
+        try:
+            preparar_base()
+            return
+        except Exception as ex:
+            if str(ex) != ultimo_error:
+                print(f"No se pudieron aplicar las migraciones: {ex}")
+            ultimo_error = str(ex)
+        time.sleep(INTERVALO_REINTENTO_BASE)
+
+
+def iniciar_base():
+    """Aplica las migraciones en un hilo propio, fuera de las Tareas de las vistas."""
+    threading.Thread(target=_preparar_base_hasta_lograrlo, name="migraciones", daemon=True).start()
 
 
-def guardar_vehiculo_bd(patente, marca, modelo, color):
+def resumen_inicial():
+    # El panel se pinta sin esperar las migraciones; los conteos sí las esperan
+    base_lista.wait(ESPERA_BASE)
+    return obtener_resumen()
+
+
+def esperando_base(seccion, ruta):
     """
-    Inserta o actualiza un vehículo.
-    Si la patente ya existe, actualiza datos.
+    Ruta que, mientras las migraciones no terminaron, muestra "Preparando
+    la base de datos" y arma la vista cuando terminan (si la sección sigue
+    elegida).
     """
-    conn = conectar()
-    if not conn:
-        return "No se pudo conectar a la base de datos."
 
-    try:
-        with conn.cursor() as cursor:
-            sql = """
-                INSERT INTO vehiculos (patente, marca, modelo, color)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    marca = VALUES(marca),
-                    modelo = VALUES(modelo),
-                    color = VALUES(color)
-            """
-            cursor.execute(sql, (patente, marca, modelo, color))
+    def abrir(page, volver):
+        if base_lista.is_set():
+            return ruta(page, volver)
+        montar(page, ft.Column([
+            ft.Text("Preparando la base de datos...", size=16, color="#6B7280"),
+            ft.ProgressBar(width=400),
+        ]))
+
+        def al_terminar_migraciones():
+            base_lista.wait()
+            router = router_de(page)
+            with lock_ui:
+                if router is not None and router.actual == seccion:
+                    router.ir(seccion)
+
+        threading.Thread(target=al_terminar_migraciones, daemon=True).start()
         return None
-    except Exception as ex:
-        return f"Error guardando vehiculo: {ex}"
-    finally:
-        conn.close()
+
+    return abrir
 
 
 # =========================
 # FUNCIONES BD: PRESUPUESTOS
 # =========================
 
-def obtener_presupuestos():
-    """Devuelve (lista_presupuestos, error)"""
-    conn = conectar()
-    if not conn:
-        return [], "No se pudo conectar a la base de datos."
-
-    presupuestos = []
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT id_presupuesto, dni_cliente, monto, estado, detalle, fecha_creacion "
-                "FROM presupuestos ORDER BY fecha_creacion DESC"
-            )
-            presupuestos = cursor.fetchall()
-        return presupuestos, None
-    except Exception as ex:
-        return [], f"Error consultando presupuestos: {ex}"
-    finally:
-        conn.close()
+# Columnas de la tabla de presupuestos (y de cada fila que se le aplica)
+COLUMNAS_PRESUPUESTO = "id_presupuesto, dni_cliente, monto, estado, detalle, fecha_creacion, cantidad_items"
 
 
 def insertar_presupuesto_bd(dni_cliente, monto, estado, detalle):
-    conn = conectar()
+    """
+    Devuelve (fila, error_db); fila es el presupuesto insertado tal como
+    lo lista la tabla (con el id y la fecha que asignó la base).
+    """
+    conn = conectar("presupuestos")
     if not conn:
-        return "No se pudo conectar a la base de datos."
+        return None, "No se pudo conectar a la base de datos."
     try:
         with conn.cursor() as cursor:
             sql = """
@@ -159,62 +189,165 @@ def insertar_presupuesto_bd(dni_cliente, monto, estado, detalle):
                 VALUES (%s, %s, %s, %s)
             """
             cursor.execute(sql, (dni_cliente, monto, estado, detalle))
-        return None
+            return _leer_presupuesto(cursor, cursor.lastrowid), None
     except Exception as ex:
-        return f"Error insertando presupuesto: {ex}"
+        return None, f"Error insertando presupuesto: {ex}"
     finally:
         conn.close()
 
 
 def actualizar_presupuesto_bd(id_presupuesto, dni_cliente, monto, estado, detalle):
-    conn = conectar()
-    if not conn:
-        return "No se pudo conectar a la base de datos."
+    """
+    Devuelve el error o None. Sin conexión queda en la cola de escrituras.
+    Si el presupuesto tiene ítems, el monto es su total y no se reemplaza.
+    """
+    sql = """
+        UPDATE presupuestos
+           SET dni_cliente = %s,
+               monto = CASE WHEN cantidad_items > 0 THEN monto ELSE %s END,
+               estado = %s,
+               detalle = %s
+         WHERE id_presupuesto = %s
+    """
     try:
-        with conn.cursor() as cursor:
-            sql = """
-                UPDATE presupuestos
-                   SET dni_cliente = %s,
-                       monto = %s,
-                       estado = %s,
-                       detalle = %s
-                 WHERE id_presupuesto = %s
-            """
-            cursor.execute(sql, (dni_cliente, monto, estado, detalle, id_presupuesto))
+        escribir("presupuestos", sql, (dni_cliente, monto, estado, detalle, id_presupuesto))
         return None
     except Exception as ex:
         return f"Error actualizando presupuesto: {ex}"
-    finally:
-        conn.close()
+
+
+# Ítems con el nombre del producto: (id_item, producto, cantidad, precio_unitario, importe)
+SQL_ITEMS = """
+    SELECT i.id_item, p.nombre, i.cantidad, i.precio_unitario, i.cantidad * i.precio_unitario
+      FROM presupuesto_items i
+      JOIN productos p ON p.id = i.id_producto
+"""
+
+
+def items_presupuesto_bd(id_presupuesto):
+    """Devuelve (items, error_db), en el orden en que se agregaron."""
+    try:
+        with conexion("presupuestos") as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(SQL_ITEMS + " WHERE i.id_presupuesto = %s ORDER BY i.id_item", (id_presupuesto,))
+                return list(cursor.fetchall()), None
+    except Exception as ex:
+        return [], f"Error leyendo los ítems: {ex}"
+
+
+def _leer_presupuesto(cursor, id_presupuesto):
+    cursor.execute(
+        f"SELECT {COLUMNAS_PRESUPUESTO} FROM presupuestos WHERE id_presupuesto = %s",
+        (id_presupuesto,),
+    )
+    return cursor.fetchone()
+
+
+def agregar_item_bd(id_presupuesto, producto, cantidad):
+    """
+    Agrega un ítem con el precio actual del producto (producto es su id o
+    su nombre: si es un número se busca primero como id y si no existe
+    como nombre) y suma el importe al monto del presupuesto, todo en una
+    transacción: el total queda guardado y el listado no lo recalcula.
+    Devuelve (fila del presupuesto, ítem, error_db).
+    """
+    columnas = ["id", "nombre"] if str(producto).isdigit() else ["nombre"]
+    try:
+        with transaccion("presupuestos") as cursor:
+            agregados = 0
+            for columna in columnas:
+                # El precio se copia en el mismo INSERT, sin leerlo antes
+                agregados = cursor.execute(
+                    f"""
+                    INSERT INTO presupuesto_items (id_presupuesto, id_producto, cantidad, precio_unitario)
+                    SELECT %s, id, %s, precio FROM productos WHERE {columna} = %s
+                    """,
+                    (id_presupuesto, cantidad, producto),
+                )
+                if agregados:
+                    break
+            if not agregados:
+                return None, None, f"No existe el producto {producto}."
+            id_item = cursor.lastrowid
+            # Con el primer ítem el monto escrito a mano se reemplaza por el total
+            cursor.execute(
+                """
+                UPDATE presupuestos
+                   SET monto = CASE WHEN cantidad_items > 0 THEN monto ELSE 0 END
+                             + (SELECT cantidad * precio_unitario FROM presupuesto_items WHERE id_item = %s),
+                       cantidad_items = cantidad_items + 1
+                 WHERE id_presupuesto = %s
+                """,
+                (id_item, id_presupuesto),
+            )
+            cursor.execute(SQL_ITEMS + " WHERE i.id_item = %s", (id_item,))
+            item = cursor.fetchone()
+            return _leer_presupuesto(cursor, id_presupuesto), item, None
+    except Exception as ex:
+        return None, None, f"Error agregando el ítem: {ex}"
+
+
+def quitar_item_bd(id_presupuesto, id_item):
+    """
+    Quita un ítem del presupuesto y resta su importe del monto. Si el ítem
+    ya no está (otra terminal lo quitó) no cambia nada. Devuelve (fila del
+    presupuesto, error_db).
+    """
+    try:
+        with transaccion("presupuestos") as cursor:
+            # Los ítems no se modifican: el importe leído sigue valiendo
+            cursor.execute(
+                "SELECT cantidad * precio_unitario FROM presupuesto_items WHERE id_item = %s AND id_presupuesto = %s",
+                (id_item, id_presupuesto),
+            )
+            importe = cursor.fetchone()
+            # El DELETE bloquea la fila: de dos bajas simultáneas sólo una resta
+            quitados = importe and cursor.execute(
+                "DELETE FROM presupuesto_items WHERE id_item = %s AND id_presupuesto = %s",
+                (id_item, id_presupuesto),
+            )
+            if quitados == 1:
+                cursor.execute(
+                    """
+                    UPDATE presupuestos
+                       SET monto = monto - %s, cantidad_items = cantidad_items - 1
+                     WHERE id_presupuesto = %s
+                    """,
+                    (importe[0], id_presupuesto),
+                )
+            return _leer_presupuesto(cursor, id_presupuesto), None
+    except Exception as ex:
+        return None, f"Error quitando el ítem: {ex}"
 
 
 # =========================
 # COMPONENTES DE UI
 # =========================
 
-def crear_sidebar(page: ft.Page, navegar_dashboard, titulo_seccion: str):
+def crear_sidebar(router: Router):
     """
     Sidebar a la izquierda con navegación básica.
     No usa icons ni colors de Flet, solo imágenes y textos.
+    Se arma una sola vez; el router resalta la opción activa.
     """
+    page = router.page
 
-    def boton_nav(texto, icon_src, on_click, activo=False):
-        # Para "simular" activo, cambiamos el color del texto
-        color_texto = "white" if not activo else "#38BDF8"
-        return ft.Container(
-            padding=10,
-            content=ft.TextButton(
-                content=ft.Row(
-                    [
-                        ft.Image(src=icon_src, width=20, height=20),
-                        ft.Text(texto, color=color_texto, size=13),
-                    ],
-                    spacing=8,
-                    alignment=ft.MainAxisAlignment.START,
-                ),
-                on_click=on_click,
-            ),
-        )
+    # Escrituras hechas sin conexión que esperan para aplicarse
+    lbl_cola = ft.Text("", size=11, color="#FBBF24", visible=False)
+
+    def estado_cola(pendientes, conflictos):
+        partes = []
+        if pendientes:
+            partes.append(f"{pendientes} escrituras en cola (sin conexión)")
+        if conflictos:
+            partes.append(f"{conflictos} con conflicto al aplicarse")
+        lbl_cola.value = "\n".join(partes)
+        lbl_cola.visible = bool(partes)
+        actualizar(page)
+
+    cola = cola_escrituras.estadisticas()
+    estado_cola(cola["pendientes"], cola["conflictos"])
+    cola_escrituras.al_cambiar(estado_cola)
 
     return ft.Container(
         width=230,
@@ -222,85 +355,51 @@ def crear_sidebar(page: ft.Page, navegar_dashboard, titulo_seccion: str):
         padding=20,
         content=ft.Column(
             [
-                ft.Row(
-                    [
-                        ft.Image(src="./iconos/auto.png", width=30, height=30),
-                        ft.Column(
-                            [
-                                ft.Text(
-                                    "Taller Mecánico",
-                                    size=18,
-                                    weight="bold",
-                                    color="white",
-                                ),
-                                ft.Text(
-                                    "Panel alternativo",
-                                    size=11,
-                                    color="#9CA3AF",
-                                ),
-                            ],
-                            spacing=0,
-                        ),
-                    ],
-                    spacing=10,
+                # Doble click en el logo abre el panel de diagnóstico
+                ft.GestureDetector(
+                    on_double_tap=lambda e: router.ir("Diagnóstico"),
+                    content=ft.Row(
+                        [
+                            ft.Image(src="./iconos/auto.png", width=30, height=30),
+                            ft.Column(
+                                [
+                                    ft.Text(
+                                        "Taller Mecánico",
+                                        size=18,
+                                        weight="bold",
+                                        color="white",
+                                    ),
+                                    ft.Text(
+                                        "Panel alternativo",
+                                        size=11,
+                                        color="#9CA3AF",
+                                    ),
+                                ],
+                                spacing=0,
+                            ),
+                        ],
+                        spacing=10,
+                    ),
                 ),
                 ft.Divider(color="#1F2937"),
                 ft.Text("Navegación", size=11, color="#9CA3AF"),
-                boton_nav(
-                    "Inicio",
-                    "./iconos/Ficha.png",
-                    lambda e: navegar_dashboard(page),
-                    activo=(titulo_seccion == "Inicio"),
-                ),
+                router.boton("Inicio", "Inicio", "./iconos/Ficha.png"),
                 ft.Text("Gestión", size=11, color="#9CA3AF"),
-                boton_nav(
-                    "Clientes",
-                    "./iconos/Cliente.png",
-                    lambda e: Herramienta_Cliente(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Clientes"),
-                ),
-                boton_nav(
-                    "Proveedores",
-                    "./iconos/proveedor.png",
-                    lambda e: Herramienta_Proveedor(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Proveedores"),
-                ),
-                boton_nav(
-                    "Productos",
-                    "./iconos/caja-de-cambios.png",
-                    lambda e: Herramienta_Producto(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Productos"),
-                ),
-                boton_nav(
-                    "Empleados",
-                    "./iconos/Empleado.png",
-                    lambda e: Herramienta_Empleado(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Empleados"),
-                ),
-                boton_nav(
-                    "Usuarios",
-                    "./iconos/usuarios.png",
-                    lambda e: Herramienta_Usuario(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Usuarios"),
-                ),
+                router.boton("Clientes", "Clientes", "./iconos/Cliente.png"),
+                router.boton("Proveedores", "Proveedores", "./iconos/proveedor.png"),
+                router.boton("Productos", "Productos", "./iconos/caja-de-cambios.png"),
+                router.boton("Empleados", "Empleados", "./iconos/Empleado.png"),
+                router.boton("Usuarios", "Usuarios", "./iconos/usuarios.png"),
                 ft.Text("Administración", size=11, color="#9CA3AF"),
-                boton_nav(
-                    "Ficha del vehículo",
-                    "./iconos/auto.png",
-                    lambda e: ficha_tecnica(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Ficha"),
-                ),
-                boton_nav(
-                    "Presupuestos",
-                    "./iconos/Presupuesto.png",
-                    lambda e: presupuesto(page, navegar_dashboard),
-                    activo=(titulo_seccion == "Presupuesto"),
-                ),
+                router.boton("Ficha", "Ficha del vehículo", "./iconos/auto.png"),
+                router.boton("Presupuesto", "Presupuestos", "./iconos/Presupuesto.png"),
+                router.boton("Datos", "Importar / exportar", "./iconos/bandeja-de-entrada.png"),
                 ft.Container(expand=True),
+                lbl_cola,
                 ft.Divider(color="#1F2937"),
                 ft.TextButton(
                     "Salir del sistema",
-                    on_click=lambda e: page.window.close(),
+                    on_click=lambda e: salir(page),
                     style=ft.ButtonStyle(
                         color="red",
                     ),
@@ -312,11 +411,20 @@ def crear_sidebar(page: ft.Page, navegar_dashboard, titulo_seccion: str):
     )
 
 
+def salir(page: ft.Page):
+    """Cierra las conexiones del pool y la ventana."""
+    cerrar_pool()
+    page.window.close()
+
+
 def tarjeta_resumen(titulo: str, valor: int, icon_src: str):
     """
     Tarjeta simple sin BoxShadow ni cosas raras.
+    En .data queda el Text del valor, para completarlo después.
     """
+    texto_valor = ft.Text(str(valor), size=18, weight="bold", color="#111827")
     return ft.Container(
+        data=texto_valor,
         bgcolor="white",
         padding=12,
         border_radius=8,
@@ -327,7 +435,7 @@ def tarjeta_resumen(titulo: str, valor: int, icon_src: str):
                 ft.Column(
                     [
                         ft.Text(titulo, size=11, color="#6B7280"),
-                        ft.Text(str(valor), size=18, weight="bold", color="#111827"),
+                        texto_valor,
                     ],
                     spacing=2,
                 ),
@@ -343,13 +451,29 @@ def tarjeta_resumen(titulo: str, valor: int, icon_src: str):
 # =========================
 
 def dashboard(page: ft.Page):
-    """Vista principal con resumen de datos."""
+    """
+    Vista principal con resumen de datos.
 
-    page.clean()
+    Se pinta enseguida con las tarjetas vacías; los conteos llegan en
+    segundo plano (la primera vez, después de aplicar las migraciones).
+    """
 
-    resumen, error_db = obtener_resumen()
+    # Cancela lo que haya quedado pendiente en la vista anterior
+    tareas = Tareas(page)
 
-    sidebar = crear_sidebar(page, dashboard, "Inicio")
+    tarjetas = {
+        "clientes": tarjeta_resumen("Clientes", "…", "./iconos/Cliente.png"),
+        "proveedores": tarjeta_resumen("Proveedores", "…", "./iconos/proveedor.png"),
+        "productos": tarjeta_resumen("Productos", "…", "./iconos/caja-de-cambios.png"),
+        "empleados": tarjeta_resumen("Empleados", "…", "./iconos/Empleado.png"),
+        "usuarios": tarjeta_resumen("Usuarios", "…", "./iconos/usuarios.png"),
+    }
+    error_box = ft.Container(
+        bgcolor="#FEE2E2",
+        padding=10,
+        border_radius=8,
+        visible=False,
+    )
 
     contenido = ft.Column(
         [
@@ -360,34 +484,13 @@ def dashboard(page: ft.Page):
                 color="#6B7280",
             ),
             ft.Divider(),
+            tareas.indicador,
+            error_box,
+            ft.Row(list(tarjetas.values()), spacing=12, wrap=True),
         ],
         spacing=5,
     )
 
-    if error_db:
-        contenido.controls.append(
-            ft.Container(
-                bgcolor="#FEE2E2",
-                padding=10,
-                border_radius=8,
-                content=ft.Text(error_db, color="#B91C1C"),
-            )
-        )
-    else:
-        contenido.controls.append(
-            ft.Row(
-                [
-                    tarjeta_resumen("Clientes", resumen["clientes"], "./iconos/Cliente.png"),
-                    tarjeta_resumen("Proveedores", resumen["proveedores"], "./iconos/proveedor.png"),
-                    tarjeta_resumen("Productos", resumen["productos"], "./iconos/caja-de-cambios.png"),
-                    tarjeta_resumen("Empleados", resumen["empleados"], "./iconos/Empleado.png"),
-                    tarjeta_resumen("Usuarios", resumen["usuarios"], "./iconos/usuarios.png"),
-                ],
-                spacing=12,
-                wrap=True,
-            )
-        )
-
     contenido.controls.append(
         ft.Container(
             margin=ft.margin.only(top=20),
@@ -399,161 +502,34 @@ def dashboard(page: ft.Page):
         )
     )
 
-    layout = ft.Row(
-        [
-            sidebar,
-            ft.Container(
-                bgcolor="#F3F4F6",
-                padding=20,
-                expand=True,
-                content=contenido,
-            ),
-        ],
-        expand=True,
+    stats_cache = cache_entidades.estadisticas()
+    contenido.controls.append(
+        ft.Text(
+            f"Caché de registros: {stats_cache['entradas']}/{stats_cache['max_entradas']} filas, "
+            f"{stats_cache['aciertos']} aciertos, {stats_cache['fallos']} fallos "
+            f"({stats_cache['tasa_aciertos']:.0%})",
+            size=11,
+            color="#9CA3AF",
+        )
     )
 
-    page.add(layout)
-    page.update()
-
-
-def ficha_tecnica(page: ft.Page, navegar_dashboard):
-    page.clean()
+    def mostrar_resumen(resultado):
+        resumen, error_db = resultado
+        if error_db:
+            error_box.content = ft.Text(error_db, color="#B91C1C")
+            error_box.visible = True
+        for clave, tarjeta in tarjetas.items():
+            tarjeta.data.value = str(resumen[clave])
+        actualizar(page)
+        medicion_inicio.marcar("datos")
 
-    sidebar = crear_sidebar(page, navegar_dashboard, "Ficha")
+    montar(page, contenido)
 
-    txt_patente = ft.TextField(label="Patente", width=150)
-    txt_marca = ft.TextField(label="Marca", width=150)
-    txt_modelo = ft.TextField(label="Modelo", width=150)
-    txt_color = ft.TextField(label="Color", width=150)
-
-    lbl_error = ft.Text("", color="#B91C1C", size=11)
-    lbl_ok = ft.Text("", color="#15803D", size=11)
-
-    tabla_vehiculos = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("Patente")),
-            ft.DataColumn(ft.Text("Marca")),
-            ft.DataColumn(ft.Text("Modelo")),
-            ft.DataColumn(ft.Text("Color")),
-        ],
-        rows=[],
-    )
-
-    def cargar_tabla():
-        vehiculos, error = obtener_vehiculos()
-        tabla_vehiculos.rows.clear()
-        lbl_error.value = ""
-        lbl_ok.value = ""
-        if error:
-            lbl_error.value = error
-        else:
-            for v in vehiculos:
-                patente, marca, modelo, color = v
-
-                def on_select(e, p=patente, m=marca, mo=modelo, c=color):
-                    txt_patente.value = p
-                    txt_marca.value = m
-                    txt_modelo.value = mo
-                    txt_color.value = c
-                    lbl_error.value = ""
-                    lbl_ok.value = ""
-                    page.update()
-
-                tabla_vehiculos.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(patente)),
-                            ft.DataCell(ft.Text(marca)),
-                            ft.DataCell(ft.Text(modelo)),
-                            ft.DataCell(ft.Text(color)),
-                        ],
-                        on_select_changed=on_select,
-                    )
-                )
-        page.update()
-
-    def limpiar_campos(e=None):
-        txt_patente.value = ""
-        txt_marca.value = ""
-        txt_modelo.value = ""
-        txt_color.value = ""
-        lbl_error.value = ""
-        lbl_ok.value = ""
-        page.update()
-
-    def guardar_click(e):
-        lbl_error.value = ""
-        lbl_ok.value = ""
-        patente = (txt_patente.value or "").strip()
-        marca = (txt_marca.value or "").strip()
-        modelo = (txt_modelo.value or "").strip()
-        color = (txt_color.value or "").strip()
-
-        if not patente or not marca or not modelo or not color:
-            lbl_error.value = "Todos los campos son obligatorios."
-            page.update()
-            return
-
-        err = guardar_vehiculo_bd(patente, marca, modelo, color)
-        if err:
-            lbl_error.value = err
-        else:
-            lbl_ok.value = "Vehículo guardado correctamente."
-            cargar_tabla()
-
-        page.update()
-
-    btn_guardar = ft.ElevatedButton("Guardar / Actualizar", on_click=guardar_click)
-    btn_limpiar = ft.ElevatedButton("Limpiar", on_click=limpiar_campos)
-    btn_volver = ft.ElevatedButton("Volver al panel", on_click=lambda e: navegar_dashboard(page))
-
-    contenido = ft.Column(
-        [
-            ft.Text("Ficha técnica del vehículo", size=22, weight="bold", color="#111827"),
-            ft.Text(
-                "Formulario para registrar y consultar vehículos por patente.",
-                size=12,
-                color="#6B7280",
-            ),
-            ft.Divider(),
-            ft.Row([txt_patente, txt_marca, txt_modelo, txt_color], spacing=10),
-            ft.Row([btn_guardar, btn_limpiar, btn_volver], spacing=10),
-            lbl_error,
-            lbl_ok,
-            ft.Text("Vehículos registrados", size=14, weight="bold"),
-            ft.Container(
-                bgcolor="white",
-                border_radius=8,
-                border=ft.border.all(1, "#E5E7EB"),
-                padding=10,
-                content=tabla_vehiculos,
-            ),
-        ],
-        spacing=8,
-    )
-
-    layout = ft.Row(
-        [
-            sidebar,
-            ft.Container(
-                bgcolor="#F3F4F6",
-                padding=20,
-                expand=True,
-                content=contenido,
-            ),
-        ],
-        expand=True,
-    )
-
-    page.add(layout)
-    cargar_tabla()
-    page.update()
+    tareas.ejecutar(resumen_inicial, al_terminar=mostrar_resumen)
 
 
 def presupuesto(page: ft.Page, navegar_dashboard):
-    page.clean()
-
-    sidebar = crear_sidebar(page, navegar_dashboard, "Presupuesto")
+    tareas = Tareas(page)
 
     txt_dni = ft.TextField(label="DNI Cliente", width=150)
     txt_monto = ft.TextField(label="Monto", width=100)
@@ -572,64 +548,155 @@ def presupuesto(page: ft.Page, navegar_dashboard):
     lbl_error = ft.Text("", color="#B91C1C", size=11)
     lbl_ok = ft.Text("", color="#15803D", size=11)
 
-    presupuesto_seleccionado_id = {"id": None}
+    presupuesto_seleccionado_id = {"id": None, "fecha": None, "monto": None, "items": 0}
+
+    # Ítems del presupuesto seleccionado
+    txt_producto = ft.TextField(label="Producto (ID o nombre)", width=200)
+    txt_cantidad = ft.TextField(label="Cantidad", width=100, value="1")
+    items = FuenteFilas()
+    grilla_items = GrillaVirtual(
+        page,
+        [("Producto", 200), ("Cantidad", 80), ("Precio unit.", 100), ("Importe", 100)],
+        fuente=items,
+        valores=lambda i: i[1:],
+        acciones=[("iconos/borrar.png", "Quitar", lambda id_item: quitar_item(id_item))],
+        filas_visibles=8,
+    )
+    seccion_items = ft.Column(visible=False, spacing=8)
+
+    def mostrar_presupuesto(fila):
+        """Muestra en el formulario el monto y los ítems guardados de fila."""
+        pid, dni, monto, estado, detalle, fecha, cantidad_items = fila
+        presupuesto_seleccionado_id.update(id=pid, fecha=fecha, monto=monto, items=cantidad_items)
+        txt_monto.value = str(monto)
+        # Con ítems, el monto es su total
+        txt_monto.read_only = cantidad_items > 0
+        seccion_items.controls[0].value = f"Ítems del presupuesto {pid} ({cantidad_items})"
+
+    def seleccionar_presupuesto(p):
+        pid, dni, monto, estado, detalle, fecha, cantidad_items = p
+        mostrar_presupuesto(p)
+        txt_dni.value = dni
+        dd_estado.value = estado
+        txt_detalle.value = detalle or ""
+        lbl_error.value = ""
+        lbl_ok.value = ""
+        seccion_items.visible = True
+        grilla_items.mensaje("Cargando ítems...")
+        actualizar(page)
+        tareas.ejecutar(items_presupuesto_bd, pid, al_terminar=mostrar_items, clave="items")
+
+    def invalidar_cache(resultado):
+        # Aunque se haya salido de la pantalla antes de la respuesta
+        cache_entidades.invalidar("presupuestos")
 
-    tabla_presupuestos = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("ID")),
-            ft.DataColumn(ft.Text("DNI")),
-            ft.DataColumn(ft.Text("Monto")),
-            ft.DataColumn(ft.Text("Estado")),
-            ft.DataColumn(ft.Text("Fecha")),
-        ],
-        rows=[],
+    def mostrar_items(resultado):
+        filas, err = resultado
+        if err:
+            grilla_items.mensaje(err, "red")
+        elif filas:
+            grilla_items.mostrar(filas)
+        else:
+            grilla_items.mensaje("Sin ítems: el monto se escribe a mano.")
+        actualizar(page)
+
+    def al_cambiar_items(fila, err, ok):
+        if err:
+            lbl_error.value = err
+        else:
+            mostrar_presupuesto(fila)
+            tabla_presupuestos.aplicar([Cambio(MODIFICACION, fila[0], fila)])
+            lbl_ok.value = ok
+            if items.total():
+                grilla_items.refrescar()
+            else:
+                grilla_items.mensaje("Sin ítems: el monto se escribe a mano.")
+        actualizar(page)
+
+    def agregar_item(e):
+        lbl_error.value = ""
+        lbl_ok.value = ""
+        pid = presupuesto_seleccionado_id["id"]
+        producto = (txt_producto.value or "").strip()
+        try:
+            cantidad = int((txt_cantidad.value or "").strip())
+        except ValueError:
+            cantidad = 0
+        if pid is None or not producto or cantidad <= 0:
+            lbl_error.value = "Indicá el producto y una cantidad mayor que cero."
+            actualizar(page)
+            return
+
+        def al_agregar(resultado):
+            fila, item, err = resultado
+            if not err:
+                # El ítem nuevo se agrega al final sin releer la lista
+                items.filas.append(item)
+                txt_producto.value = ""
+                txt_cantidad.value = "1"
+            al_cambiar_items(fila, err, "Ítem agregado.")
+
+        tareas.ejecutar(agregar_item_bd, pid, producto, cantidad, al_terminar=al_agregar,
+                        escritura=True, al_confirmar=invalidar_cache)
+
+    def quitar_item(id_item):
+        pid = presupuesto_seleccionado_id["id"]
+
+        def al_quitar(resultado):
+            fila, err = resultado
+            if not err:
+                items.reemplazar([i for i in items.filas if i[0] != id_item])
+            al_cambiar_items(fila, err, "Ítem quitado.")
+
+        tareas.ejecutar(quitar_item_bd, pid, id_item, al_terminar=al_quitar,
+                        escritura=True, al_confirmar=invalidar_cache)
+
+    btn_agregar_item = ft.ElevatedButton("Agregar ítem", on_click=agregar_item)
+    seccion_items.controls = [
+        ft.Text("", size=14, weight="bold"),
+        ft.Row([txt_producto, txt_cantidad, btn_agregar_item], spacing=10),
+        grilla_items.control,
+    ]
+
+    tabla_presupuestos = TablaPaginada(
+        page,
+        tareas,
+        PaginadorKeyset(
+            "presupuestos", "presupuestos",
+            COLUMNAS_PRESUPUESTO.split(", "),
+            [("fecha_creacion", "DESC"), ("id_presupuesto", "DESC")],
+            busqueda=["dni_cliente"],
+        ),
+        [("ID", 50), ("DNI", 110), ("Monto", 100), ("Estado", 100), ("Fecha", 160), ("Ítems", 60)],
+        valores=lambda p: (p[0], p[1], p[2], p[3], p[5], p[6]),
+        al_seleccionar=seleccionar_presupuesto,
+        texto_vacio="No hay presupuestos registrados",
+        ordenes={
+            0: ["id_presupuesto"],
+            1: ["dni_cliente"],
+            3: ["estado", "fecha_creacion"],
+            4: ["fecha_creacion"],
+        },
     )
 
     def cargar_tabla():
-        presupuestos, error = obtener_presupuestos()
-        tabla_presupuestos.rows.clear()
         lbl_error.value = ""
         lbl_ok.value = ""
         presupuesto_seleccionado_id["id"] = None
-        if error:
-            lbl_error.value = error
-        else:
-            for p in presupuestos:
-                pid, dni, monto, estado, detalle, fecha = p
-
-                def on_select(e, _id=pid, _dni=dni, _monto=monto, _estado=estado, _detalle=detalle):
-                    presupuesto_seleccionado_id["id"] = _id
-                    txt_dni.value = _dni
-                    txt_monto.value = str(_monto)
-                    dd_estado.value = _estado
-                    txt_detalle.value = _detalle or ""
-                    lbl_error.value = ""
-                    lbl_ok.value = ""
-                    page.update()
-
-                tabla_presupuestos.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(str(pid))),
-                            ft.DataCell(ft.Text(dni)),
-                            ft.DataCell(ft.Text(str(monto))),
-                            ft.DataCell(ft.Text(estado)),
-                            ft.DataCell(ft.Text(str(fecha))),
-                        ],
-                        on_select_changed=on_select,
-                    )
-                )
-        page.update()
+        tabla_presupuestos.recargar()
 
     def limpiar_campos(e=None):
         txt_dni.value = ""
         txt_monto.value = ""
+        txt_monto.read_only = False
         dd_estado.value = "Pendiente"
         txt_detalle.value = ""
         lbl_error.value = ""
         lbl_ok.value = ""
-        presupuesto_seleccionado_id["id"] = None
-        page.update()
+        presupuesto_seleccionado_id.update(id=None, fecha=None, monto=None, items=0)
+        seccion_items.visible = False
+        items.reemplazar([])
+        actualizar(page)
 
     def guardar_nuevo(e):
         lbl_error.value = ""
@@ -641,32 +708,36 @@ def presupuesto(page: ft.Page, navegar_dashboard):
 
         if not dni or not monto_txt or not estado:
             lbl_error.value = "DNI, Monto y Estado son obligatorios."
-            page.update()
+            actualizar(page)
             return
 
         try:
             monto = float(monto_txt)
         except ValueError:
             lbl_error.value = "El monto debe ser numérico."
-            page.update()
+            actualizar(page)
             return
 
-        err = insertar_presupuesto_bd(dni, monto, estado, detalle)
-        if err:
-            lbl_error.value = err
-        else:
-            lbl_ok.value = "Presupuesto cargado correctamente."
-            limpiar_campos()
-            cargar_tabla()
+        def al_insertar(resultado):
+            fila, err = resultado
+            if err:
+                lbl_error.value = err
+            else:
+                limpiar_campos()
+                lbl_ok.value = "Presupuesto cargado correctamente."
+                tabla_presupuestos.aplicar([Cambio(ALTA, fila[0], fila)], 1)
 
-        page.update()
+            actualizar(page)
+
+        tareas.ejecutar(insertar_presupuesto_bd, dni, monto, estado, detalle, al_terminar=al_insertar,
+                        escritura=True, al_confirmar=invalidar_cache)
 
     def actualizar_existente(e):
         lbl_error.value = ""
         lbl_ok.value = ""
         if presupuesto_seleccionado_id["id"] is None:
             lbl_error.value = "Primero seleccioná un presupuesto de la lista."
-            page.update()
+            actualizar(page)
             return
 
         dni = (txt_dni.value or "").strip()
@@ -676,31 +747,44 @@ def presupuesto(page: ft.Page, navegar_dashboard):
 
         if not dni or not monto_txt or not estado:
             lbl_error.value = "DNI, Monto y Estado son obligatorios."
-            page.update()
+            actualizar(page)
             return
 
         try:
             monto = float(monto_txt)
         except ValueError:
             lbl_error.value = "El monto debe ser numérico."
-            page.update()
+            actualizar(page)
             return
 
-        err = actualizar_presupuesto_bd(
-            presupuesto_seleccionado_id["id"],
+        pid = presupuesto_seleccionado_id["id"]
+        cantidad_items = presupuesto_seleccionado_id["items"]
+        if cantidad_items:
+            # El monto de un presupuesto con ítems es su total guardado
+            monto = presupuesto_seleccionado_id["monto"]
+        fila = (pid, dni, monto, estado, detalle, presupuesto_seleccionado_id["fecha"], cantidad_items)
+
+        def al_actualizar(err):
+            if err:
+                lbl_error.value = err
+            else:
+                limpiar_campos()
+                lbl_ok.value = "Presupuesto actualizado correctamente."
+                tabla_presupuestos.aplicar([Cambio(MODIFICACION, pid, fila)])
+
+            actualizar(page)
+
+        tareas.ejecutar(
+            actualizar_presupuesto_bd,
+            pid,
             dni,
             monto,
             estado,
             detalle,
+            al_terminar=al_actualizar,
+            escritura=True,
+            al_confirmar=invalidar_cache,
         )
-        if err:
-            lbl_error.value = err
-        else:
-            lbl_ok.value = "Presupuesto actualizado correctamente."
-            limpiar_campos()
-            cargar_tabla()
-
-        page.update()
 
     btn_nuevo = ft.ElevatedButton("Guardar nuevo", on_click=guardar_nuevo)
     btn_actualizar = ft.ElevatedButton("Actualizar seleccionado", on_click=actualizar_existente)
@@ -719,48 +803,372 @@ def presupuesto(page: ft.Page, navegar_dashboard):
             ft.Row([txt_dni, txt_monto, dd_estado], spacing=10),
             txt_detalle,
             ft.Row([btn_nuevo, btn_actualizar, btn_limpiar, btn_volver], spacing=10),
+            tareas.indicador,
             lbl_error,
             lbl_ok,
+            seccion_items,
             ft.Text("Presupuestos registrados", size=14, weight="bold"),
             ft.Container(
                 bgcolor="white",
                 border_radius=8,
                 border=ft.border.all(1, "#E5E7EB"),
                 padding=10,
-                content=tabla_presupuestos,
+                content=tabla_presupuestos.control,
+            ),
+        ],
+        spacing=8,
+    )
+
+    montar(page, contenido)
+    cargar_tabla()
+    return Vista(contenido, tareas, ["presupuestos"], tabla_presupuestos.recargar)
+
+
+def datos(page: ft.Page, navegar_dashboard):
+    """Importación masiva desde CSV y exportación de tablas a CSV / JSON Lines."""
+    from exportar import FORMATOS, TABLAS_EXPORTABLES, exportar_tabla
+    from importar import ENTIDADES, importar_csv
+
+    tareas = Tareas(page)
+
+    dd_entidad = ft.Dropdown(
+        label="Tabla",
+        width=200,
+        options=[ft.dropdown.Option(e) for e in ENTIDADES],
+        value="clientes",
+    )
+    txt_archivo = ft.TextField(label="Archivo CSV", width=420)
+    barra = ft.ProgressBar(width=620, value=0, visible=False)
+    lbl_error = ft.Text("", color="#B91C1C", size=11)
+    lbl_ok = ft.Text("", color="#15803D", size=11)
+    lista_errores = ft.ListView(height=200, spacing=2)
+
+    dd_tabla_exp = ft.Dropdown(
+        label="Tabla",
+        width=200,
+        options=[ft.dropdown.Option(t) for t in TABLAS_EXPORTABLES],
+        value="clientes",
+    )
+    dd_formato = ft.Dropdown(
+        label="Formato",
+        width=120,
+        options=[ft.dropdown.Option(f) for f in FORMATOS],
+        value="csv",
+    )
+    chk_gzip = ft.Checkbox(label="Comprimir (gzip)", value=False)
+    lbl_exportacion = ft.Text("", color="#15803D", size=11)
+
+    def archivo_elegido(e):
+        if e.files:
+            txt_archivo.value = e.files[0].path
+            actualizar(page)
+
+    def destino_elegido(e):
+        if e.path:
+            exportar_a(e.path)
+
+    # Un solo selector de archivos aunque se vuelva varias veces a la vista
+    page.overlay[:] = [c for c in page.overlay if c.data != "datos"]
+    selector = ft.FilePicker(on_result=archivo_elegido, data="datos")
+    selector_destino = ft.FilePicker(on_result=destino_elegido, data="datos")
+    page.overlay.extend([selector, selector_destino])
+
+    def al_progresar(resultado, fraccion):
+        barra.value = fraccion
+        lbl_ok.value = str(resultado)
+        try:
+            actualizar(page)
+        except Exception:
+            pass
+
+    def al_terminar(resultado):
+        barra.visible = False
+        btn_importar.disabled = False
+        lbl_ok.value = f"Importación terminada: {resultado}"
+        lista_errores.controls = [
+            ft.Text(f"Línea {linea}: {mensaje}", size=11, color="#B91C1C")
+            for linea, mensaje in resultado.errores
+        ]
+        if resultado.cantidad_errores > len(resultado.errores):
+            lista_errores.controls.append(
+                ft.Text(
+                    f"... y {resultado.cantidad_errores - len(resultado.errores)} errores más",
+                    size=11,
+                    color="#6B7280",
+                )
+            )
+        actualizar(page)
+
+    def al_fallar(ex):
+        barra.visible = False
+        btn_importar.disabled = False
+        lbl_error.value = f"No se pudo importar: {ex}"
+        actualizar(page)
+
+    def importar_click(e):
+        lbl_error.value = ""
+        lbl_ok.value = ""
+        lista_errores.controls = []
+        ruta = (txt_archivo.value or "").strip()
+        if not ruta:
+            lbl_error.value = "Elegí un archivo CSV."
+            actualizar(page)
+            return
+        barra.value = 0
+        barra.visible = True
+        btn_importar.disabled = True
+        actualizar(page)
+        entidad = dd_entidad.value
+        tareas.ejecutar(
+            lambda: importar_csv(entidad, ruta, al_progresar=al_progresar),
+            al_terminar=al_terminar,
+            al_fallar=al_fallar,
+            escritura=True,
+        )
+
+    def exportar_a(ruta):
+        tabla = dd_tabla_exp.value
+        lbl_error.value = ""
+        lbl_exportacion.value = f"Exportando {tabla}..."
+        btn_exportar.disabled = True
+        actualizar(page)
+
+        def al_progresar(filas):
+            lbl_exportacion.value = f"Exportando {tabla}: {filas} filas"
+            try:
+                actualizar(page)
+            except Exception:
+                pass
+
+        def al_exportar(filas):
+            btn_exportar.disabled = False
+            lbl_exportacion.value = f"{filas} filas de {tabla} exportadas a {ruta}"
+            actualizar(page)
+
+        def al_fallar_exportacion(ex):
+            btn_exportar.disabled = False
+            lbl_exportacion.value = ""
+            lbl_error.value = f"No se pudo exportar: {ex}"
+            actualizar(page)
+
+        tareas.ejecutar(
+            lambda: exportar_tabla(tabla, ruta, dd_formato.value, chk_gzip.value, al_progresar),
+            al_terminar=al_exportar,
+            al_fallar=al_fallar_exportacion,
+            escritura=True,
+        )
+
+    def exportar_click(e):
+        extension = "." + dd_formato.value + (".gz" if chk_gzip.value else "")
+        selector_destino.save_file(file_name=dd_tabla_exp.value + extension)
+
+    btn_elegir = ft.ElevatedButton(
+        "Elegir...", on_click=lambda e: selector.pick_files(allowed_extensions=["csv", "txt"])
+    )
+    btn_exportar = ft.ElevatedButton("Exportar...", on_click=exportar_click)
+    btn_importar = ft.ElevatedButton("Importar", on_click=importar_click)
+    btn_volver = ft.ElevatedButton("Volver al panel", on_click=lambda e: navegar_dashboard(page))
+
+    contenido = ft.Column(
+        [
+            ft.Text("Importar y exportar datos", size=22, weight="bold", color="#111827"),
+            ft.Text(
+                "Carga clientes, productos o proveedores desde un CSV con encabezado. "
+                "Las filas cuya clave ya existe se actualizan.",
+                size=12,
+                color="#6B7280",
+            ),
+            ft.Divider(),
+            ft.Row([dd_entidad, txt_archivo, btn_elegir], spacing=10),
+            ft.Row([btn_importar, btn_volver], spacing=10),
+            barra,
+            tareas.indicador,
+            lbl_error,
+            lbl_ok,
+            ft.Text("Exportar", size=14, weight="bold"),
+            ft.Row([dd_tabla_exp, dd_formato, chk_gzip, btn_exportar], spacing=10),
+            lbl_exportacion,
+            ft.Text("Filas con errores", size=14, weight="bold"),
+            ft.Container(
+                bgcolor="white",
+                border_radius=8,
+                border=ft.border.all(1, "#E5E7EB"),
+                padding=10,
+                content=lista_errores,
             ),
         ],
         spacing=8,
     )
 
-    layout = ft.Row(
+    montar(page, contenido)
+
+
+def diagnostico(page: ft.Page, navegar_dashboard):
+    """
+    Panel oculto (doble click en el logo del menú) con el estado del pool,
+    de la caché y los tiempos de cada sentencia SQL.
+    """
+    Tareas(page)
+
+    lbl_pool = ft.Text("", size=12, color="#374151")
+    lbl_cache = ft.Text("", size=12, color="#374151")
+    lbl_vistas = ft.Text("", size=12, color="#374151")
+    lbl_render = ft.Text("", size=11, color="#374151")
+    lbl_feed = ft.Text("", size=12, color="#374151")
+    lbl_cola = ft.Text("", size=12, color="#374151")
+    lbl_lentas = ft.Text("", size=11, color="#6B7280")
+    fuente = FuenteFilas()
+    grilla = GrillaVirtual(
+        page,
+        [("Sentencia", 380), ("Vistas", 120), ("Cant.", 60), ("Filas", 70),
+         ("p50 ms", 70), ("p95 ms", 70), ("p99 ms", 70), ("Máx ms", 70), ("Lentas", 60)],
+        fuente=fuente,
+        filas_visibles=12,
+    )
+
+    def refrescar(e=None):
+        pool = estadisticas()
+        lbl_pool.value = (
+            f"Pool: {pool['abiertas']} abiertas, {pool['libres']} libres, "
+            f"{pool['creadas']} creadas, {pool['desalojadas']} desalojadas, "
+            f"{pool['pings_fallidos']} pings fallidos, {pool['reconexiones']} reconexiones, "
+            f"{pool['fallos_conexion']} fallos de conexión, {pool['lecturas_reintentadas']} lecturas reintentadas"
+        )
+        cache = cache_entidades.estadisticas()
+        lbl_cache.value = (
+            f"Caché: {cache['entradas']}/{cache['max_entradas']} filas, {cache['aciertos']} aciertos, "
+            f"{cache['fallos']} fallos, {cache['invalidaciones']} invalidaciones"
+        )
+        feed = feed_cambios.estadisticas()
+        lbl_feed.value = (
+            f"Cambios de otras terminales: {feed['recibidos']} recibidos en {feed['lecturas']} lecturas, "
+            f"{feed['recargas']} recargas completas, {feed['recuperados']} recuperados tarde "
+            f"({feed['huecos']} ids salteados en espera)"
+            + ("" if feed["activo"] else " (inactivo)")
+            + (f" — último error: {feed['error']}" if feed["error"] else "")
+        )
+        cola = cola_escrituras.estadisticas()
+        lbl_cola.value = (
+            f"Cola de escrituras: {cola['pendientes']} pendientes, {cola['aplicadas']} aplicadas, "
+            f"{cola['conflictos']} conflictos (ver {cola_escrituras.archivo_conflictos})"
+        )
+        router = router_de(page)
+        if router is not None:
+            vistas = router.estadisticas()
+            lbl_vistas.value = (
+                f"Vistas guardadas: {', '.join(vistas['guardadas']) or 'ninguna'} "
+                f"(máx. {vistas['max_vistas']}), {vistas['restauradas']} restauradas, "
+                f"{vistas['refrescadas']} releídas por cambios"
+            )
+        renderizador = renderizador_de(page)
+        if renderizador is not None:
+            acciones = sorted(
+                renderizador.estadisticas().items(), key=lambda a: a[1]["pedidos"], reverse=True
+            )
+            lbl_render.value = "Envíos al cliente por acción (acciones / pedidos de update / envíos):\n" + "\n".join(
+                f"  {nombre}: {c['acciones']} / {c['pedidos']} / {c['envios']}"
+                for nombre, c in acciones[:MAX_ACCIONES_DIAGNOSTICO]
+            )
+        lbl_lentas.value = (
+            f"Las sentencias de más de {instrumentacion.umbral_lenta * 1000:.0f} ms "
+            f"se registran en {instrumentacion.archivo_lentas}"
+        )
+        sentencias = instrumentacion.resumen()
+        if sentencias:
+            grilla.mostrar([
+                (
+                    s["huella"], ", ".join(s["modulos"]), s["cantidad"], s["filas"],
+                    f"{s['p50_ms']:.2f}", f"{s['p95_ms']:.2f}", f"{s['p99_ms']:.2f}",
+                    f"{s['max_ms']:.2f}", s["lentas"],
+                )
+                for s in sentencias
+            ])
+        else:
+            grilla.mensaje("Todavía no se ejecutaron sentencias")
+        actualizar(page)
+
+    def reiniciar(e):
+        instrumentacion.reiniciar()
+        renderizador = renderizador_de(page)
+        if renderizador is not None:
+            renderizador.reiniciar()
+        refrescar()
+
+    contenido = ft.Column(
         [
-            sidebar,
+            ft.Text("Diagnóstico", size=22, weight="bold", color="#111827"),
+            ft.Text(
+                "Tiempos por sentencia desde que se abrió la aplicación (o desde el último reinicio).",
+                size=12,
+                color="#6B7280",
+            ),
+            ft.Divider(),
+            lbl_pool,
+            lbl_cache,
+            lbl_feed,
+            lbl_cola,
+            lbl_vistas,
+            lbl_render,
+            ft.Row(
+                [
+                    ft.ElevatedButton("Actualizar", on_click=refrescar),
+                    ft.ElevatedButton("Reiniciar métricas", on_click=reiniciar),
+                    ft.ElevatedButton("Volver al panel", on_click=lambda e: navegar_dashboard(page)),
+                ],
+                spacing=10,
+            ),
+            lbl_lentas,
             ft.Container(
-                bgcolor="#F3F4F6",
-                padding=20,
-                expand=True,
-                content=contenido,
+                bgcolor="white",
+                border_radius=8,
+                border=ft.border.all(1, "#E5E7EB"),
+                padding=10,
+                content=grilla.control,
             ),
         ],
-        expand=True,
+        spacing=8,
     )
 
-    page.add(layout)
-    cargar_tabla()
-    page.update()
+    montar(page, contenido)
+    refrescar()
 
 
 # =========================
 # PUNTO DE ENTRADA FLET
 # =========================
 
+def rutas():
+    """Sección del menú -> función(page, navegar_dashboard) que la muestra."""
+    tabla = {
+        "Inicio": lambda page, volver: dashboard(page),
+        "Presupuesto": esperando_base("Presupuesto", presupuesto),
+        "Datos": esperando_base("Datos", datos),
+        "Diagnóstico": diagnostico,
+    }
+    for seccion in HERRAMIENTAS:
+        tabla[seccion] = esperando_base(
+            seccion, lambda page, volver, seccion=seccion: abrir_herramienta(page, volver, seccion)
+        )
+    return tabla
+
+
 def main(page: ft.Page):
     page.title = "Taller Mecánico - Variante"
     page.window.maximized = True
     page.horizontal_alignment = ft.CrossAxisAlignment.STRETCH
     page.vertical_alignment = ft.MainAxisAlignment.START
-    dashboard(page)
+    medicion_inicio.marcar("ventana")
+    # Los page.update() de cada evento se juntan en un solo envío
+    Renderizador(page)
+    # El menú se arma una sola vez; cada sección sólo reemplaza el panel
+    router = Router(page, rutas())
+    router.armar(crear_sidebar(router))
+    # Primero se pinta el panel; migraciones y conteos corren en segundo plano
+    iniciar_base()
+    router.ir("Inicio")
+    medicion_inicio.marcar("pantalla")
+    servicio_resumen.iniciar()
+    cola_escrituras.iniciar()
 
 
 if __name__ == "__main__":
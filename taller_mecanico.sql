@@ -6,7 +6,9 @@ CREATE TABLE IF NOT EXISTS clientes (
     nombre VARCHAR(255),
     apellido VARCHAR(255),
     direccion VARCHAR(255),
-    telefono VARCHAR(255)
+    telefono VARCHAR(255),
+    INDEX idx_clientes_apellido (apellido),
+    INDEX idx_clientes_nombre (nombre)
 );
 
 CREATE TABLE IF NOT EXISTS mecanicos (
@@ -14,14 +16,18 @@ CREATE TABLE IF NOT EXISTS mecanicos (
     nombre VARCHAR(255),
     apellido VARCHAR(255),
     rol VARCHAR(255),
-    estado VARCHAR(255)
+    estado VARCHAR(255),
+    INDEX idx_mecanicos_apellido (apellido),
+    INDEX idx_mecanicos_nombre (nombre)
 );
 
 CREATE TABLE IF NOT EXISTS productos (
     id INT PRIMARY KEY AUTO_INCREMENT,
     nombre VARCHAR(255),
     precio INT,
-    fabricante VARCHAR(255)
+    fabricante VARCHAR(255),
+    INDEX idx_productos_nombre (nombre),
+    INDEX idx_productos_fabricante (fabricante)
 );
 
 CREATE TABLE IF NOT EXISTS proveedores (
@@ -29,7 +35,9 @@ CREATE TABLE IF NOT EXISTS proveedores (
     nombre VARCHAR(255),
     cuit VARCHAR(255),
     telefono VARCHAR(255),
-    direccion VARCHAR(255)
+    direccion VARCHAR(255),
+    INDEX idx_proveedores_nombre (nombre),
+    INDEX idx_proveedores_cuit (cuit)
 );
 
 CREATE TABLE IF NOT EXISTS usuarios (
@@ -38,5 +46,7 @@ CREATE TABLE IF NOT EXISTS usuarios (
     apellido VARCHAR(255),
     usuario VARCHAR(255) UNIQUE,
     contrasena VARCHAR(255),
-    rol VARCHAR(255)
+    rol VARCHAR(255),
+    INDEX idx_usuarios_apellido (apellido),
+    INDEX idx_usuarios_nombre (nombre)
 );
\ No newline at end of file
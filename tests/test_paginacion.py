@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+from motor_sqlite import CursorSqlite
+from paginacion import PaginadorKeyset
+
+COLUMNAS = ["id", "nombre", "precio", "fabricante"]
+
+
+@pytest.fixture
+def cursor():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE productos (id INTEGER PRIMARY KEY, nombre TEXT, precio INT, fabricante TEXT)")
+    # 80 de 120 productos sin fabricante, y algunos sin nombre
+    for i in range(1, 121):
+        fabricante = None if i % 3 else f"F{i % 4}"
+        nombre = None if i % 10 == 0 else f"P{i % 7}"
+        conn.execute("INSERT INTO productos VALUES (?, ?, ?, ?)", (i, nombre, i, fabricante))
+    yield CursorSqlite(conn.cursor())
+    conn.close()
+
+
+def _esperadas(cursor, sentido):
+    cursor.execute("SELECT id FROM productos")
+    ids = [f[0] for f in cursor.fetchall()]
+    filas = {}
+    cursor.execute("SELECT id, nombre, precio, fabricante FROM productos")
+    for fila in cursor.fetchall():
+        filas[fila[0]] = fila
+    # NULL primero en ASC, como en la base
+    clave = lambda i: (filas[i][3] is not None, filas[i][3] or "", filas[i][1] is not None, filas[i][1] or "", i)
+    return sorted(ids, key=clave, reverse=sentido == "DESC")
+
+
+def _paginador(sentido):
+    pag = PaginadorKeyset("productos", "productos", COLUMNAS, [("id", "ASC")], tam_pagina=7)
+    pag.ordenar([("fabricante", sentido), ("nombre", sentido), ("id", sentido)])
+    return pag
+
+
+@pytest.mark.parametrize("sentido", ["ASC", "DESC"])
+def test_recorre_columnas_con_null(cursor, sentido):
+    pag = _paginador(sentido)
+    paginas = [[f[0] for f in pag.primera(cursor)]]
+    while pag.hay_siguiente:
+        paginas.append([f[0] for f in pag.siguiente(cursor)])
+    assert [i for p in paginas for i in p] == _esperadas(cursor, sentido)
+
+    # Hacia atrás y releyendo cada página se vuelve por las mismas páginas
+    for esperada in reversed(paginas[:-1]):
+        assert [f[0] for f in pag.anterior(cursor)] == esperada
+        assert [f[0] for f in pag.actual(cursor)] == esperada
+
+
+@pytest.mark.parametrize("sentido", ["ASC", "DESC"])
+def test_comparar_con_null_sigue_a_la_base(cursor, sentido):
+    pag = _paginador(sentido)
+    pag.primera(cursor)
+    filas = []
+    while True:
+        filas.extend(pag.filas)
+        if not pag.hay_siguiente:
+            break
+        pag.siguiente(cursor)
+    claves = [pag.clave_orden(f) for f in filas]
+    for a, b in zip(claves, claves[1:]):
+        assert pag.comparar(a, b) == -1
+        assert pag.comparar(b, a) == 1
+    assert pag.comparar((None, "x", 1), (None, "x", 1)) == 0
+    assert pag.comparar((None, "x", 1), ("F1", "x", 2)) == (-1 if sentido == "ASC" else 1)
@@ -0,0 +1,17 @@
+from crud import Campo, Entidad, HerramientaCrud
+
+VEHICULOS = Entidad(
+    "vehiculos", "vehiculos", "Vehículos", "vehículo",
+    [
+        Campo("patente", "Patente", 100),
+        Campo("marca", "Marca", 140, orden=["marca"]),
+        Campo("modelo", "Modelo", 140),
+        Campo("color", "Color", 100),
+    ],
+    busqueda=["patente", "marca"],
+    descripcion="Ficha técnica: registrar y consultar vehículos por patente.",
+)
+
+
+class Herramienta_Vehiculo(HerramientaCrud):
+    entidad = VEHICULOS
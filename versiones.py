@@ -0,0 +1,42 @@
+import re
+import threading
+
+_ESCRITURA = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE|\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+
+def tabla_escrita(sql):
+    """Tabla que modifica un INSERT / UPDATE / DELETE, o None para otro SQL."""
+    coincidencia = _ESCRITURA.match(sql)
+    return coincidencia.group(1).lower() if coincidencia else None
+
+
+class VersionesTablas:
+    """
+    Un número por tabla que sube con cada escritura hecha desde esta
+    terminal (los cursores de db lo llaman solos). Comparar la versión de
+    antes y de ahora dice si una tabla cambió, sin consultar la base.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versiones = {}
+
+    def incrementar(self, tabla):
+        with self._lock:
+            self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+    def registrar_escritura(self, sql):
+        tabla = tabla_escrita(sql)
+        if tabla is not None:
+            self.incrementar(tabla)
+
+    def version(self, *tablas):
+        """Tupla con la versión actual de cada tabla."""
+        with self._lock:
+            return tuple(self._versiones.get(t, 0) for t in tablas)
+
+
+versiones_tablas = VersionesTablas()